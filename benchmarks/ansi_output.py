@@ -0,0 +1,92 @@
+"""Bytes and time per frame for the ANSI backend, naive diff vs optimized output.
+
+"naive" is a plain cell diff: an absolute cursor move for every changed run
+and a full SGR reset for every attribute change. "optimized" is
+AnsiRenderer.flush. Both drive the demo app at 120x40 through a first paint,
+typing, opening a menu and dragging a window.
+
+    python benchmarks/ansi_output.py
+"""
+import curses
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from demo_app import DemoApp
+from pytvision.component.ansi import AnsiRenderer
+from pytvision.component.ui_event import KeyEvent, MouseEvent
+
+W, H = 120, 40
+
+
+def naive_flush(renderer, front):
+    back = renderer.screen
+    out = []
+    for y in range(back.h):
+        chars, attrs = back.chars[y], back.attrs[y]
+        x = 0
+        while x < back.w:
+            if front is not None and chars[x] == front[0][y][x] and attrs[x] == front[1][y][x]:
+                x += 1
+                continue
+            out.append(f"\x1b[{y + 1};{x + 1}H")
+            attr = None
+            while x < back.w and (front is None or chars[x] != front[0][y][x] or attrs[x] != front[1][y][x]):
+                if attrs[x] != attr:
+                    attr = attrs[x]
+                    out.append(renderer.sgr(attr))
+                out.append(chars[x])
+                x += 1
+    return "".join(out), ([row[:] for row in back.chars], [row[:] for row in back.attrs])
+
+
+def scenario(app):
+    yield "first paint", []
+    app.appwin.set_focus(app.editor)
+    yield "typing", [KeyEvent(ch) for ch in "hello world"]
+    yield "menu", [KeyEvent(("ALT", ord("f")))]
+    yield "close menu", [KeyEvent(27)]
+    drag = [MouseEvent(40, 2, curses.BUTTON1_PRESSED, "click", W, H)]
+    drag += [MouseEvent(40 - i, 2 + i // 3, curses.REPORT_MOUSE_POSITION, "motion", W, H) for i in range(1, 16)]
+    drag.append(MouseEvent(25, 7, curses.BUTTON1_RELEASED, "click", W, H))
+    yield "drag window", drag
+
+
+def run(optimized):
+    renderer = AnsiRenderer(W, H)
+    app = DemoApp(renderer.screen, renderer)
+    front = None
+    results = []
+    for name, events in scenario(app):
+        frames = [[]] if not events else [[event] for event in events]
+        total_bytes = 0
+        total_time = 0.0
+        for batch in frames:
+            for event in batch:
+                app.manager.handle_event(event)
+            renderer.screen.erase()
+            app.manager.render_all(renderer)
+            t0 = time.perf_counter()
+            if optimized:
+                data = renderer.flush()
+            else:
+                data, front = naive_flush(renderer, front)
+            total_time += time.perf_counter() - t0
+            total_bytes += len(data.encode("utf-8"))
+        results.append((name, len(frames), total_bytes, total_time))
+    app.exit()
+    return results
+
+
+def main():
+    naive = run(False)
+    optimized = run(True)
+    print(f"{'':14}{'frames':>7}{'naive B':>10}{'opt B':>10}{'naive ms':>10}{'opt ms':>9}")
+    for (name, frames, nb, nt), (_, _, ob, ot) in zip(naive, optimized):
+        print(f"{name:14}{frames:>7}{nb:>10}{ob:>10}{nt * 1000:>10.2f}{ot * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
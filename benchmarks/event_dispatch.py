@@ -0,0 +1,49 @@
+"""Cost of a mouse-motion flood and of widget events, old event objects vs new.
+
+"dict" builds a kwargs UIEvent per report and reads it through ``data`` the
+way handlers used to; "pooled" takes a slotted MouseEvent from the free list
+and reads attributes. Widget dispatch is timed with and without listeners.
+
+    python benchmarks/event_dispatch.py [count]
+"""
+import curses
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pytvision.component.button import Button
+from pytvision.component.ui_event import UIEvent, MouseEvent
+
+
+def dict_events(count):
+    for i in range(count):
+        event = UIEvent("mouse", x=i, y=3, bstate=curses.REPORT_MOUSE_POSITION, etype="motion", screen_w=120, screen_h=40)
+        event.data['x'], event.data['y'], event.data.get('bstate', 0)
+
+
+def pooled_events(count):
+    for i in range(count):
+        event = MouseEvent.obtain(i, 3, curses.REPORT_MOUSE_POSITION, "motion", 120, 40)
+        event.x, event.y, event.bstate
+        event.release()
+
+
+def rate(fn, count):
+    t0 = time.perf_counter()
+    fn(count)
+    return count / (time.perf_counter() - t0)
+
+
+def main(count=200000):
+    print(f"mouse events/sec   dict {rate(dict_events, count):>12,.0f}   pooled {rate(pooled_events, count):>12,.0f}")
+    button = Button(0, 0, 10, "x")
+    quiet = rate(lambda n: [button.dispatchEvent("onclick") for _ in range(n)], count)
+    button.addEventListener("onclick", lambda event: None)
+    heard = rate(lambda n: [button.dispatchEvent("onclick") for _ in range(n)], count)
+    print(f"dispatches/sec     no listeners {quiet:>12,.0f}   one listener {heard:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,72 @@
+"""Cold-start import cost of typical entry points, checked against a budget.
+
+Each scenario runs in fresh interpreters; the median time of its import
+statement and the number of modules it adds are compared with BUDGETS. Module
+counts are exact, so they catch an eager import slipping back in on any
+machine; the time budgets leave room for slow disks and CI runners. Exits with
+status 1 if any scenario is over budget.
+
+    python benchmarks/import_time.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+SCENARIOS = {
+    "package": "import pytvision",
+    "window": "from pytvision import Window, WindowManager, TerminalRenderer",
+    "picker": "from pytvision import Window, WindowManager, TerminalRenderer, MultiList, Input, Button",
+    "editor": "from pytvision import Window, WindowManager, TerminalRenderer, TextArea",
+    "dialogs": "from pytvision import OpenDialog, SaveDialog, TaskExecutor",
+}
+
+# scenario -> (max milliseconds, max modules added); module counts as of CPython 3.11
+BUDGETS = {
+    "package": (5, 5),
+    "window": (45, 46),
+    "picker": (45, 49),
+    "editor": (50, 58),
+    "dialogs": (50, 58),
+}
+
+PROBE = """
+import sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, len(set(sys.modules) - before))
+"""
+
+
+def measure(statement, runs):
+    times, modules = [], 0
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(statement=statement)], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        modules = int(out[1])
+    return statistics.median(times), modules
+
+
+def main(runs=11):
+    failed = []
+    print(f"{'scenario':10}{'ms':>8}{'budget':>8}{'modules':>9}{'budget':>8}")
+    for name, statement in SCENARIOS.items():
+        ms, modules = measure(statement, runs)
+        max_ms, max_modules = BUDGETS[name]
+        over = ms > max_ms or modules > max_modules
+        print(f"{name:10}{ms:>8.1f}{max_ms:>8}{modules:>9}{max_modules:>8}{'  OVER BUDGET' if over else ''}")
+        if over:
+            failed.append(name)
+    if failed:
+        print("import-time regression: " + ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 11))
@@ -0,0 +1,103 @@
+"""Bytes per frame for scrolling views on the ANSI backend, with and without hardware scrolling.
+
+Each scenario renders 200 frames at 120x60: a full-width console gaining log
+lines, the same console with an editor window beside it (so whole-row
+scrolls also disturb the editor), and an editor scrolled with the arrow
+keys and Page Down.
+
+    python benchmarks/scroll_output.py
+"""
+import curses
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pytvision.component.ansi import AnsiRenderer
+from pytvision.component.text_area import TextArea
+from pytvision.component.ui_event import KeyEvent
+from pytvision.component.window import Window, WindowManager
+from pytvision.compound.console import Console
+
+W, H = 120, 60
+FRAMES = 200
+
+
+def console_window(width):
+    window = Window(0, 0, width, H - 1, title="Log")
+    console = Console(1, 1, width - 2, H - 3)
+    console.running = False  # no demo producer; lines come from the scenario
+    window.add(console)
+    return window, console
+
+
+def editor_window(left, top, width, height):
+    window = Window(left, top, width, height, title="Editor")
+    editor = TextArea(1, 1, width - 2, height - 2, value="\n".join(f"{i:5} " + "word " * (i % 17) for i in range(3000)))
+    window.add(editor)
+    window.set_focus(editor)
+    return window
+
+
+def log_line(rng, i):
+    return f"{i:05} GET /api/item/{rng.randrange(10 ** 6)} 200 {rng.random():.4f}s"
+
+
+def full_console(manager, rng):
+    window, console = console_window(W)
+    manager.add(window)
+    for i in range(FRAMES):
+        for _ in range(rng.choice((1, 1, 1, 2, 5))):
+            console.append_line(log_line(rng, i))
+        yield
+
+
+def console_beside_editor(manager, rng):
+    window, console = console_window(70)
+    manager.add(window)
+    manager.add(editor_window(72, 2, 46, 30))
+    for i in range(FRAMES):
+        console.append_line(log_line(rng, i))
+        yield
+
+
+def scrolling_editor(manager, rng):
+    manager.add(editor_window(0, 0, W, H))
+    # Start with the cursor on the last visible line, so arrow keys scroll the view
+    for _ in range(H - 3):
+        manager.handle_event(KeyEvent(curses.KEY_DOWN))
+    keys = [curses.KEY_DOWN] * 5 + [curses.KEY_UP] * 3 + [curses.KEY_NPAGE]
+    for _ in range(FRAMES):
+        manager.handle_event(KeyEvent(rng.choice(keys)))
+        yield
+
+
+SCENARIOS = {
+    "full console": full_console,
+    "console + editor": console_beside_editor,
+    "scrolling editor": scrolling_editor,
+}
+
+
+def run(scenario, hardware_scroll):
+    renderer = AnsiRenderer(W, H, color_depth=256, hardware_scroll=hardware_scroll)
+    manager = WindowManager()
+    total = 0
+    for _ in scenario(manager, random.Random(7)):
+        renderer.screen.erase()
+        manager.render_all(renderer)
+        total += len(renderer.flush().encode("utf-8"))
+    return total
+
+
+def main():
+    print(f"{'':18}{'diff B/frame':>14}{'scroll B/frame':>16}{'ratio':>7}")
+    for name, scenario in SCENARIOS.items():
+        plain = run(scenario, False) / FRAMES
+        scrolled = run(scenario, True) / FRAMES
+        print(f"{name:18}{plain:>14.0f}{scrolled:>16.0f}{scrolled / plain:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Per-widget memory and construction throughput for the small, numerous widgets.
+
+Compares the slotted classes against a "legacy" variant of each: a plain
+subclass (which brings back the per-instance ``__dict__``) that also creates
+its handler table eagerly, the way every Component used to.
+
+    python benchmarks/widget_memory.py [count]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pytvision.component.label import Label
+from pytvision.component.checkbox import CheckBox
+from pytvision.component.button import Button
+from pytvision.component.input import Input
+
+FACTORIES = {
+    "Label": (Label, lambda cls, i: cls(0, i, 20, 1, text=f"label {i}")),
+    "CheckBox": (CheckBox, lambda cls, i: cls(0, i, f"option {i}")),
+    "Button": (Button, lambda cls, i: cls(0, i, 10, f"button {i}")),
+    "Input": (Input, lambda cls, i: cls(0, i, 20)),
+}
+
+
+def legacy(cls):
+    def __init__(self, *args, **kw):
+        cls.__init__(self, *args, **kw)
+        self.event_handlers = {}
+    return type("Legacy" + cls.__name__, (cls,), {"__init__": __init__})
+
+
+def measure(cls, make, count):
+    gc.collect()
+    t0 = time.perf_counter()
+    widgets = [make(cls, i) for i in range(count)]
+    rate = count / (time.perf_counter() - t0)
+    del widgets
+    # Memory is measured on a separate run, since tracing slows construction down
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    widgets = [make(cls, i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the widgets isn't part of their cost
+    per_widget = (after - before - sys.getsizeof(widgets)) / count
+    return per_widget, rate
+
+
+def main(count=20000):
+    print(f"{'widget':<10} {'bytes/widget':>22} {'widgets/sec':>26}")
+    print(f"{'':<10} {'legacy':>10} {'slots':>11} {'legacy':>12} {'slots':>13}")
+    for name, (cls, make) in FACTORIES.items():
+        old_mem, old_rate = measure(legacy(cls), make, count)
+        new_mem, new_rate = measure(cls, make, count)
+        print(f"{name:<10} {old_mem:>10.0f} {new_mem:>11.0f} {old_rate:>12,.0f} {new_rate:>13,.0f}"
+              f"   ({100 * (1 - new_mem / old_mem):.0f}% smaller)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -3,32 +3,48 @@ import os
 import sys
 import time
 import locale
+import select
+import asyncio
 
 from pytvision.utils import KEY_ESC, KEY_ENTER, KEY_TAB, KEY_BACKSPACE
 
-from pytvision.component.terminal_renderer import TerminalRenderer
+from pytvision.component.terminal_renderer import TerminalRenderer, HeadlessRenderer
+from pytvision.component.recorder import EventRecorder, Recording, ReplayDriver
+from pytvision.component.session_server import SessionServer
+from pytvision.component.ansi import AnsiTerminal, dispatch_input
+from pytvision.component.theme import THEMES
 from pytvision.component.window import Window, WindowManager, MainMenuBar
 from pytvision.component.dropdown import Dropdown
 from pytvision.component.text_area import TextArea
+from pytvision.component.highlighter import guess_highlighter
 from pytvision.component.label import Label
+from pytvision.component.layout import AnchorLayout, Row
+from pytvision.component.scroll_view import ScrollView
+from pytvision.component.input import Input
+from pytvision.component.checkbox import CheckBox
+from pytvision.component.keymap import APP_SCOPE
 from pytvision.component.button import Button
 from pytvision.component.context_menu import ContextMenu
 from pytvision.component.menu_item import MenuItem
 from pytvision.component.modal import Modal
-from pytvision.component.ui_event import UIEvent
+from pytvision.component.ui_event import KeyEvent, MouseEvent
 from pytvision.compound.confirm_modal import ConfirmModal
 from pytvision.compound.notification_modal import NotificationModal
 from pytvision.compound.open_dialog import OpenDialog
 from pytvision.compound.save_dialog import SaveDialog
+from pytvision.compound.find_dialog import FindDialog
 from pytvision.compound.chat import Chat
 from pytvision.compound.console import Console
+from pytvision.compound.profiler_hud import ProfilerHud
+from pytvision.compound.task_executor import TaskExecutor
 
 
 class DemoApp:
-    def __init__(self, screen):
+    def __init__(self, screen, renderer=None):
         self.screen = screen
-        self.renderer = TerminalRenderer(screen)
+        self.renderer = renderer or TerminalRenderer(screen)
         self.manager = WindowManager()
+        self.executor = TaskExecutor(self.manager)
         self.manager.main_menu = None
         self.running = True
         self.build()
@@ -46,19 +62,36 @@ class DemoApp:
         cancel = Button(appwin.width - 10, 17, 8, "Quit", parent=appwin, window=appwin, onclick=self.exit)
         appwin.add(ok)
         appwin.add(cancel)
-        status = Label(1, appwin.height - 2, appwin.width - 2, 1, text="Ready. Alt+F File | Alt-W Window | Alt-H Help")
+        status = Label(1, appwin.height - 2, appwin.width - 2, 1, text="Ready. Alt+F File | Alt-W Window | Alt-H Help | F12 Diagnostics")
         appwin.add(status)
         self.status_label = status
+        self.manager.listener_error_handler = lambda component, name, e: setattr(status, "text", f"Error in {name} listener: {e}")
+        appwin.layout = AnchorLayout()
+        body = Row(spacing=1)
+        body.add(filelist, size=28, cross=1)
+        body.add(editor, flex=1)
+        appwin.layout.add(body, left=2, top=2, right=2, bottom=4)
+        appwin.layout.add(ok, right=12, bottom=2, width=8, height=1)
+        appwin.layout.add(cancel, right=2, bottom=2, width=8, height=1)
+        appwin.layout.add(status, left=1, right=1, bottom=1, height=1)
+        appwin.relayout()
         self.manager.add(appwin)
+        self.manager.layout.add(appwin, left=2, top=2, right=4, bottom=4, min_width=60, min_height=20)
         self.appwin = appwin
         self.filelist = filelist
         self.editor = editor
+        self.loading_path = None
+        editor.addEventListener("onload", self.on_loaded)
 
         # Console window
         consolewin = Window(10, 5, 34, 12, title="Console Demo", parent=None)
         console = Console(2, 2, 30, 8, parent=consolewin)
         consolewin.add(console)
+        consolewin.layout = AnchorLayout()
+        consolewin.layout.add(console, left=2, top=2, right=2, bottom=2)
+        consolewin.relayout()
         self.manager.add(consolewin)
+        self.manager.layout.add(consolewin, top=5, bottom=1, min_height=12)
         self.consolewin = consolewin
         self.console = console
 
@@ -73,8 +106,11 @@ class DemoApp:
         chat.add_message("Friend", "Hello! How are you?")
         
         chatwin.add(chat)
-
+        chatwin.layout = AnchorLayout()
+        chatwin.layout.add(chat, left=2, top=2, right=2, bottom=2)
+        chatwin.relayout()
         self.manager.add(chatwin)
+        self.manager.layout.add(chatwin, top=5, bottom=1, min_height=20)
         self.chatwin = chatwin
         self.chat = chat
 
@@ -82,15 +118,23 @@ class DemoApp:
         filemenu = ContextMenu(0, 1, 28)
         filemenu.add(MenuItem("open", "&Open", callback=self.open_file))
         filemenu.add(MenuItem("save", "&Save", callback=self.save_file))
+        filemenu.add(MenuItem("find", "&Find...", callback=self.find_text, shortcut="Ctrl+F"))
         filemenu.add(MenuItem("sep", "-" * 10, callback=None, enabled=False))
         filemenu.add(MenuItem("exit", "E&xit", callback=self.exit))
-        winmenu = ContextMenu(0, 1, 22)
+        winmenu = ContextMenu(0, 1, 28)
         winmenu.add(MenuItem("min", "&Minimize", callback=lambda: None))
+        winmenu.add(MenuItem("wrap", "&Word Wrap", callback=self.toggle_wrap, shortcut="Ctrl+K W"))
+        winmenu.add(MenuItem("theme", "&Theme", callback=self.next_theme))
+        winmenu.add(MenuItem("settings", "&Settings", callback=self.show_settings))
         winmenu.add(MenuItem("close", "&Close", callback=lambda: self.manager.remove(self.appwin)))
         helpmenu = ContextMenu(0, 1, 20)
         helpmenu.add(MenuItem("about", "&About", callback=self.show_about))
         mbar = MainMenuBar(self.manager, [("&File", filemenu), ("&Window", winmenu), ("&Help", helpmenu)])
         self.manager.main_menu = mbar
+        self.hud = ProfilerHud(max(0, w - 48), 2)
+        self.manager.keymap.bind("F12", lambda: self.hud.toggle(self.manager), scope=APP_SCOPE, description="Diagnostics")
+        self.manager.layout.add(self.hud, right=2)
+        self.manager.relayout(w, h)
 
     def on_ok(self, editor: TextArea):
         try:
@@ -109,6 +153,22 @@ class DemoApp:
         self.manager.add(m)
         self.manager.push_modal(m)
 
+    def show_settings(self):
+        # A long form on a scrolling canvas; Tab through it and the view follows the focus
+        win = Window(6, 3, 52, 18, title="Settings")
+        view = ScrollView(1, 1, 50, 16)
+        for i in range(200):
+            view.add(Label(1, i, 20, 1, text=f"Option {i + 1:03}"))
+            if i % 5 == 4:
+                view.add(CheckBox(22, i, "Enabled"))
+            else:
+                view.add(Input(22, i, 24, placeholder=f"value {i + 1}"))
+        win.add(view)
+        win.layout = AnchorLayout()
+        win.layout.add(view, left=1, top=1, right=1, bottom=1)
+        win.relayout()
+        self.manager.add(win)
+
     def show_confirm(self, chat: Chat):
         def on_confirm():
             chat.add_message("Friend", "Confirmed! Thanks!")
@@ -124,31 +184,51 @@ class DemoApp:
     def open_file(self):
         def callback(path):
             try:
-                with open(path, "r") as f:
-                    self.editor.set_value(f.read())
-                    self.status_label.text = f"Opened: {path}"
-            except Exception as e:
-                self.status_label.text = f"Error: {str(e)}"
-        dialog = OpenDialog(self.appwin, callback)
+                f = open(path, "rb")
+            except OSError as e:
+                self.status_label.text = f"Error: {e}"
+                return
+            self.editor.set_highlighter(guess_highlighter(path))
+            self.editor.load_stream(f, close=True)
+            self.status_label.text = f"Loading: {path}"
+            self.loading_path = path
+        dialog = OpenDialog(self.appwin, callback, executor=self.executor)
         dialog.addEventListener("onerror", lambda e: setattr(self.status_label, 'text', e.data['message']))
         self.manager.add(dialog)
         self.manager.push_modal(dialog)
 
+    def on_loaded(self, event):
+        error = event.data['error']
+        self.status_label.text = f"Error: {error}" if error else f"Opened: {self.loading_path}"
+
     def save_file(self):
         def callback(path):
-            try:
-                with open(path, "w") as f:
-                    f.write(self.editor.get_value())
-                    self.status_label.text = f"Saved: {path}"
-            except Exception as e:
-                self.status_label.text = f"Error: {str(e)}"
+            self.executor.submit(self.editor.save_job(path), title="Saving", message=os.path.basename(path),
+                                 parent=self.appwin,
+                                 on_result=lambda _: setattr(self.status_label, 'text', f"Saved: {path}"),
+                                 on_error=lambda e: setattr(self.status_label, 'text', f"Error: {e}"))
         dialog = SaveDialog(self.appwin, callback=callback)
         dialog.addEventListener("onerror", lambda e: setattr(self.status_label, 'text', e.data['message']))
         self.manager.add(dialog)
         self.manager.push_modal(dialog)
 
+    def find_text(self):
+        dialog = FindDialog(self.appwin, self.editor)
+        self.manager.add(dialog)
+        self.manager.push_modal(dialog)
+
+    def toggle_wrap(self):
+        self.editor.set_wrap(self.editor.wrap_index is None)
+        self.status_label.text = "Word wrap " + ("on" if self.editor.wrap_index else "off")
+
+    def next_theme(self):
+        theme = THEMES[(THEMES.index(self.renderer.theme) + 1) % len(THEMES)]
+        self.renderer.set_theme(theme)
+        self.status_label.text = f"Theme: {theme.name}"
+
     def exit(self):
         self.console.stop()
+        self.executor.shutdown()
         self.running = False
 
     def parse_mouse(self, mouse_event_data):
@@ -156,89 +236,169 @@ class DemoApp:
         etype = 'click'
         if bstate & curses.REPORT_MOUSE_POSITION:
             etype = 'motion'
-        return UIEvent("mouse", x=mx, y=my, bstate=bstate, etype=etype,
-                       screen_w=self.renderer.w, screen_h=self.renderer.h)
-
-    def handle_alt(self, event):
-        if event.type == "key" and isinstance(event.data.get('key'), tuple) and event.data['key'][0] == "ALT":
-            key = event.data['key'][1]
-            if key in (ord('f'), ord('F')):
-                if self.manager.main_menu:
-                    self.manager.main_menu.active_index = 0
-                    return True
-            elif key in (ord('w'), ord('W')):
-                if self.manager.main_menu:
-                    self.manager.main_menu.active_index = 1
-                    return True
-            elif key in (ord('h'), ord('H')):
-                if self.manager.main_menu:
-                    self.manager.main_menu.active_index = 2
-                    return True
-        return False
+        return MouseEvent.obtain(mx, my, bstate, etype, self.renderer.w, self.renderer.h)
+
+    def coalesce_motion(self, event):
+        """Skips ahead to the newest of the motion reports already queued behind ``event``.
+
+        Returns the motion event to dispatch and the press/release that ended the
+        run, if any, so button events keep their order relative to the motion.
+        Any other input is pushed back for the main loop.
+        """
+        following = None
+        while True:
+            try:
+                key = self.screen.get_wch()
+            except curses.error:
+                break
+            if key != curses.KEY_MOUSE:
+                if isinstance(key, str):
+                    curses.unget_wch(key)
+                else:
+                    curses.ungetch(key)
+                break
+            try:
+                nxt = self.parse_mouse(curses.getmouse())
+            except curses.error:
+                continue
+            if nxt.etype != 'motion':
+                following = nxt
+                break
+            event.release()
+            event = nxt
+        return event, following
+
+    def ansi_mainloop(self, terminal):
+        """Main loop for the curses-free backend: AnsiTerminal input, one write per frame."""
+        locale.setlocale(locale.LC_ALL, '')
+        dirty = True
+        while self.running:
+            if self.manager.tasks.run_pending():
+                dirty = True
+            if self.manager.run_timers():
+                dirty = True
+            if dirty:
+                dirty = False
+                self.screen.erase()
+                self.manager.render_all(self.renderer)
+                self.renderer.present()
+            events = terminal.poll([self.manager.tasks], self.manager.next_timeout())
+            if events:
+                dirty = True
+                if not dispatch_input(self.manager, events, self.on_terminal_resize):
+                    self.exit()
+
+    def on_terminal_resize(self, w, h):
+        self.renderer.resize(w, h)
+        self.on_resize(w, h)
+
+    def wait_for_input(self, timeout=None):
+        # Sleeps until the terminal has input, a background thread posted a task or the next timer is due
+        select.select([sys.stdin, self.manager.tasks], [], [], timeout)
+
+    def on_resize(self, w, h):
+        self.manager.request_resize(w, h)
 
     def mainloop(self):
-        self.screen.nodelay(False)
+        # Input is polled; the loop blocks in wait_for_input instead of get_wch
+        self.screen.nodelay(True)
         locale.setlocale(locale.LC_ALL, '')
         self.screen.keypad(True)
+        # raw mode so Ctrl-Z/Ctrl-Y reach the editor as undo/redo instead of job control
+        curses.raw()
         curses.curs_set(0)
         curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
         curses.mouseinterval(0)
+        resizing = False
+        dirty = True
         while self.running:
-            self.renderer.refresh_dimensions()
-            self.screen.erase()
-            for r in range(self.renderer.h):
-                try:
-                    ch = ' ' if (r % 2 == 0) else ' '
-                    self.screen.addstr(r, 0, ch * (self.renderer.w), self.renderer.get_color_pair(curses.COLOR_WHITE, -1))
-                except curses.error:
-                    pass
-            self.manager.render_all(self.renderer)
-            self.screen.refresh()
+            if self.manager.tasks.run_pending():
+                dirty = True
+            if self.manager.run_timers():
+                dirty = True
+            if dirty and not resizing:
+                dirty = False
+                self.renderer.refresh_dimensions()
+                self.screen.erase()
+                for r in range(self.renderer.h):
+                    try:
+                        ch = ' ' if (r % 2 == 0) else ' '
+                        self.screen.addstr(r, 0, ch * (self.renderer.w), self.renderer.get_color_pair(curses.COLOR_WHITE, -1))
+                    except curses.error:
+                        pass
+                self.manager.render_all(self.renderer)
+                self.screen.refresh()
             try:
                 key = self.screen.get_wch()
             except curses.error:
-                time.sleep(0.01)
+                if resizing:
+                    # The burst of resize events is over: draw one frame (and one relayout) for the final size
+                    resizing = False
+                    dirty = True
+                    continue
+                self.wait_for_input(self.manager.next_timeout())
                 continue
+            dirty = True
             if isinstance(key, str):
                 if ord(key) == 27:
-                    event = UIEvent("key", key=KEY_ESC)
+                    # Terminals send Alt+x as ESC immediately followed by x
+                    try:
+                        follow = self.screen.get_wch()
+                    except curses.error:
+                        follow = None
+                    if isinstance(follow, str) and follow.isprintable():
+                        event = KeyEvent(("ALT", ord(follow)))
+                    else:
+                        if isinstance(follow, str):
+                            curses.unget_wch(follow)
+                        elif follow is not None:
+                            curses.ungetch(follow)
+                        event = KeyEvent(KEY_ESC)
                     self.manager.handle_event(event)
                 elif key == '\n':
-                    event = UIEvent("key", key=KEY_ENTER)
+                    event = KeyEvent(KEY_ENTER)
                     self.manager.handle_event(event)
                 elif key == '\t':
-                    event = UIEvent("key", key=KEY_TAB)
+                    event = KeyEvent(KEY_TAB)
                     self.manager.handle_event(event)
                 elif key == '\b' or ord(key) == 127:
-                    event = UIEvent("key", key=KEY_BACKSPACE)
+                    event = KeyEvent(KEY_BACKSPACE)
+                    self.manager.handle_event(event)
+                elif ord(key) == 3:
+                    self.exit()
+                elif ord(key) < 32:
+                    event = KeyEvent(ord(key))
                     self.manager.handle_event(event)
                 else:
-                    event = UIEvent("key", key=key)
+                    event = KeyEvent(key)
                     self.manager.handle_event(event)
             elif isinstance(key, int):
                 if key == curses.KEY_RESIZE:
                     self.renderer.refresh_dimensions()
                     h, w = self.screen.getmaxyx()
-                    self.appwin.width = max(40, w - 6)
-                    self.appwin.height = max(12, h - 6)
-                    self.consolewin.width = max(34, w - 6)
-                    self.consolewin.height = max(12, h - 6)
-                    self.chatwin.width = max(34, w - 6)
-                    self.chatwin.height = max(20, h - 6)
+                    self.on_resize(w, h)
+                    # Tiling window managers send resizes in bursts; skip frames until input goes quiet
+                    resizing = True
                     continue
                 if key == curses.KEY_MOUSE:
                     try:
                         mouse_event_data = curses.getmouse()
-                        event = self.parse_mouse(mouse_event_data)
-                        if event:
-                            self.manager.handle_event(event)
                     except curses.error:
                         continue
+                    event = self.parse_mouse(mouse_event_data)
+                    following = None
+                    if event.etype == 'motion' and not self.manager.wants_all_motion(event.x, event.y):
+                        event, following = self.coalesce_motion(event)
+                    self.manager.handle_event(event)
+                    event.release()
+                    if following is not None:
+                        self.manager.handle_event(following)
+                        following.release()
                 elif key == -1:
                     time.sleep(0.01)
                     continue
                 else:
-                    event = UIEvent("key", key=key)
+                    event = KeyEvent(key)
                     self.manager.handle_event(event)
                     if sys.platform == "darwin" and key > 127:
                         macos_option_map = {
@@ -249,20 +409,72 @@ class DemoApp:
                             ord('√'): ord('v'), ord('∑'): ord('w'), ord('≈'): ord('x'), ord('¥'): ord('y'), ord('Ω'): ord('z'),
                         }
                         if key in macos_option_map:
-                            event = UIEvent("key", key=("ALT", macos_option_map[key]))
-                            if self.handle_alt(event):
-                                continue
+                            self.manager.handle_event(KeyEvent(("ALT", macos_option_map[key])))
 
-def main(stdscr):
+def main(stdscr, record_path=None):
     app = DemoApp(stdscr)
+    if record_path:
+        app.manager.recorder = EventRecorder(record_path, app.renderer)
     try:
         app.mainloop()
     except KeyboardInterrupt:
         pass
+    finally:
+        if app.manager.recorder:
+            app.manager.recorder.close()
+
+def ansi_main():
+    with AnsiTerminal(sys.stdin.fileno(), sys.stdout.fileno()) as terminal:
+        app = DemoApp(terminal.renderer.screen, terminal.renderer)
+        try:
+            app.ansi_mainloop(terminal)
+        finally:
+            if app.running:
+                app.exit()
+
+def replay(path, fast=False):
+    recording = Recording.load(path)
+    renderer = HeadlessRenderer(recording.width, recording.height)
+    app = DemoApp(renderer.screen, renderer)
+    driver = ReplayDriver(app.manager, renderer, recording, speed=None if fast else 1.0, on_resize=app.on_resize)
+    report = driver.run()
+    app.exit()
+    print(report.format())
+
+def serve(address):
+    """Serves a separate demo session to every client of ``address`` (``host:port`` or a Unix socket path)."""
+    server = SessionServer(lambda renderer: DemoApp(renderer.screen, renderer))
+
+    async def run():
+        if ":" in address:
+            host, port = address.rsplit(":", 1)
+            await server.start_tcp(host or "127.0.0.1", int(port))
+        else:
+            await server.start_unix(address)
+        print(f"Serving on {address}; Ctrl-C to stop")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "--replay":
+        replay(sys.argv[2], fast="--fast" in sys.argv[3:])
+        sys.exit(0)
+    if len(sys.argv) >= 2 and sys.argv[1] == "--ansi":
+        ansi_main()
+        sys.exit(0)
+    if len(sys.argv) >= 3 and sys.argv[1] == "--serve":
+        serve(sys.argv[2])
+        sys.exit(0)
+    record_path = sys.argv[2] if len(sys.argv) >= 3 and sys.argv[1] == "--record" else None
     try:
-        curses.wrapper(main)
+        curses.wrapper(main, record_path)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""pytvision: Turbo Vision style text UIs on curses or plain ANSI terminals.
+
+The public classes can be imported from here (``from pytvision import Window,
+Button``). Nothing is loaded up front: each name's module is imported the first
+time the name is used, so a small tool only pays for the widgets it touches.
+"""
+import importlib
+
+_LAZY = {
+    # Core
+    "Component": "component.component",
+    "set_listener_error_handler": "component.component",
+    "UIEvent": "component.ui_event",
+    "KeyEvent": "component.ui_event",
+    "MouseEvent": "component.ui_event",
+    "WindowManager": "component.window",
+    "Window": "component.window",
+    "MainMenuBar": "component.window",
+    "AnchorLayout": "component.layout",
+    "Row": "component.layout",
+    "Column": "component.layout",
+    "ScrollView": "component.scroll_view",
+    "Keymap": "component.keymap",
+    "TaskQueue": "component.task_queue",
+    # Rendering
+    "TerminalRenderer": "component.terminal_renderer",
+    "HeadlessRenderer": "component.terminal_renderer",
+    "ScreenBuffer": "component.screen_buffer",
+    "AnsiRenderer": "component.ansi",
+    "AnsiTerminal": "component.ansi",
+    "SessionServer": "component.session_server",
+    "Theme": "component.theme",
+    "THEMES": "component.theme",
+    "rgb": "component.theme",
+    # Widgets
+    "Label": "component.label",
+    "Button": "component.button",
+    "CheckBox": "component.checkbox",
+    "Radio": "component.radio",
+    "Input": "component.input",
+    "Password": "component.password",
+    "TextArea": "component.text_area",
+    "MultiList": "component.multi_list",
+    "Dropdown": "component.dropdown",
+    "ContextMenu": "component.context_menu",
+    "MenuItem": "component.menu_item",
+    "Modal": "component.modal",
+    "ProgressBar": "component.progress_bar",
+    "DataGrid": "component.data_grid",
+    "GridColumn": "component.data_grid",
+    "ListDataSource": "component.data_grid",
+    "TreeView": "component.tree_view",
+    "TreeNode": "component.tree_view",
+    # Compound widgets
+    "Chat": "compound.chat",
+    "ConfirmModal": "compound.confirm_modal",
+    "Console": "compound.console",
+    "FindDialog": "compound.find_dialog",
+    "NotificationModal": "compound.notification_modal",
+    "OpenDialog": "compound.open_dialog",
+    "SaveDialog": "compound.save_dialog",
+    "ProgressModal": "compound.progress_modal",
+    "ProfilerHud": "compound.profiler_hud",
+    "TaskExecutor": "compound.task_executor",
+}
+
+__all__ = sorted(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,627 @@
+import codecs
+import curses
+import itertools
+import operator
+import os
+import select
+import signal
+import termios
+import tty
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .screen_buffer import ScreenBuffer, PAIR_SHIFT, ATTR_MASK
+from .terminal_renderer import HeadlessRenderer
+from .theme import Theme, is_rgb, rgb_components, quantize
+from .ui_event import UIEvent, KeyEvent, MouseEvent
+from ..utils import KEY_ESC, KEY_ENTER, KEY_TAB, KEY_BACKSPACE
+
+CSI = "\x1b["
+
+# Sent when a session starts / ends: alternate screen, hidden cursor, SGR any-motion mouse reporting
+TERMINAL_SETUP = "\x1b[?1049h\x1b[?25l\x1b[?1003h\x1b[?1006h\x1b[2J"
+TERMINAL_RESTORE = "\x1b[?1006l\x1b[?1003l\x1b[0m\x1b[?25h\x1b[?1049l"
+# Moves to the far corner and asks where the cursor ended up: the reply is the terminal size
+SIZE_QUERY = "\x1b7\x1b[999;999H\x1b[6n\x1b8"
+
+_ATTR_SGR = ((curses.A_BOLD, "1"), (curses.A_DIM, "2"), (curses.A_UNDERLINE, "4"),
+             (curses.A_BLINK, "5"), (curses.A_REVERSE, "7"))
+
+
+def _color_sgr(color: int, base: int) -> str:
+    """SGR parameter for a resolved color; ``base`` is 30 for foreground, 40 for background."""
+    if color < 0:
+        return str(base + 9)
+    if is_rgb(color):
+        r, g, b = rgb_components(color)
+        return f"{base + 8};2;{r};{g};{b}"
+    if color < 8:
+        return str(base + color)
+    if color < 16:
+        return str(base + 60 + color - 8)
+    return f"{base + 8};5;{color}"
+
+
+def detect_color_depth(environ=os.environ) -> int:
+    """Colors the terminal described by ``COLORTERM``/``TERM`` can show: 1 << 24, 256 or 16."""
+    if environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return 1 << 24
+    if "256color" in environ.get("TERM", ""):
+        return 256
+    return 16
+
+
+class AnsiRenderer(HeadlessRenderer):
+    """A TerminalRenderer that drives the terminal with escape sequences instead of curses.
+
+    Widgets draw into the back buffer exactly as they do under curses.
+    ``flush`` compares it with the front buffer (what the terminal shows) and
+    returns the escapes for the cells that changed: the cursor is only moved
+    when it isn't already where the next run starts, and then by the shortest
+    of CR/LF, a relative move or an absolute one; SGR is only sent when the
+    attribute changes, and only the parts that differ; long runs of blanks
+    become an erase. Bands of rows whose content moved up or down (a console
+    gaining lines, an editor scrolling) are shifted by the terminal inside a
+    scroll region first, so only the rows that scrolled in are sent. The
+    frame is wrapped in synchronized-update mode so the terminal never shows
+    half of it. ``present`` writes it to ``output`` (a
+    file descriptor or binary stream) in one write.
+
+    Colors are sent as 24-bit, 256 or 16 color SGR depending on
+    ``color_depth`` (detected from the environment by default); each color's
+    code is worked out once and cached.
+    """
+
+    # Blank runs at least this long are erased (ECH/EL) instead of written out
+    ERASE_MIN = 8
+    SYNC_BEGIN = "\x1b[?2026h"
+    SYNC_END = "\x1b[?2026l"
+    # A hardware scroll has to save at least this many cell rewrites to be worth its escapes
+    SCROLL_MIN_SAVING = 24
+
+    def __init__(self, width: int = 80, height: int = 24, output=None, synchronized: bool = True,
+                 color_depth: Optional[int] = None, hardware_scroll: bool = True):
+        super().__init__(width, height)
+        self.hardware_scroll = hardware_scroll
+        self.color_depth = color_depth or detect_color_depth()
+        self.color_codes: Dict[Tuple[int, int], str] = {}
+        self.output = output
+        self.synchronized = synchronized
+        self.front: Optional[ScreenBuffer] = None  # what the terminal shows; None forces a full repaint
+        self.cursor: Tuple[Optional[int], Optional[int]] = (None, None)
+        self.current_attr: Optional[int] = None
+        self.cursor_shown: Optional[bool] = None
+        self.frames = 0
+        self.bytes_written = 0
+
+    def resize(self, width: int, height: int):
+        super().resize(width, height)
+        self.front = None
+
+    def invalidate(self):
+        """Forgets what the terminal shows, so the next frame repaints everything."""
+        self.front = None
+
+    def set_theme(self, theme: Theme):
+        # Pair numbers are reassigned, so cells on screen can't be compared with new frames
+        super().set_theme(theme)
+        self.color_codes = {}
+        self.invalidate()
+
+    def color_code(self, color: int, base: int) -> str:
+        key = (color, base)
+        code = self.color_codes.get(key)
+        if code is None:
+            code = self.color_codes[key] = _color_sgr(quantize(color, self.color_depth), base)
+        return code
+
+    def sgr(self, attr: int) -> str:
+        return CSI + ";".join(["0"] + self._sgr_params(attr, None)) + "m"
+
+    def _sgr_params(self, attr: int, old: Optional[int]) -> List[str]:
+        fg, bg = self.pair_colors.get(attr >> PAIR_SHIFT, (-1, -1))
+        if old is None:
+            params = []
+            if fg != -1:
+                params.append(self.color_code(fg, 30))
+            if bg != -1:
+                params.append(self.color_code(bg, 40))
+            low = attr & ATTR_MASK
+            params.extend(code for flag, code in _ATTR_SGR if low & flag)
+            return params
+        old_fg, old_bg = self.pair_colors.get(old >> PAIR_SHIFT, (-1, -1))
+        params = []
+        if fg != old_fg:
+            params.append(self.color_code(fg, 30))
+        if bg != old_bg:
+            params.append(self.color_code(bg, 40))
+        return params
+
+    def _set_attr(self, out: List[str], attr: int):
+        old = self.current_attr
+        if attr == old:
+            return
+        if old is not None and (attr & ATTR_MASK) == (old & ATTR_MASK):
+            # Only the colors changed; the other attributes can stay set
+            out.append(CSI + ";".join(self._sgr_params(attr, old)) + "m")
+        else:
+            out.append(CSI + ";".join(["0"] + self._sgr_params(attr, None)) + "m")
+        self.current_attr = attr
+
+    def _move(self, out: List[str], y: int, x: int):
+        cy, cx = self.cursor
+        if cy == y and cx == x:
+            return
+        if cy is not None and cx is not None:
+            if x == 0 and cy < y <= cy + 2:
+                out.append("\r" + "\n" * (y - cy))
+            elif cy == y and x > cx:
+                out.append(f"{CSI}{x - cx}C" if x - cx > 1 else CSI + "C")
+            elif cy == y and x == 0:
+                out.append("\r")
+            else:
+                out.append(f"{CSI}{y + 1};{x + 1}H" if x else f"{CSI}{y + 1}H")
+        else:
+            out.append(f"{CSI}{y + 1};{x + 1}H" if x else f"{CSI}{y + 1}H")
+        self.cursor = (y, x)
+
+    def _write_run(self, out: List[str], y: int, start: int, end: int, chars: List[str], attrs: List[int]):
+        w = self.screen.w
+        x = start
+        while x < end:
+            attr = attrs[x]
+            stop = x + 1
+            while stop < end and attrs[stop] == attr:
+                stop += 1
+            self._set_attr(out, attr)
+            # Blanks with no A_* attributes can be erased in bulk: an erase fills with the current background
+            erasable = not attr & ATTR_MASK
+            segment = x
+            while x < stop:
+                if erasable and chars[x] == " ":
+                    blank = x
+                    while blank < stop and chars[blank] == " ":
+                        blank += 1
+                    to_eol = blank == w
+                    if blank - x >= (3 if to_eol else self.ERASE_MIN):
+                        self._text(out, y, segment, chars[segment:x])
+                        self._move(out, y, x)
+                        out.append(CSI + "K" if to_eol else f"{CSI}{blank - x}X")
+                        segment = blank
+                    x = blank
+                else:
+                    x += 1
+            self._text(out, y, segment, chars[segment:stop])
+
+    def _text(self, out: List[str], y: int, x: int, cells: List[str]):
+        if cells:
+            self._move(out, y, x)
+            out.append("".join(cells))
+            self._advance(y, x + len(cells))
+
+    def _advance(self, y: int, x: int):
+        # At the right margin the terminal's cursor position is implementation-defined
+        self.cursor = (y, x) if x < self.screen.w else (None, None)
+
+    @staticmethod
+    def _row_cost(chars, attrs, old_chars, old_attrs) -> int:
+        return sum(map(operator.ne, chars, old_chars)) + sum(map(operator.ne, attrs, old_attrs))
+
+    def _scroll_bands(self, out: List[str], back: ScreenBuffer, front: ScreenBuffer):
+        # Bands are runs of changed rows; a couple of unchanged rows inside one (repeated lines) don't split it
+        h = back.h
+        changed = [back.chars[y] != front.chars[y] or back.attrs[y] != front.attrs[y] for y in range(h)]
+        y = 0
+        while y < h:
+            if not changed[y]:
+                y += 1
+                continue
+            top = bottom = y
+            while y < h and (changed[y] or any(changed[y:y + 3])):
+                if changed[y]:
+                    bottom = y + 1
+                y += 1
+            if bottom - top >= 3:
+                self._scroll_band(out, back, front, top, bottom)
+
+    def _scroll_band(self, out: List[str], back: ScreenBuffer, front: ScreenBuffer, top: int, bottom: int):
+        w = back.w
+        blank_chars, blank_attrs = [" "] * w, [0] * w
+        # Candidate shifts: rows of the old band that match a changed row of the new one where it changed
+        probe = (top + bottom) // 2
+        while back.chars[probe] == front.chars[probe] and back.attrs[probe] == front.attrs[probe]:
+            probe += 1
+        chars, attrs = back.chars[probe], back.attrs[probe]
+        old_chars, old_attrs = front.chars[probe], front.attrs[probe]
+        diff = [x for x in range(w) if chars[x] != old_chars[x] or attrs[x] != old_attrs[x]]
+        left, right = diff[0], diff[-1] + 1
+        span_chars, span_attrs = chars[left:right], attrs[left:right]
+        n = bottom - top
+        candidates = []
+        for distance in range(1, n - 1):
+            for shift in (distance, -distance):
+                source = probe + shift
+                if top <= source < bottom and front.chars[source][left:right] == span_chars and front.attrs[source][left:right] == span_attrs:
+                    candidates.append(shift)
+            if len(candidates) >= 3:
+                break
+        if not candidates:
+            return
+        row_cost = self._row_cost
+        plain = [row_cost(back.chars[y], back.attrs[y], front.chars[y], front.attrs[y]) for y in range(top, bottom)]
+        blank = [row_cost(back.chars[y], back.attrs[y], blank_chars, blank_attrs) for y in range(top, bottom)]
+        best, best_saving = None, self.SCROLL_MIN_SAVING - 1
+        for shift in candidates:
+            shifted = [row_cost(back.chars[y], back.attrs[y], front.chars[y + shift], front.attrs[y + shift])
+                       if top <= y + shift < bottom else blank[y - top] for y in range(top, bottom)]
+            # The terminal scrolls whole rows, so content beside the band (another window) moves too;
+            # scroll only the run of rows where shifting gains the most
+            sum_plain = [0, *itertools.accumulate(plain)]
+            sum_shifted = [0, *itertools.accumulate(shifted)]
+            sum_blank = [0, *itertools.accumulate(blank)]
+            run_start, run_gain = 0, 0
+            for i in range(n):
+                if run_gain <= 0:
+                    run_start, run_gain = i, 0
+                run_gain += plain[i] - shifted[i]
+                first, last = run_start, i + 1
+                if last - first < abs(shift) + 1:
+                    continue
+                # Rows whose content would come from outside the region scroll in blank
+                edge = last - shift if shift > 0 else first - shift
+                if shift > 0:
+                    cost = sum_shifted[edge] - sum_shifted[first] + sum_blank[last] - sum_blank[edge]
+                else:
+                    cost = sum_blank[edge] - sum_blank[first] + sum_shifted[last] - sum_shifted[edge]
+                saving = sum_plain[last] - sum_plain[first] - cost
+                if saving > best_saving:
+                    best, best_saving, region = shift, saving, (top + first, top + last)
+        if best is None:
+            return
+        top, bottom = region
+        # Rows scrolled in are cleared to the current background, so reset it to match an empty ScreenBuffer
+        self._set_attr(out, 0)
+        out.append(f"{CSI}{top + 1};{bottom}r")
+        if best > 0:
+            # Line feeds at the bottom margin move the region up
+            out.append(f"{CSI}{bottom};1H" + "\n" * best)
+            kept = list(range(top + best, bottom))
+            fresh = best
+        else:
+            # Reverse index at the top margin moves it down
+            out.append(f"{CSI}{top + 1};1H" + "\x1bM" * -best)
+            kept = list(range(top, bottom + best))
+            fresh = -best
+        # Setting the margins homes the cursor on some terminals; let the next move be absolute
+        out.append(CSI + "r")
+        self.cursor = (None, None)
+        moved_chars = [front.chars[y] for y in kept]
+        moved_attrs = [front.attrs[y] for y in kept]
+        blank_rows_chars = [blank_chars[:] for _ in range(fresh)]
+        blank_rows_attrs = [blank_attrs[:] for _ in range(fresh)]
+        if best > 0:
+            front.chars[top:bottom] = moved_chars + blank_rows_chars
+            front.attrs[top:bottom] = moved_attrs + blank_rows_attrs
+        else:
+            front.chars[top:bottom] = blank_rows_chars + moved_chars
+            front.attrs[top:bottom] = blank_rows_attrs + moved_attrs
+
+    def flush(self) -> str:
+        """Returns the escape sequences that bring the terminal up to date with the back buffer."""
+        back = self.screen
+        out: List[str] = []
+        if self.front is None or (self.front.h, self.front.w) != (back.h, back.w):
+            self.current_attr = None
+            self._set_attr(out, 0)
+            out.append(CSI + "2J")
+            # The clear leaves default-colored blanks, which is what an empty ScreenBuffer holds
+            self.front = ScreenBuffer(back.h, back.w)
+        elif self.hardware_scroll:
+            self._scroll_bands(out, back, self.front)
+        front = self.front
+        w = back.w
+        for y in range(back.h):
+            chars, attrs = back.chars[y], back.attrs[y]
+            old_chars, old_attrs = front.chars[y], front.attrs[y]
+            if chars == old_chars and attrs == old_attrs:
+                continue
+            x = 0
+            while x < w:
+                if chars[x] == old_chars[x] and attrs[x] == old_attrs[x]:
+                    x += 1
+                    continue
+                start = x
+                end = x + 1
+                while end < w:
+                    if chars[end] != old_chars[end] or attrs[end] != old_attrs[end]:
+                        end += 1
+                        continue
+                    # A short stretch of unchanged cells in the same attribute is cheaper to rewrite than to skip
+                    gap = end
+                    while gap < w and gap - end < 4 and chars[gap] == old_chars[gap] and attrs[gap] == attrs[end - 1] == old_attrs[gap]:
+                        gap += 1
+                    if gap < w and gap - end < 4 and (chars[gap] != old_chars[gap] or attrs[gap] != old_attrs[gap]):
+                        end = gap
+                    else:
+                        break
+                self._write_run(out, y, start, end, chars, attrs)
+                x = end
+            front.chars[y] = chars[:]
+            front.attrs[y] = attrs[:]
+        show = bool(self.cursor_visibility)
+        if show:
+            self._move(out, *back.getyx())
+        if show != self.cursor_shown:
+            out.append(CSI + ("?25h" if show else "?25l"))
+            self.cursor_shown = show
+        if out and self.synchronized:
+            out.insert(0, self.SYNC_BEGIN)
+            out.append(self.SYNC_END)
+        return "".join(out)
+
+    def present(self) -> int:
+        """Flushes the frame to ``output`` in a single write; returns the number of bytes written."""
+        data = self.flush().encode("utf-8")
+        if not data:
+            return 0
+        if isinstance(self.output, int):
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self.output, view):]
+        else:
+            self.output.write(data)
+            self.output.flush()
+        self.frames += 1
+        self.bytes_written += len(data)
+        return len(data)
+
+
+# Final byte of "CSI ... ~" and "CSI 1;mod X" / "SS3 X" sequences -> curses key codes
+_TILDE_KEYS = {
+    1: curses.KEY_HOME, 2: curses.KEY_IC, 3: curses.KEY_DC, 4: curses.KEY_END,
+    5: curses.KEY_PPAGE, 6: curses.KEY_NPAGE, 7: curses.KEY_HOME, 8: curses.KEY_END,
+    11: curses.KEY_F1, 12: curses.KEY_F2, 13: curses.KEY_F3, 14: curses.KEY_F4,
+    15: curses.KEY_F5, 17: curses.KEY_F6, 18: curses.KEY_F7, 19: curses.KEY_F8,
+    20: curses.KEY_F9, 21: curses.KEY_F10, 23: curses.KEY_F11, 24: curses.KEY_F12,
+}
+_LETTER_KEYS = {
+    "A": curses.KEY_UP, "B": curses.KEY_DOWN, "C": curses.KEY_RIGHT, "D": curses.KEY_LEFT,
+    "H": curses.KEY_HOME, "F": curses.KEY_END, "Z": curses.KEY_BTAB,
+    "P": curses.KEY_F1, "Q": curses.KEY_F2, "R": curses.KEY_F3, "S": curses.KEY_F4,
+}
+_SHIFTED = {curses.KEY_UP: curses.KEY_SR, curses.KEY_DOWN: curses.KEY_SF, curses.KEY_LEFT: curses.KEY_SLEFT,
+            curses.KEY_RIGHT: curses.KEY_SRIGHT, curses.KEY_HOME: curses.KEY_SHOME, curses.KEY_END: curses.KEY_SEND,
+            curses.KEY_DC: curses.KEY_SDC}
+_BUTTON_STATES = {
+    0: (curses.BUTTON1_PRESSED, curses.BUTTON1_RELEASED),
+    1: (curses.BUTTON2_PRESSED, curses.BUTTON2_RELEASED),
+    2: (curses.BUTTON3_PRESSED, curses.BUTTON3_RELEASED),
+}
+
+
+class AnsiInputParser:
+    """Turns the bytes a terminal sends into the KeyEvent/MouseEvent objects curses would produce.
+
+    Understands UTF-8 text, control keys, the common xterm/VT cursor, editing
+    and function key sequences (with Shift), Alt+key as ESC-prefixed keys and
+    SGR (1006) mouse reports. An incomplete sequence at the end of a read is
+    kept for the next ``feed``; a lone ESC stays pending until ``flush`` is
+    called, since only a pause tells it apart from the start of a sequence.
+    Replies to SIZE_QUERY come back as a "size" UIEvent with ``w``/``h``.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self.expect_size = False
+        self.screen_w = 80
+        self.screen_h = 24
+
+    @property
+    def pending_escape(self) -> bool:
+        return self.buffer.startswith("\x1b")
+
+    def feed(self, data: bytes) -> List[UIEvent]:
+        self.buffer += self.decoder.decode(data)
+        return self._parse(final=False)
+
+    def flush(self) -> List[UIEvent]:
+        return self._parse(final=True)
+
+    def _parse(self, final: bool) -> List[UIEvent]:
+        events: List[UIEvent] = []
+        buf = self.buffer
+        i, n = 0, len(buf)
+        while i < n:
+            ch = buf[i]
+            if ch != "\x1b":
+                events.append(self._char_event(ch))
+                i += 1
+                continue
+            if i + 1 >= n:
+                if not final:
+                    break
+                events.append(KeyEvent(KEY_ESC))
+                i += 1
+                continue
+            nxt = buf[i + 1]
+            if nxt == "[" or nxt == "O":
+                end = i + 2
+                while end < n and not "@" <= buf[end] <= "~":
+                    end += 1
+                if end >= n:
+                    if not final:
+                        break
+                    events.append(KeyEvent(KEY_ESC))
+                    i += 1
+                    continue
+                event = self._sequence(nxt, buf[i + 2:end], buf[end])
+                if event is not None:
+                    events.append(event)
+                i = end + 1
+            elif nxt == "\x1b":
+                events.append(KeyEvent(KEY_ESC))
+                i += 1
+            elif nxt.isprintable():
+                events.append(KeyEvent(("ALT", ord(nxt))))
+                i += 2
+            else:
+                events.append(KeyEvent(KEY_ESC))
+                i += 1
+        self.buffer = buf[i:]
+        return events
+
+    @staticmethod
+    def _char_event(ch: str) -> KeyEvent:
+        if ch in "\r\n":
+            return KeyEvent(KEY_ENTER)
+        if ch == "\t":
+            return KeyEvent(KEY_TAB)
+        if ch == "\b" or ch == "\x7f":
+            return KeyEvent(KEY_BACKSPACE)
+        if ord(ch) < 32:
+            return KeyEvent(ord(ch))
+        return KeyEvent(ch)
+
+    def _sequence(self, intro: str, params: str, final: str) -> Optional[UIEvent]:
+        if intro == "[" and params.startswith("<") and final in "Mm":
+            return self._mouse(params[1:], final == "M")
+        fields = params.split(";")
+        try:
+            nums = [int(f) if f else 1 for f in fields]
+        except ValueError:
+            return None
+        # Modified F3 is also CSI 1;m R, but a size reply is never one row tall
+        if final == "R" and self.expect_size and len(nums) == 2 and nums[0] > 1:
+            self.expect_size = False
+            self.screen_h, self.screen_w = nums
+            return UIEvent("size", w=self.screen_w, h=self.screen_h)
+        modifier = nums[1] if len(nums) > 1 else 1
+        if final == "~":
+            key = _TILDE_KEYS.get(nums[0])
+        else:
+            key = _LETTER_KEYS.get(final)
+        if key is None:
+            return None
+        if modifier == 2:
+            if curses.KEY_F1 <= key <= curses.KEY_F12:
+                key += 12
+            else:
+                key = _SHIFTED.get(key, key)
+        return KeyEvent(key)
+
+    def _mouse(self, params: str, pressed: bool) -> Optional[MouseEvent]:
+        try:
+            code, x, y = (int(p) for p in params.split(";"))
+        except ValueError:
+            return None
+        x, y = x - 1, y - 1
+        button = code & 3
+        if code & 64:
+            bstate = curses.BUTTON4_PRESSED if button == 0 else getattr(curses, "BUTTON5_PRESSED", 0x200000)
+            return MouseEvent.obtain(x, y, bstate, "click", self.screen_w, self.screen_h)
+        if code & 32:
+            bstate = curses.REPORT_MOUSE_POSITION
+            if button in _BUTTON_STATES:
+                bstate |= _BUTTON_STATES[button][0]
+            return MouseEvent.obtain(x, y, bstate, "motion", self.screen_w, self.screen_h)
+        if button not in _BUTTON_STATES:
+            return None
+        bstate = _BUTTON_STATES[button][0 if pressed else 1]
+        if code & 4:
+            bstate |= curses.BUTTON_SHIFT
+        if code & 8:
+            bstate |= curses.BUTTON_ALT
+        if code & 16:
+            bstate |= curses.BUTTON_CTRL
+        return MouseEvent.obtain(x, y, bstate, "click", self.screen_w, self.screen_h)
+
+
+KEY_CTRL_C = 3
+# How long a lone ESC waits for the rest of an escape sequence before it counts as the Escape key
+ESCAPE_DELAY = 0.05
+
+
+def dispatch_input(manager, events: List[UIEvent], on_resize: Callable[[int, int], None]) -> bool:
+    """Hands parsed input to ``manager``; returns False if Ctrl-C asked to quit.
+
+    Of a run of motion reports read together only the newest is dispatched,
+    unless the component under the pointer wants every sample.
+    """
+    for i, event in enumerate(events):
+        if event.type == "key" and event.key == KEY_CTRL_C:
+            return False
+        if event.type == "size":
+            on_resize(event.data["w"], event.data["h"])
+        elif event.type == "mouse":
+            superseded = (event.etype == "motion" and i + 1 < len(events) and events[i + 1].type == "mouse"
+                          and events[i + 1].etype == "motion" and not manager.wants_all_motion(event.x, event.y))
+            if not superseded:
+                manager.handle_event(event)
+            event.release()
+        else:
+            manager.handle_event(event)
+    return True
+
+
+class AnsiTerminal:
+    """The local tty driven through AnsiRenderer and AnsiInputParser instead of curses.
+
+    Use as a context manager: entering puts ``fd_in`` in raw mode and sets up
+    the screen, leaving restores both. ``poll`` waits for input (or for any of
+    ``extra`` to become readable) and returns the parsed events; a SIGWINCH
+    turns into a "size" event.
+    """
+
+    def __init__(self, fd_in: int = 0, fd_out: int = 1, synchronized: bool = True):
+        self.fd_in = fd_in
+        self.fd_out = fd_out
+        w, h = os.get_terminal_size(fd_out)
+        self.renderer = AnsiRenderer(w, h, output=fd_out, synchronized=synchronized)
+        self.parser = AnsiInputParser()
+        self.parser.screen_w, self.parser.screen_h = w, h
+        self.saved_mode = None
+        self.previous_winch = None
+        self._winch_r, self._winch_w = -1, -1
+
+    def __enter__(self) -> "AnsiTerminal":
+        self.saved_mode = termios.tcgetattr(self.fd_in)
+        tty.setraw(self.fd_in)
+        self._winch_r, self._winch_w = os.pipe()
+        os.set_blocking(self._winch_r, False)
+        os.set_blocking(self._winch_w, False)
+        self.previous_winch = signal.signal(signal.SIGWINCH, self._on_winch)
+        os.write(self.fd_out, TERMINAL_SETUP.encode())
+        return self
+
+    def __exit__(self, *exc):
+        os.write(self.fd_out, TERMINAL_RESTORE.encode())
+        signal.signal(signal.SIGWINCH, self.previous_winch)
+        termios.tcsetattr(self.fd_in, termios.TCSADRAIN, self.saved_mode)
+        os.close(self._winch_r)
+        os.close(self._winch_w)
+
+    def _on_winch(self, signum, frame):
+        try:
+            os.write(self._winch_w, b"\0")
+        except BlockingIOError:
+            pass
+
+    def poll(self, extra=(), timeout: Optional[float] = None) -> List[UIEvent]:
+        if self.parser.pending_escape:
+            timeout = ESCAPE_DELAY if timeout is None else min(timeout, ESCAPE_DELAY)
+        ready, _, _ = select.select([self.fd_in, self._winch_r, *extra], [], [], timeout)
+        events: List[UIEvent] = []
+        if self._winch_r in ready:
+            try:
+                while os.read(self._winch_r, 64):
+                    pass
+            except BlockingIOError:
+                pass
+            w, h = os.get_terminal_size(self.fd_out)
+            self.parser.screen_w, self.parser.screen_h = w, h
+            events.append(UIEvent("size", w=w, h=h))
+        if self.fd_in in ready:
+            events.extend(self.parser.feed(os.read(self.fd_in, 65536)))
+        elif not ready and self.parser.pending_escape:
+            events.extend(self.parser.flush())
+        return events
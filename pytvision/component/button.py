@@ -15,6 +15,10 @@ class Button(Component):
     DEFAULT_SHADOW_FG = curses.COLOR_BLACK
     DEFAULT_SHADOW_BG = curses.COLOR_BLACK
 
+    focusable = True
+
+    __slots__ = ("label", "window", "onclick", "fg_color_focused", "bg_color_focused", "shadow_fg", "shadow_bg")
+
     def __init__(self, left, top, width, label: str, parent=None, window=None, onclick: Optional[Callable] = None):
         super().__init__(left, top, width, 1, parent)
         self.label = label
@@ -52,13 +56,13 @@ class Button(Component):
             _safe_add_string(renderer.screen, absolute_y, absolute_x + self.width, "▀", renderer.get_color_pair(self.shadow_fg, self.shadow_bg))
 
     def handleEvent(self, event: UIEvent) -> bool:
-        if event.type == "key" and event.data.get('key') in (KEY_ENTER, 32):
+        if event.type == "key" and event.key in (KEY_ENTER, 32):
             if self.onclick:
                 self.onclick()
             return True
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
-            bstate = event.data.get('bstate', 0)
+            mouse_x, mouse_y = event.x, event.y
+            bstate = event.bstate
             if is_mouse_over(self, mouse_x, mouse_y):
                 if bstate & (curses.BUTTON1_PRESSED | curses.BUTTON1_CLICKED):
                     self.isFocused = True
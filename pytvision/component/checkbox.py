@@ -7,6 +7,12 @@ from ..utils import KEY_ENTER
 class CheckBox(Component):
     DEFAULT_FG = curses.COLOR_WHITE
     DEFAULT_BG = -1
+    DEFAULT_FG_FOCUSED = curses.COLOR_WHITE
+    DEFAULT_BG_FOCUSED = curses.COLOR_BLUE
+
+    focusable = True
+
+    __slots__ = ("label", "isChecked", "fg_color_focused", "bg_color_focused")
 
     def __init__(self, left, top, label, parent=None, isChecked=False):
         super().__init__(left, top, len(label) + 4, 1, parent)
@@ -14,22 +20,33 @@ class CheckBox(Component):
         self.isChecked = isChecked
         self.fg_color = self.DEFAULT_FG
         self.bg_color = self.DEFAULT_BG
+        self.fg_color_focused = self.DEFAULT_FG_FOCUSED
+        self.bg_color_focused = self.DEFAULT_BG_FOCUSED
+
+    def set_focused_colors(self, fg=None, bg=None):
+        if fg is not None:
+            self.fg_color_focused = fg
+        if bg is not None:
+            self.bg_color_focused = bg
 
     def render(self, renderer: TerminalRenderer):
         if not self.visibility:
             return
         absolute_x, absolute_y = self.get_absolute_position()
         ch = "[x]" if self.isChecked else "[ ]"
-        renderer.draw_text(absolute_x, absolute_y, f"{ch} {self.label}", self.fg_color, self.bg_color)
+        fg = self.fg_color_focused if self.isFocused else self.fg_color
+        bg = self.bg_color_focused if self.isFocused else self.bg_color
+        renderer.draw_text(absolute_x, absolute_y, f"{ch} {self.label}", fg, bg)
 
     def handleEvent(self, event: UIEvent) -> bool:
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
+            mouse_x, mouse_y = event.x, event.y
             if is_mouse_over(self, mouse_x, mouse_y):
-                if event.data.get('bstate', 0) & curses.BUTTON1_CLICKED:
+                if event.bstate & (curses.BUTTON1_PRESSED | curses.BUTTON1_CLICKED):
                     self.isChecked = not self.isChecked
+                    self.isFocused = True
                     return True
-        if event.type == "key" and event.data.get('key') in (KEY_ENTER, 32):
+        if event.type == "key" and event.key in (KEY_ENTER, ' '):
             self.isChecked = not self.isChecked
             return True
         return False
\ No newline at end of file
@@ -1,15 +1,44 @@
 import curses
-from typing import List, Optional, Callable, Dict
+from typing import Optional, Callable, Dict, Tuple
 
 from .terminal_renderer import TerminalRenderer
-from .ui_event import UIEvent
+from .ui_event import UIEvent, WidgetEvent
 
+# Called as handler(component, event_name, exception) when a listener raises, for components
+# whose window manager has no listener_error_handler of its own; None drops the error
+_listener_error_handler: Optional[Callable[["Component", str, Exception], None]] = None
+
+
+def set_listener_error_handler(handler: Optional[Callable[["Component", str, Exception], None]]):
+    global _listener_error_handler
+    _listener_error_handler = handler
 
 
 class Component:
     DEFAULT_FG = curses.COLOR_WHITE
     DEFAULT_BG = -1  # Default terminal background
 
+    # Slots keep the small, numerous widgets (labels, checkboxes, buttons) free of a
+    # per-instance __dict__; subclasses that don't declare __slots__ still get one.
+    __slots__ = ("left", "top", "width", "height", "parent", "visibility", "isFocused",
+                 "event_handlers", "fg_color", "bg_color", "layout")
+
+    # Whether the component takes keyboard focus itself; containers leave this off
+    # and expose their focusable parts through focus_children()
+    focusable = False
+    # Whether pointer motion reaching the component may be coalesced to the latest
+    # position; drawing-style widgets that need every sample turn this off
+    coalesce_motion = True
+    # Whether a window may show the component's ``text`` in its bottom border when
+    # it sits on the last inner row (labels used as status lines)
+    status_line = False
+    # Whether the component opens a popup below itself; windows offer such children
+    # the mouse first, over the area hit_height() reports
+    has_popup = False
+    # The child that took the last button press; containers route it the pointer's
+    # motion and the release until the button comes up, wherever the pointer goes
+    pointer_grab = None
+
     def __init__(self, left: int = 0, top: int = 0, width: int = 10, height: int = 3, parent=None):
         self.left = left
         self.top = top
@@ -18,9 +47,10 @@ class Component:
         self.parent = parent
         self.visibility = True
         self.isFocused = False
-        self.event_handlers: Dict[str, List[Callable]] = {}
+        self.event_handlers: Optional[Dict[str, Tuple[Callable, ...]]] = None  # created on first listener
         self.fg_color = self.DEFAULT_FG
         self.bg_color = self.DEFAULT_BG
+        self.layout = None
 
     def set_colors(self, fg: Optional[int] = None, bg: Optional[int] = None):
         if fg is not None:
@@ -37,28 +67,92 @@ class Component:
             p = p.parent
         return absolute_x, absolute_y
 
+    def hit_height(self) -> int:
+        """Rows the component answers the mouse over, counting an open popup (see has_popup)."""
+        return self.height
+
+    def set_geometry(self, left: int, top: int, width: int, height: int):
+        resized = (width, height) != (self.width, self.height)
+        self.left, self.top, self.width, self.height = left, top, width, height
+        if resized:
+            self.relayout()
+
+    def relayout(self):
+        if self.layout is not None:
+            self.layout.apply(self)
+
     def render(self, renderer: TerminalRenderer):
         raise NotImplementedError
 
     def handleEvent(self, event: UIEvent) -> bool:
         return False
 
+    def owning_manager(self):
+        """The WindowManager of the window this component is (or sits in), or None while not attached."""
+        p = self
+        while p is not None and getattr(p, "manager", None) is None:
+            p = p.parent
+        return p.manager if p is not None else None
+
+    def call_soon_threadsafe(self, fn: Callable, *args) -> bool:
+        """Queues ``fn(*args)`` on the UI thread of the owning window manager; False while not attached to one."""
+        manager = self.owning_manager()
+        return manager is not None and manager.call_soon_threadsafe(fn, *args)
+
+    def call_later(self, delay: float, fn: Callable, *args):
+        """Schedules ``fn(*args)`` on the owning manager's timers; returns the Timer, or None while not attached."""
+        manager = self.owning_manager()
+        return manager.call_later(delay, fn, *args) if manager is not None else None
+
+    def call_every(self, interval: float, fn: Callable, *args):
+        """Like call_later, but repeating every ``interval`` seconds until the Timer is cancelled."""
+        manager = self.owning_manager()
+        return manager.call_every(interval, fn, *args) if manager is not None else None
+
+    def focus_children(self):
+        return ()
+
+    def child_at(self, x: int, y: int) -> Optional["Component"]:
+        """The child a mouse event at (x, y) would go to first; None for components without children."""
+        return None
+
+    def focus_hidden(self, component: "Component"):
+        # Bubbles up to the owning window, which moves focus off the hidden subtree
+        if self.parent is not None:
+            self.parent.focus_hidden(component)
+
     def show(self):
         self.visibility = True
 
     def hide(self):
         self.visibility = False
+        if self.parent is not None:
+            self.parent.focus_hidden(self)
 
     def addEventListener(self, evname: str, callback: Callable):
-        self.event_handlers.setdefault(evname, []).append(callback)
+        # Listener tuples are replaced rather than mutated, so dispatch can iterate them without a copy
+        if self.event_handlers is None:
+            self.event_handlers = {}
+        self.event_handlers[evname] = self.event_handlers.get(evname, ()) + (callback,)
+
+    def removeEventListener(self, evname: str, callback: Callable):
+        callbacks = self.event_handlers.get(evname, ()) if self.event_handlers else ()
+        if callback in callbacks:
+            self.event_handlers[evname] = tuple(c for c in callbacks if c != callback)
 
     def dispatchEvent(self, evname: str, **kw):
-        event = UIEvent(evname, **kw)
-        for callback in list(self.event_handlers.get(evname, [])):
+        callbacks = self.event_handlers.get(evname) if self.event_handlers else None
+        if not callbacks:
+            return
+        event = WidgetEvent(evname, self, kw)
+        for callback in callbacks:
             try:
                 callback(event)
-            except Exception:
-                pass
+            except Exception as e:
+                manager = self.owning_manager()
+                handler = getattr(manager, "listener_error_handler", None) or _listener_error_handler
+                if handler is not None:
+                    handler(self, evname, e)
 
 def is_mouse_over(child: Component, mouse_x: int, mouse_y: int):
     absolute_x, absolute_y = child.get_absolute_position()
@@ -3,6 +3,7 @@ from typing import List
 
 from .component import Component
 from .terminal_renderer import TerminalRenderer
+from .theme import LIGHT_GRAY
 from .ui_event import UIEvent
 from .menu_item import MenuItem
 
@@ -11,15 +12,15 @@ from ..utils import _split_mnemonic, _safe_add_string, KEY_ENTER, KEY_ESC
 
 class ContextMenu(Component):
     DEFAULT_FG = curses.COLOR_BLACK
-    DEFAULT_BG = 20
+    DEFAULT_BG = LIGHT_GRAY
     DEFAULT_SELECTED_FG = curses.COLOR_BLACK
     DEFAULT_SELECTED_BG = curses.COLOR_GREEN
     DEFAULT_HOTKEY_FG = curses.COLOR_RED
-    DEFAULT_HOTKEY_BG = 20
+    DEFAULT_HOTKEY_BG = LIGHT_GRAY
     DEFAULT_HOTKEY_SELECTED_FG = curses.COLOR_RED
     DEFAULT_HOTKEY_SELECTED_BG = curses.COLOR_GREEN
     DEFAULT_BORDER_FG = curses.COLOR_BLACK
-    DEFAULT_BORDER_BG = 20
+    DEFAULT_BORDER_BG = LIGHT_GRAY
 
     def __init__(self, left, top, width=24, parent=None):
         super().__init__(left, top, width, 6, parent)
@@ -99,11 +100,18 @@ class ContextMenu(Component):
     def close(self):
         self.opened = False
 
+    def activate(self, index: int):
+        item = self.items[index]
+        self.selectedIndex = index
+        self.close()
+        if item.callback and item.enabled:
+            item.callback()
+
     def handleEvent(self, event: UIEvent) -> bool:
         if not self.opened:
             return False
         if event.type == "key":
-            key = event.data.get('key')
+            key = event.key
             if key == curses.KEY_UP:
                 self.selectedIndex = (self.selectedIndex - 1) % len(self.items)
                 return True
@@ -111,22 +119,19 @@ class ContextMenu(Component):
                 self.selectedIndex = (self.selectedIndex + 1) % len(self.items)
                 return True
             if key in (KEY_ENTER,):
-                item = self.items[self.selectedIndex]
-                self.close()
-                if item.callback and item.enabled:
-                    item.callback()
+                self.activate(self.selectedIndex)
                 return True
             if key == KEY_ESC:
                 self.close()
                 return True
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
+            mouse_x, mouse_y = event.x, event.y
             absolute_x, absolute_y = self.get_absolute_position()
             if mouse_x >= absolute_x and mouse_x < absolute_x + self.width and mouse_y >= absolute_y and mouse_y < absolute_y + self.height:
                 idx = mouse_y - (absolute_y + 1)
                 if 0 <= idx < len(self.items):
                     self.selectedIndex = idx
-                    if event.data.get('bstate', 0) & curses.BUTTON1_PRESSED:
+                    if event.bstate & curses.BUTTON1_PRESSED:
                         self.close()
                         item = self.items[idx]
                         if item.callback and item.enabled:
@@ -0,0 +1,465 @@
+import curses
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .component import Component, is_mouse_over
+from .terminal_renderer import TerminalRenderer
+from .ui_event import UIEvent
+from ..utils import _safe_add_string, _clamp, KEY_ENTER
+
+
+class DataSource:
+    """Rows shown by a DataGrid.
+
+    The grid only ever asks for the cells in its viewport, so a source can be
+    backed by anything that supports random access (a list, a numpy array, a
+    cursor over a query result). ``column_values`` is used once per column to
+    build sort keys and may be overridden with a faster bulk read.
+    """
+
+    def row_count(self) -> int:
+        raise NotImplementedError
+
+    def columns(self) -> List[str]:
+        raise NotImplementedError
+
+    def value(self, row: int, col: int):
+        raise NotImplementedError
+
+    def column_values(self, col: int) -> Sequence:
+        return [self.value(row, col) for row in range(self.row_count())]
+
+
+class ListDataSource(DataSource):
+    def __init__(self, rows: Sequence[Sequence], columns: List[str]):
+        self.rows = rows
+        self.names = columns
+
+    def row_count(self):
+        return len(self.rows)
+
+    def columns(self):
+        return self.names
+
+    def value(self, row, col):
+        return self.rows[row][col]
+
+    def column_values(self, col):
+        return [r[col] for r in self.rows]
+
+
+class GridColumn:
+    def __init__(self, title: str, width: Optional[int] = None, align: str = "left",
+                 formatter: Optional[Callable[[object], str]] = None):
+        self.title = title
+        self.width = width  # None sizes the column from a sample of its values
+        self.align = align
+        self.formatter = formatter or _format_value
+
+    def format(self, value, width: int) -> str:
+        text = self.formatter(value)
+        if len(text) > width:
+            return text[:width - 1] + "…" if width > 1 else text[:width]
+        return text.rjust(width) if self.align == "right" else text.ljust(width)
+
+
+def _format_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    return str(value)
+
+
+def _sort_key(value):
+    # Mixed columns sort numbers first, then text, then empty cells, instead of raising
+    if value is None:
+        return (2, "")
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value))
+
+
+class SortWorker(threading.Thread):
+    """Filters and sorts row indices off the UI thread.
+
+    Sort keys are built once per column and kept in the grid's ``sort_keys``
+    cache, so re-sorting, flipping direction or changing the filter reuses them.
+    ``deliver(worker)`` is called once ``order`` is ready, on the worker thread.
+    """
+
+    CHUNK = 50000
+
+    def __init__(self, source: DataSource, sort_keys: Dict[int, list], sort_col: Optional[int],
+                 descending: bool, predicate: Optional[Callable[[DataSource, int], bool]],
+                 deliver: Callable[["SortWorker"], None], on_exit: Optional[Callable[[], None]] = None):
+        super().__init__(daemon=True)
+        self.source = source
+        self.sort_keys = sort_keys
+        self.sort_col = sort_col
+        self.descending = descending
+        self.predicate = predicate
+        self.cancelled = threading.Event()
+        self.deliver = deliver
+        self.on_exit = on_exit
+        self.order: Optional[List[int]] = None
+
+    def run(self):
+        try:
+            self._sort()
+        finally:
+            if self.on_exit is not None:
+                self.on_exit()
+
+    def _sort(self):
+        n = self.source.row_count()
+        if self.predicate is None:
+            rows = list(range(n))
+        else:
+            rows = []
+            for start in range(0, n, self.CHUNK):
+                if self.cancelled.is_set():
+                    return
+                rows.extend(r for r in range(start, min(n, start + self.CHUNK)) if self.predicate(self.source, r))
+        if self.sort_col is not None:
+            keys = self.sort_keys.get(self.sort_col)
+            if keys is None:
+                keys = [_sort_key(v) for v in self.source.column_values(self.sort_col)]
+                self.sort_keys[self.sort_col] = keys
+            if self.cancelled.is_set():
+                return
+            rows.sort(key=keys.__getitem__, reverse=self.descending)
+        self.order = rows
+        self.deliver(self)
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class DataGrid(Component):
+    """Virtualized table over a DataSource.
+
+    Only the rows and columns inside the viewport are read and formatted on each
+    frame. ``order`` maps view rows to source rows (``None`` means identity); a
+    sort or filter builds a new order on a SortWorker and the grid swaps it in
+    whole when the worker is done, so the view never shows a half-sorted table.
+    """
+
+    DEFAULT_FG = curses.COLOR_BLACK
+    DEFAULT_BG = curses.COLOR_WHITE
+    DEFAULT_BORDER_FG = curses.COLOR_BLACK
+    DEFAULT_BORDER_BG = curses.COLOR_WHITE
+    DEFAULT_HEADER_FG = curses.COLOR_WHITE
+    DEFAULT_HEADER_BG = curses.COLOR_BLUE
+    DEFAULT_HILITE_FG = curses.COLOR_BLACK
+    DEFAULT_HILITE_BG = curses.COLOR_CYAN
+    WIDTH_SAMPLE = 200
+    MAX_AUTO_WIDTH = 30
+    MIN_WIDTH = 3
+
+    focusable = True
+
+    def __init__(self, left, top, width, height, source: Optional[DataSource] = None,
+                 columns: Optional[List[GridColumn]] = None, frozen: int = 0, parent=None):
+        super().__init__(left, top, width, height, parent)
+        self.frozen = frozen
+        self.fg_color = self.DEFAULT_FG
+        self.bg_color = self.DEFAULT_BG
+        self.border_fg = self.DEFAULT_BORDER_FG
+        self.border_bg = self.DEFAULT_BORDER_BG
+        self.header_fg = self.DEFAULT_HEADER_FG
+        self.header_bg = self.DEFAULT_HEADER_BG
+        self.hilite_fg = self.DEFAULT_HILITE_FG
+        self.hilite_bg = self.DEFAULT_HILITE_BG
+        self.worker: Optional[SortWorker] = None
+        self.set_source(source or ListDataSource([], []), columns)
+
+    def set_border_colors(self, fg=None, bg=None):
+        if fg is not None:
+            self.border_fg = fg
+        if bg is not None:
+            self.border_bg = bg
+
+    def set_header_colors(self, fg=None, bg=None):
+        if fg is not None:
+            self.header_fg = fg
+        if bg is not None:
+            self.header_bg = bg
+
+    def set_hilite_colors(self, fg=None, bg=None):
+        if fg is not None:
+            self.hilite_fg = fg
+        if bg is not None:
+            self.hilite_bg = bg
+
+    def set_source(self, source: DataSource, columns: Optional[List[GridColumn]] = None):
+        self.cancel_sort()
+        self.source = source
+        self.columns = columns or [GridColumn(name) for name in source.columns()]
+        self.col_widths: Optional[List[int]] = None
+        self.sort_keys: Dict[int, list] = {}
+        self.order: Optional[List[int]] = None
+        self.sort_col: Optional[int] = None
+        self.descending = False
+        self.predicate = None
+        self.cursor = 0
+        self.cur_col = 0
+        self.view_top = 0
+        self.col_left = self.frozen
+
+    # -- rows -----------------------------------------------------------------
+
+    def row_count(self) -> int:
+        return len(self.order) if self.order is not None else self.source.row_count()
+
+    def source_row(self, view_row: int) -> int:
+        return self.order[view_row] if self.order is not None else view_row
+
+    def selected_row(self) -> Optional[int]:
+        return self.source_row(self.cursor) if self.cursor < self.row_count() else None
+
+    # -- sorting and filtering ------------------------------------------------
+
+    @property
+    def busy(self) -> bool:
+        return self.worker is not None
+
+    def sort_by(self, col: Optional[int], descending: bool = False):
+        self.sort_col = col
+        self.descending = descending
+        self._start_worker()
+
+    def set_filter(self, predicate: Optional[Callable[[DataSource, int], bool]]):
+        self.predicate = predicate
+        self._start_worker()
+
+    def filter_text(self, text: str, col: Optional[int] = None):
+        if not text:
+            self.set_filter(None)
+            return
+        needle = text.lower()
+        cols = [col] if col is not None else range(len(self.columns))
+        self.set_filter(lambda source, row: any(needle in _format_value(source.value(row, c)).lower() for c in cols))
+
+    def cancel_sort(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
+    def _start_worker(self):
+        self.cancel_sort()
+        if self.sort_col is None and self.predicate is None:
+            self._swap(None)
+            return
+        manager = self.owning_manager()
+        if manager is None:
+            # No UI thread to hand the order back to yet, so sort inline
+            self.worker = SortWorker(self.source, self.sort_keys, self.sort_col, self.descending, self.predicate, self._sorted)
+            self.worker.run()
+            return
+        manager.tasks.begin_work()
+        self.worker = SortWorker(self.source, self.sort_keys, self.sort_col, self.descending, self.predicate,
+                                 lambda worker: manager.call_soon_threadsafe(self._sorted, worker),
+                                 on_exit=manager.tasks.end_work)
+        self.worker.start()
+
+    def _sorted(self, worker: SortWorker):
+        if worker is self.worker:
+            self.worker = None
+            self._swap(worker.order)
+
+    def _swap(self, order: Optional[List[int]]):
+        # Keep the cursor on the same source row when it survives the new order
+        selected = self.selected_row()
+        self.order = order
+        if selected is None:
+            self.cursor = 0
+        elif order is None:
+            self.cursor = selected
+        else:
+            try:
+                self.cursor = order.index(selected)
+            except ValueError:
+                self.cursor = 0
+        self.cursor = _clamp(self.cursor, 0, max(0, self.row_count() - 1))
+        self._scroll_to_cursor()
+
+    # -- columns --------------------------------------------------------------
+
+    def column_widths(self) -> List[int]:
+        if self.col_widths is None:
+            # Sample both ends, since ids and timestamps tend to grow towards the bottom
+            n = self.source.row_count()
+            half = self.WIDTH_SAMPLE // 2
+            sample = range(n) if n <= self.WIDTH_SAMPLE else [*range(half), *range(n - half, n)]
+            widths = []
+            for c, column in enumerate(self.columns):
+                if column.width is not None:
+                    widths.append(column.width)
+                    continue
+                longest = max((len(column.formatter(self.source.value(r, c))) for r in sample), default=0)
+                widths.append(_clamp(max(longest, len(column.title) + 2), self.MIN_WIDTH, self.MAX_AUTO_WIDTH))
+            self.col_widths = widths
+        return self.col_widths
+
+    def resize_column(self, col: int, delta: int):
+        widths = self.column_widths()
+        widths[col] = max(self.MIN_WIDTH, widths[col] + delta)
+        self.columns[col].width = widths[col]
+
+    def _visible_columns(self, text_w: int):
+        # (column, width) pairs that fit across text_w: frozen columns first, then from col_left on
+        widths = self.column_widths()
+        out = []
+        x = 0
+        for c in list(range(min(self.frozen, len(widths)))) + list(range(self.col_left, len(widths))):
+            if x >= text_w:
+                break
+            w = min(widths[c], text_w - x)
+            out.append((c, w))
+            x += w + 1
+        return out
+
+    def _scroll_to_column(self):
+        if self.cur_col < self.frozen:
+            return
+        if self.cur_col < self.col_left:
+            self.col_left = self.cur_col
+            return
+        text_w = self.width - 3
+        while self.col_left < self.cur_col:
+            shown = [c for c, w in self._visible_columns(text_w) if w == self.column_widths()[c]]
+            if self.cur_col in shown:
+                break
+            self.col_left += 1
+
+    # -- rendering ------------------------------------------------------------
+
+    def _scroll_to_cursor(self):
+        inner_h = self.height - 3
+        if self.cursor < self.view_top:
+            self.view_top = self.cursor
+        elif self.cursor >= self.view_top + inner_h:
+            self.view_top = self.cursor - inner_h + 1
+        self.view_top = _clamp(self.view_top, 0, max(0, self.row_count() - inner_h))
+
+    def render(self, renderer: TerminalRenderer):
+        if not self.visibility:
+            return
+        absolute_x, absolute_y = self.get_absolute_position()
+        renderer.draw_box(absolute_x, absolute_y, self.width, self.height, title=None, win=renderer.screen, fg=self.border_fg, bg=self.border_bg, border_style="single")
+        inner_h = self.height - 3
+        text_w = self.width - 3  # the rightmost inner column is the scrollbar
+        visible = self._visible_columns(text_w)
+        header = []
+        for c, w in visible:
+            title = self.columns[c].title
+            if c == self.sort_col:
+                title += " ▼" if self.descending else " ▲"
+            header.append(title[:w].ljust(w))
+        renderer.draw_text(absolute_x + 1, absolute_y + 1, "│".join(header)[:text_w].ljust(text_w + 1), self.header_fg, self.header_bg)
+        count = self.row_count()
+        source = self.source
+        for i in range(inner_h):
+            idx = self.view_top + i
+            y = absolute_y + 2 + i
+            if idx >= count:
+                renderer.draw_text(absolute_x + 1, y, " " * text_w, self.fg_color, self.bg_color)
+                continue
+            row = self.source_row(idx)
+            text = "│".join(self.columns[c].format(source.value(row, c), w) for c, w in visible)[:text_w].ljust(text_w)
+            current = idx == self.cursor
+            fg = self.hilite_fg if current and self.isFocused else self.fg_color
+            bg = self.hilite_bg if current and self.isFocused else self.bg_color
+            renderer.draw_text(absolute_x + 1, y, text, fg, bg)
+        self._render_scrollbar(renderer, absolute_x, absolute_y, inner_h, count)
+
+    def _render_scrollbar(self, renderer, absolute_x, absolute_y, inner_h, count):
+        sbar_x = absolute_x + self.width - 2
+        track = renderer.get_color_pair(self.border_fg, self.border_bg)
+        for i in range(inner_h):
+            _safe_add_string(renderer.screen, absolute_y + 2 + i, sbar_x, '│', track)
+        if count > inner_h:
+            thumb_size = max(1, inner_h * inner_h // count)
+            thumb_pos = min(inner_h - thumb_size, inner_h * self.view_top // count)
+            for i in range(thumb_size):
+                _safe_add_string(renderer.screen, absolute_y + 2 + thumb_pos + i, sbar_x, '█',
+                                 renderer.get_color_pair(self.hilite_fg, self.hilite_bg))
+
+    # -- input ----------------------------------------------------------------
+
+    def _move_cursor(self, row: int):
+        self.cursor = _clamp(row, 0, max(0, self.row_count() - 1))
+        self._scroll_to_cursor()
+
+    def _toggle_sort(self, col: int):
+        if self.sort_col == col and not self.descending:
+            self.sort_by(col, descending=True)
+        elif self.sort_col == col:
+            self.sort_by(None)
+        else:
+            self.sort_by(col)
+
+    def handleEvent(self, event: UIEvent) -> bool:
+        page = max(1, self.height - 3)
+        if event.type == "key":
+            key = event.key
+            if key == curses.KEY_UP:
+                self._move_cursor(self.cursor - 1)
+            elif key == curses.KEY_DOWN:
+                self._move_cursor(self.cursor + 1)
+            elif key == curses.KEY_PPAGE:
+                self._move_cursor(self.cursor - page)
+            elif key == curses.KEY_NPAGE:
+                self._move_cursor(self.cursor + page)
+            elif key == curses.KEY_HOME:
+                self._move_cursor(0)
+            elif key == curses.KEY_END:
+                self._move_cursor(self.row_count() - 1)
+            elif key in (curses.KEY_LEFT, curses.KEY_RIGHT) and self.columns:
+                step = -1 if key == curses.KEY_LEFT else 1
+                self.cur_col = _clamp(self.cur_col + step, 0, len(self.columns) - 1)
+                self._scroll_to_column()
+            elif key in ('<', '>') and self.columns:
+                self.resize_column(self.cur_col, -1 if key == '<' else 1)
+            elif key == 's' and self.columns:
+                self._toggle_sort(self.cur_col)
+            elif key == KEY_ENTER:
+                row = self.selected_row()
+                if row is not None:
+                    self.dispatchEvent("onselect", row=row)
+            else:
+                return False
+            return True
+        if event.type == "mouse":
+            mouse_x, mouse_y = event.x, event.y
+            bstate = event.bstate
+            if not is_mouse_over(self, mouse_x, mouse_y):
+                return False
+            self.isFocused = True
+            if bstate & curses.BUTTON4_PRESSED:
+                self._move_cursor(self.cursor - 3)
+                return True
+            if bstate & getattr(curses, "BUTTON5_PRESSED", 0):
+                self._move_cursor(self.cursor + 3)
+                return True
+            absolute_x, absolute_y = self.get_absolute_position()
+            rel_x = mouse_x - (absolute_x + 1)
+            x = 0
+            col = None
+            for c, w in self._visible_columns(self.width - 3):
+                if x <= rel_x < x + w + 1:
+                    col = c
+                    break
+                x += w + 1
+            if col is not None:
+                self.cur_col = col
+            if mouse_y == absolute_y + 1:
+                if col is not None and bstate & (curses.BUTTON1_PRESSED | curses.BUTTON1_CLICKED):
+                    self._toggle_sort(col)
+                return True
+            row = mouse_y - (absolute_y + 2)
+            if 0 <= row < self.height - 3:
+                self._move_cursor(self.view_top + row)
+            return True
+        return False
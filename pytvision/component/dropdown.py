@@ -4,6 +4,7 @@ from typing import List
 
 from .component import Component, is_mouse_over
 from .terminal_renderer import TerminalRenderer
+from .theme import LIGHT_GRAY
 from .ui_event import UIEvent
 from ..utils import _safe_add_string, _clamp, KEY_ENTER, KEY_ESC
 
@@ -19,7 +20,10 @@ class Dropdown(Component):
     DEFAULT_DROPDOWN_HILITE_FG = curses.COLOR_WHITE
     DEFAULT_DROPDOWN_HILITE_BG = curses.COLOR_CYAN
     DEFAULT_BORDER_FG = curses.COLOR_BLACK
-    DEFAULT_BORDER_BG = 20
+    DEFAULT_BORDER_BG = LIGHT_GRAY
+
+    focusable = True
+    has_popup = True
 
     def __init__(self, left, top, width, items: List[str], parent=None):
         super().__init__(left, top, width, 1, parent)
@@ -44,6 +48,9 @@ class Dropdown(Component):
         self.dragging_scrollbar = False
         self.drag_start_y = 0
 
+    def hit_height(self) -> int:
+        return self.dropdown_height if self.dropdown_open else self.height
+
     def set_focused_colors(self, fg=None, bg=None):
         if fg is not None:
             self.fg_color_focused = fg
@@ -107,12 +114,12 @@ class Dropdown(Component):
                 for i in range(thumb_size):
                     _safe_add_string(renderer.screen, absolute_y + 2 + thumb_pos + i, sbar_x, '█',
                                    renderer.get_color_pair(self.dropdown_hilite_fg, self.dropdown_hilite_bg))
-        curses.curs_set(0)
+        renderer.curs_set(0)
 
     def handleEvent(self, event: UIEvent) -> bool:
         absolute_x, absolute_y = self.get_absolute_position()
         if event.type == "key":
-            key = event.data.get('key')
+            key = event.key
             if not self.dropdown_open:
                 if key in (KEY_ENTER, curses.KEY_DOWN, 32):
                     self.dropdown_open = True
@@ -160,8 +167,8 @@ class Dropdown(Component):
                         self.cursor = min(self.cursor + (self.dropdown_height - 2), len(self.items) - 1)
                     return True
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
-            bstate = event.data.get('bstate', 0)
+            mouse_x, mouse_y = event.x, event.y
+            bstate = event.bstate
             inner_h = self.dropdown_height - 2
             dropdown_bounds = (self.dropdown_open and
                              mouse_x >= absolute_x and mouse_x < absolute_x + self.width and
@@ -189,6 +196,18 @@ class Dropdown(Component):
                             self.view_top = self.cursor - (inner_h - 1)
                         self.isFocused = True
                         return True
+                # Motion reports carry the held button, so a drag is checked before the press below
+                if self.dragging_scrollbar and bstate & curses.REPORT_MOUSE_POSITION:
+                    delta_y = mouse_y - self.drag_start_y
+                    max_view_top = max(0, len(self.items) - inner_h)
+                    scroll_range = inner_h - (inner_h * inner_h // len(self.items))
+                    if scroll_range > 0:
+                        view_top_delta = (delta_y * max_view_top) // scroll_range
+                        self.view_top = _clamp(self.view_top + view_top_delta, 0, max_view_top)
+                        self.drag_start_y = mouse_y
+                        self.cursor = _clamp(self.cursor, self.view_top, min(len(self.items) - 1, self.view_top + inner_h - 1))
+                    self.isFocused = True
+                    return True
                 if len(self.items) > inner_h and mouse_x == absolute_x + self.width - 2 and absolute_y + 2 <= mouse_y < absolute_y + 2 + inner_h:
                     if bstate & curses.BUTTON1_PRESSED:
                         self.dragging_scrollbar = True
@@ -207,17 +226,6 @@ class Dropdown(Component):
                         self.dragging_scrollbar = False
                         self.isFocused = True
                         return True
-                elif self.dragging_scrollbar and bstate & curses.REPORT_MOUSE_POSITION:
-                    delta_y = mouse_y - self.drag_start_y
-                    max_view_top = max(0, len(self.items) - inner_h)
-                    scroll_range = inner_h - (inner_h * inner_h // len(self.items))
-                    if scroll_range > 0:
-                        view_top_delta = (delta_y * max_view_top) // scroll_range
-                        self.view_top = _clamp(self.view_top + view_top_delta, 0, max_view_top)
-                        self.drag_start_y = mouse_y
-                        self.cursor = _clamp(self.cursor, self.view_top, min(len(self.items) - 1, self.view_top + inner_h - 1))
-                    self.isFocused = True
-                    return True
                 elif bstate & curses.BUTTON1_RELEASED:
                     self.dragging_scrollbar = False
                     self.isFocused = True
@@ -0,0 +1,66 @@
+from typing import Callable, Dict, List, Optional
+
+from .component import Component
+
+
+def focus_leaves(component: Component) -> List[Component]:
+    """Focusable components in ``component``'s subtree, in tab order."""
+    if component.focusable:
+        return [component]
+    out = []
+    for child in component.focus_children():
+        out.extend(focus_leaves(child))
+    return out
+
+
+class FocusRing:
+    """Ordered focusable leaves of one window, flattened through nested containers.
+
+    The ring is patched when children are added or removed rather than rebuilt
+    on every Tab, and ``current`` is tracked directly, so finding the focused
+    leaf and moving to the next one don't scan the window's children.
+    """
+
+    def __init__(self):
+        self.items: List[Component] = []
+        self.positions: Dict[Component, int] = {}
+        self.current: Optional[Component] = None
+
+    def add(self, component: Component):
+        for leaf in focus_leaves(component):
+            if leaf not in self.positions:
+                self.positions[leaf] = len(self.items)
+                self.items.append(leaf)
+
+    def remove(self, component: Component):
+        gone = set(focus_leaves(component))
+        if not gone:
+            return
+        self.items = [leaf for leaf in self.items if leaf not in gone]
+        self.positions = {leaf: i for i, leaf in enumerate(self.items)}
+        if self.current in gone:
+            self.current = None
+
+    def rebuild(self, children: List[Component]):
+        current = self.current
+        self.items = []
+        self.positions = {}
+        for child in children:
+            self.add(child)
+        self.current = current if current in self.positions else None
+
+    def contains(self, leaf: Component) -> bool:
+        return leaf in self.positions
+
+    def step(self, delta: int, is_visible: Callable[[Component], bool]) -> Optional[Component]:
+        n = len(self.items)
+        if not n:
+            return None
+        start = self.positions.get(self.current)
+        if start is None:
+            start = -1 if delta > 0 else 0
+        for i in range(1, n + 1):
+            leaf = self.items[(start + delta * i) % n]
+            if is_visible(leaf):
+                return leaf
+        return None
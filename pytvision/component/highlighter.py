@@ -0,0 +1,248 @@
+import keyword
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+Run = Tuple[int, int, str]
+
+
+class Highlighter:
+    """Turns one line into styled runs ``(start, end, token)``.
+
+    ``tokenize`` receives the tokenizer state at the start of the line and returns
+    the state at its end, so multi-line constructs (triple-quoted strings, YAML
+    block scalars, tracebacks) can be carried from line to line.
+    """
+
+    initial_state = None
+
+    def tokenize(self, line: str, state) -> Tuple[List[Run], object]:
+        raise NotImplementedError
+
+
+class RegexHighlighter(Highlighter):
+    RULES: List[Tuple[str, Optional[str]]] = []
+
+    def __init__(self):
+        self.pattern = re.compile("|".join(f"(?P<g{i}>{rx})" for i, (rx, _) in enumerate(self.RULES)))
+        self.tokens = {f"g{i}": tok for i, (_, tok) in enumerate(self.RULES)}
+
+    def classify(self, token: str, text: str, line: str, end: int) -> Optional[str]:
+        return token
+
+    def scan(self, line: str, pos: int, runs: List[Run]):
+        for m in self.pattern.finditer(line, pos):
+            token = self.classify(self.tokens[m.lastgroup], m.group(), line, m.end())
+            if token:
+                runs.append((m.start(), m.end(), token))
+
+    def tokenize(self, line, state):
+        runs: List[Run] = []
+        self.scan(line, 0, runs)
+        return runs, state
+
+
+class PythonHighlighter(RegexHighlighter):
+    BUILTINS = {"print", "len", "range", "open", "str", "int", "float", "list", "dict", "set", "tuple",
+                "isinstance", "super", "self", "cls", "enumerate", "zip", "map", "min", "max", "sum"}
+    RULES = [
+        (r"#.*", "comment"),
+        (r"[rRbBuUfF]{0,2}(?:\"\"\"|''')", "triple"),
+        (r"[rRbBuUfF]{0,2}\"(?:\\.|[^\"\\])*\"?", "string"),
+        (r"[rRbBuUfF]{0,2}'(?:\\.|[^'\\])*'?", "string"),
+        (r"@[\w.]+", "decorator"),
+        (r"\b(?:0[xXoObB][\da-fA-F_]+|\d[\d_]*\.?[\d_]*(?:[eE][+-]?\d+)?j?)\b", "number"),
+        (r"[A-Za-z_]\w*", "name"),
+    ]
+
+    def classify(self, token, text, line, end):
+        if token == "name":
+            if keyword.iskeyword(text):
+                return "constant" if text in ("True", "False", "None") else "keyword"
+            return "builtin" if text in self.BUILTINS else None
+        return token
+
+    def tokenize(self, line, state):
+        runs: List[Run] = []
+        pos = 0
+        while pos <= len(line):
+            if state:
+                close = line.find(state, pos)
+                if close < 0:
+                    if pos < len(line):
+                        runs.append((pos, len(line), "string"))
+                    return runs, state
+                runs.append((pos, close + 3, "string"))
+                pos, state = close + 3, None
+                continue
+            for m in self.pattern.finditer(line, pos):
+                token = self.classify(self.tokens[m.lastgroup], m.group(), line, m.end())
+                if token == "triple":
+                    runs.append((m.start(), m.end(), "string"))
+                    state = m.group()[-3:]
+                    pos = m.end()
+                    break
+                if token:
+                    runs.append((m.start(), m.end(), token))
+            else:
+                return runs, None
+        return runs, state
+
+
+class JsonHighlighter(RegexHighlighter):
+    RULES = [
+        (r"\"(?:\\.|[^\"\\])*\"?", "string"),
+        (r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?", "number"),
+        (r"\b(?:true|false|null)\b", "constant"),
+        (r"[{}\[\],:]", "punct"),
+    ]
+
+    def classify(self, token, text, line, end):
+        if token == "string" and line[end:].lstrip().startswith(":"):
+            return "key"
+        return token
+
+
+class YamlHighlighter(RegexHighlighter):
+    RULES = [
+        (r"(?<!\S)#.*", "comment"),
+        (r"^\s*(?:-\s+)?[^\s#:'\"][^#:]*:(?=\s|$)", "key"),
+        (r"\"(?:\\.|[^\"\\])*\"?|'[^']*'?", "string"),
+        (r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])", "number"),
+        (r"\b(?:true|false|yes|no|null|True|False|Null|~)\b", "constant"),
+        (r"^\s*-(?=\s|$)|^---$|^\.\.\.$", "punct"),
+    ]
+    BLOCK_RE = re.compile(r"^(\s*).*:\s*[|>][+-]?\d*\s*(?:#.*)?$")
+
+    def tokenize(self, line, state):
+        indent = len(line) - len(line.lstrip())
+        if state is not None:
+            if not line.strip() or indent > state:
+                return ([(0, len(line), "string")] if line else []), state
+            state = None
+        runs: List[Run] = []
+        self.scan(line, 0, runs)
+        m = self.BLOCK_RE.match(line)
+        return runs, (len(m.group(1)) if m else None)
+
+
+class LogHighlighter(Highlighter):
+    LEVELS = {
+        "CRITICAL": "error", "FATAL": "error", "ERROR": "error",
+        "WARNING": "warning", "WARN": "warning",
+        "INFO": "info", "DEBUG": "debug", "TRACE": "debug",
+    }
+    LEVEL_RE = re.compile(r"\b(" + "|".join(LEVELS) + r")\b")
+    TIMESTAMP_RE = re.compile(r"^\[?\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d(?:[.,]\d+)?(?:Z|[+-]\d\d:?\d\d)?\]?")
+
+    def tokenize(self, line, state):
+        # Indented continuation lines (tracebacks, wrapped payloads) keep the level of their record
+        if line[:1].isspace() and state:
+            return [(0, len(line), state)], state
+        runs: List[Run] = []
+        m = self.TIMESTAMP_RE.match(line)
+        if m:
+            runs.append((0, m.end(), "comment"))
+        lm = self.LEVEL_RE.search(line, m.end() if m else 0)
+        if not lm:
+            return runs, None
+        level = self.LEVELS[lm.group(1)]
+        runs.append((lm.start(), len(line), level))
+        return runs, level
+
+
+HIGHLIGHTERS = {
+    "python": PythonHighlighter,
+    "json": JsonHighlighter,
+    "yaml": YamlHighlighter,
+    "log": LogHighlighter,
+}
+
+EXTENSIONS = {
+    ".py": "python", ".pyw": "python",
+    ".json": "json",
+    ".yaml": "yaml", ".yml": "yaml",
+    ".log": "log",
+}
+
+
+def get_highlighter(name: str) -> Highlighter:
+    return HIGHLIGHTERS[name]()
+
+
+def guess_highlighter(path: str) -> Optional[Highlighter]:
+    name = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    return get_highlighter(name) if name else None
+
+
+_UNKNOWN = object()
+
+
+class HighlightCache:
+    """Per-line tokenizer state and styled runs for a list of lines.
+
+    ``states[i]`` is the state at the start of line ``i``. States up to ``valid``
+    are known to be correct; states up to ``frontier`` have been computed at some
+    point but may be stale after an edit. Re-tokenizing after an edit stops as soon
+    as a recomputed state past the edited range matches the cached one, because
+    every line after that point would tokenize exactly as before.
+    """
+
+    def __init__(self, highlighter: Highlighter, line_count: int = 0):
+        self.highlighter = highlighter
+        self.reset(line_count)
+
+    def reset(self, line_count: int):
+        self.states: List[object] = [self.highlighter.initial_state] + [_UNKNOWN] * line_count
+        self.runs: List[Optional[List[Run]]] = [None] * line_count
+        self.valid = 0
+        self.frontier = 0
+        self.dirty_end = 0
+
+    def lines_changed(self, start: int, removed: int, added: int):
+        # lines[start:start + removed] were replaced by `added` lines (added >= 1)
+        delta = added - removed
+        self.states[start + 1:start + removed] = [_UNKNOWN] * (added - 1)
+        if removed == 0:
+            self.states.insert(start + added, self.states[start])
+        self.runs[start:start + removed] = [None] * added
+        self.valid = min(self.valid, start)
+        if self.frontier > start:
+            self.frontier = max(start, self.frontier + delta)
+        if self.dirty_end > start:
+            self.dirty_end = max(start, self.dirty_end + delta)
+        self.dirty_end = max(self.dirty_end, start + added)
+
+    def _advance(self, lines: List[str], idx: int):
+        tokenize = self.highlighter.tokenize
+        states = self.states
+        i = self.valid
+        while i < idx:
+            runs, end = tokenize(lines[i], states[i])
+            self.runs[i] = runs
+            i += 1
+            if i <= self.frontier and i >= self.dirty_end and states[i] == end:
+                i = self.frontier
+                self.valid = max(self.valid, i)
+                continue
+            if states[i] != end and i < len(self.runs):
+                self.runs[i] = None
+            states[i] = end
+            self.valid = i
+            if i > self.frontier:
+                self.frontier = i
+        # Stopping short leaves a recomputed state at `valid` next to stale ones after it,
+        # so the next convergence check must not happen before the first stale state.
+        self.dirty_end = max(self.dirty_end, self.valid + 1) if self.valid < self.frontier else 0
+
+    def line_runs(self, lines: List[str], idx: int) -> List[Run]:
+        runs = self.runs[idx]
+        if runs is not None and idx < self.valid:
+            return runs
+        if idx >= self.valid:
+            self._advance(lines, idx)
+        runs = self.runs[idx]
+        if runs is None:
+            runs, _ = self.highlighter.tokenize(lines[idx], self.states[idx])
+            self.runs[idx] = runs
+        return runs
@@ -10,6 +10,10 @@ class Input(Component):
     DEFAULT_FG_FOCUSED = curses.COLOR_WHITE
     DEFAULT_BG_FOCUSED = curses.COLOR_BLUE
 
+    focusable = True
+
+    __slots__ = ("value", "cursor", "placeholder", "fg_color_focused", "bg_color_focused")
+
     def __init__(self, left, top, width, parent=None, placeholder=""):
         super().__init__(left, top, width, 1, parent)
         self.value = ""
@@ -35,18 +39,18 @@ class Input(Component):
         bg = self.bg_color_focused if self.isFocused else self.bg_color
         renderer.draw_text(absolute_x, absolute_y, display[:self.width].ljust(self.width), fg, bg)
         if self.isFocused:
-            curses.curs_set(1)
+            renderer.curs_set(1)
             try:
                 display_width = sum(1 if ord(c) < 128 else 2 for c in self.value[:self.cursor])
                 renderer.screen.move(absolute_y, absolute_x + _clamp(display_width, 0, self.width - 1))
             except curses.error:
                 pass
         else:
-            curses.curs_set(0)
+            renderer.curs_set(0)
 
     def handleEvent(self, event: UIEvent) -> bool:
         if event.type == "key":
-            key = event.data.get('key')
+            key = event.key
             if isinstance(key, str) and key not in ('\n', '\t', '\b'):
                 self.value = self.value[:self.cursor] + key + self.value[self.cursor:]
                 self.cursor += 1
@@ -67,7 +71,7 @@ class Input(Component):
                     self.dispatchEvent("onsubmit", value=self.value)
                     return True
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
+            mouse_x, mouse_y = event.x, event.y
             if is_mouse_over(self, mouse_x, mouse_y):
                 absolute_x, absolute_y = self.get_absolute_position()
                 display_widths = [0] + [sum(1 if ord(c) < 128 else 2 for c in self.value[:i+1]) for i in range(len(self.value))]
@@ -0,0 +1,188 @@
+import curses
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..utils import KEY_ENTER, KEY_ESC, KEY_TAB, KEY_BACKSPACE
+
+Keys = Tuple[str, ...]
+
+# Outermost scope, active even while a modal is open (global ``None`` bindings are not)
+APP_SCOPE = "app"
+
+KEY_NAMES = {
+    curses.KEY_UP: "Up", curses.KEY_DOWN: "Down", curses.KEY_LEFT: "Left", curses.KEY_RIGHT: "Right",
+    curses.KEY_HOME: "Home", curses.KEY_END: "End", curses.KEY_PPAGE: "PgUp", curses.KEY_NPAGE: "PgDn",
+    curses.KEY_IC: "Ins", curses.KEY_DC: "Del", curses.KEY_BACKSPACE: "Backspace", curses.KEY_BTAB: "Shift+Tab",
+    KEY_ENTER: "Enter", KEY_TAB: "Tab", KEY_ESC: "Esc", KEY_BACKSPACE: "Backspace",
+}
+
+# Lower-cased spellings accepted in binding specs, mapped to the names key_name() produces
+_SPELLINGS = {name.lower(): name for name in KEY_NAMES.values()}
+_SPELLINGS.update({"escape": "Esc", "return": "Enter", "pageup": "PgUp", "pagedown": "PgDn",
+                   "insert": "Ins", "delete": "Del", "space": "Space"})
+_SPELLINGS.update({f"f{n}": f"F{n}" for n in range(1, 13)})
+_MODIFIERS = {"ctrl": "Ctrl", "control": "Ctrl", "c": "Ctrl", "alt": "Alt", "meta": "Alt", "option": "Alt",
+              "m": "Alt", "shift": "Shift", "s": "Shift"}
+
+
+def key_name(key) -> Optional[str]:
+    """Canonical name of a key as it arrives in a UIEvent ("Ctrl+k", "Alt+f", "F3", "Shift+F3", "x")."""
+    if isinstance(key, tuple):
+        if len(key) == 2 and key[0] == "ALT" and isinstance(key[1], int):
+            return "Alt+" + chr(key[1]).lower()
+        return None
+    if isinstance(key, str):
+        return "Space" if key == " " else key
+    if isinstance(key, int):
+        name = KEY_NAMES.get(key)
+        if name:
+            return name
+        n = key - curses.KEY_F0
+        if 1 <= n <= 12:
+            return f"F{n}"
+        if 13 <= n <= 24:
+            return f"Shift+F{n - 12}"
+        if 1 <= key <= 26:
+            return "Ctrl+" + chr(key + 96)
+    return None
+
+
+def _parse_stroke(stroke: str) -> str:
+    if len(stroke) == 1:
+        # Bare letters are case-insensitive in specs, like on a key cap; "Shift+a" binds "A"
+        return "Space" if stroke == " " else stroke.lower()
+    parts = stroke.replace("-", "+").split("+")
+    if stroke.endswith(("+", "-")) and len(stroke) > 1:
+        parts = parts[:-2] + [stroke[-1]]
+    *mods, key = parts
+    mods = sorted({_MODIFIERS[m.lower()] for m in mods}, key=["Ctrl", "Alt", "Shift"].index)
+    key = _SPELLINGS.get(key.lower(), key)
+    if len(key) == 1:
+        if "Shift" in mods and key.isalpha():
+            mods.remove("Shift")
+            key = key.upper()
+        elif mods:
+            key = key.lower()
+    return "+".join(mods + [key])
+
+
+def parse_keys(spec: str) -> Keys:
+    """Parses "Ctrl+K Ctrl+S" (strokes separated by spaces) into canonical key names."""
+    strokes = tuple(_parse_stroke(s) for s in spec.split())
+    if not strokes:
+        raise ValueError(f"Empty key binding: {spec!r}")
+    return strokes
+
+
+class Binding:
+    __slots__ = ("keys", "command", "scope", "owner", "description")
+
+    def __init__(self, keys: Keys, command: Callable, scope, owner, description: Optional[str]):
+        self.keys = keys
+        self.command = command
+        self.scope = scope
+        self.owner = owner
+        self.description = description
+
+
+class Keymap:
+    """Key bindings per focus scope, compiled into one lookup trie per focus chain.
+
+    A scope is any object (a window, a widget, a menu) or ``None`` for global
+    bindings. ``feed`` gets the chain of scopes that currently have focus,
+    innermost first; the bindings of those scopes are merged into a trie (inner
+    scopes win) that is cached until a binding changes, so each key press is a
+    single dict lookup. Multi-stroke chords keep their trie node in ``pending``
+    between key presses.
+    """
+
+    CACHE_SIZE = 32
+
+    def __init__(self):
+        self.bindings: Dict[object, Dict[Keys, Binding]] = {}
+        self.compiled: Dict[tuple, dict] = {}
+        self.pending: Optional[dict] = None
+        self.pending_keys: Keys = ()
+
+    def bind(self, keys, command: Callable, scope=None, owner=None, description: Optional[str] = None) -> Binding:
+        keys = parse_keys(keys) if isinstance(keys, str) else tuple(keys)
+        binding = Binding(keys, command, scope, owner, description)
+        self.bindings.setdefault(scope, {})[keys] = binding
+        self.invalidate()
+        return binding
+
+    def unbind(self, keys, scope=None):
+        keys = parse_keys(keys) if isinstance(keys, str) else tuple(keys)
+        if self.bindings.get(scope, {}).pop(keys, None) is not None:
+            self.invalidate()
+
+    def unbind_owner(self, owner):
+        for table in self.bindings.values():
+            for keys in [k for k, b in table.items() if b.owner is owner]:
+                del table[keys]
+        self.invalidate()
+
+    def clear_scope(self, scope):
+        if self.bindings.pop(scope, None) is not None:
+            self.invalidate()
+
+    def invalidate(self):
+        self.compiled.clear()
+        self.reset()
+
+    def reset(self):
+        self.pending = None
+        self.pending_keys = ()
+
+    def _trie(self, chain: tuple) -> dict:
+        trie = self.compiled.get(chain)
+        if trie is not None:
+            return trie
+        trie = {}
+        for scope in reversed(chain):
+            for keys, binding in self.bindings.get(scope, {}).items():
+                node = trie
+                for token in keys[:-1]:
+                    child = node.get(token)
+                    if not isinstance(child, dict):
+                        # An inner chord shadows an outer single-key binding on its prefix
+                        child = node[token] = {}
+                    node = child
+                node[keys[-1]] = binding
+        if len(self.compiled) >= self.CACHE_SIZE:
+            self.compiled.clear()
+        self.compiled[chain] = trie
+        return trie
+
+    def lookup(self, keys, chain: tuple = (None,)) -> Optional[Binding]:
+        node = self._trie(chain)
+        for token in (parse_keys(keys) if isinstance(keys, str) else keys):
+            if not isinstance(node, dict):
+                return None
+            node = node.get(token)
+        return node if isinstance(node, Binding) else None
+
+    def bindings_for(self, command: Callable) -> List[Binding]:
+        return [b for table in self.bindings.values() for b in table.values() if b.command == command]
+
+    def feed(self, key, chain: tuple = (None,)) -> bool:
+        """Handles one key press; returns True when it ran a command or is part of a chord."""
+        token = key_name(key)
+        if token is None:
+            return False
+        root = self._trie(chain)
+        node = (self.pending or root).get(token)
+        if node is None and self.pending is not None:
+            # A key that doesn't continue the chord abandons it; Esc is swallowed, anything else starts over
+            self.reset()
+            if token == "Esc":
+                return True
+            node = root.get(token)
+        if node is None:
+            return False
+        if isinstance(node, dict):
+            self.pending = node
+            self.pending_keys += (token,)
+            return True
+        self.reset()
+        node.command()
+        return True
@@ -1,11 +1,15 @@
 import curses
 from .component import Component
 from .terminal_renderer import TerminalRenderer
+from .theme import LIGHT_GRAY
 from .ui_event import UIEvent
 
 class Label(Component):
     DEFAULT_FG = curses.COLOR_BLACK
-    DEFAULT_BG = 20  # Light gray
+    DEFAULT_BG = LIGHT_GRAY
+
+    __slots__ = ("text",)
+    status_line = True
 
     def __init__(self, left, top, width, height, text: str = "", parent=None):
         super().__init__(left, top, width, height, parent)
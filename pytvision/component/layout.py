@@ -0,0 +1,137 @@
+from typing import List, Optional, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+
+class Layout:
+    """Computes the geometry of a container's children from declarative specs.
+
+    Items are components or nested layouts. ``place`` remembers the rect it was
+    last applied to and does nothing when called again with the same rect, so a
+    layout only recomputes when its container is resized. Children are moved with
+    ``Component.set_geometry``, which in turn re-lays out a child's own subtree
+    only when that child's size actually changed.
+    """
+
+    def __init__(self, padding: Tuple[int, int, int, int] = (0, 0, 0, 0)):
+        self.padding = padding  # left, top, right, bottom
+        self.items: List[Tuple[object, dict]] = []
+        self.rect: Optional[Rect] = None
+
+    def add(self, item, **params):
+        self.items.append((item, params))
+        self.invalidate()
+        return item
+
+    def remove(self, item):
+        self.items = [(i, p) for i, p in self.items if i is not item]
+        self.invalidate()
+
+    def invalidate(self):
+        self.rect = None
+
+    def apply(self, container):
+        self.place(0, 0, container.width, container.height)
+
+    def place(self, x: int, y: int, width: int, height: int):
+        rect = (x, y, width, height)
+        if rect == self.rect:
+            return
+        self.rect = rect
+        pl, pt, pr, pb = self.padding
+        inner = (x + pl, y + pt, max(0, width - pl - pr), max(0, height - pt - pb))
+        for (item, params), (ix, iy, iw, ih) in zip(self.items, self.compute(inner)):
+            if isinstance(item, Layout):
+                item.place(ix, iy, iw, ih)
+            else:
+                item.set_geometry(ix, iy, iw, ih)
+
+    def compute(self, inner: Rect) -> List[Rect]:
+        raise NotImplementedError
+
+
+def _anchor_axis(start, end, size, min_size, pos, current_size, extent):
+    # Resolves one axis from any two of start/end/size; a missing position keeps the current one
+    if size is None:
+        size = extent - (start or 0) - (end or 0) if start is not None and end is not None else current_size
+    size = max(size, min_size or 0)
+    if start is not None:
+        return start, size
+    if end is not None:
+        return extent - end - size, size
+    return pos, size
+
+
+class AnchorLayout(Layout):
+    """Places each item relative to the container edges.
+
+    Per axis an item takes any two of ``left``/``right``/``width`` (``top``/
+    ``bottom``/``height``); giving both edges stretches it with the container.
+    ``min_width``/``min_height`` put a floor under stretched sizes.
+    """
+
+    def compute(self, inner):
+        x, y, w, h = inner
+        rects = []
+        for item, p in self.items:
+            if isinstance(item, Layout):
+                cur = item.rect or (x, y, 0, 0)
+            else:
+                cur = (item.left, item.top, item.width, item.height)
+            left, width = _anchor_axis(p.get("left"), p.get("right"), p.get("width"), p.get("min_width"), cur[0] - x, cur[2], w)
+            top, height = _anchor_axis(p.get("top"), p.get("bottom"), p.get("height"), p.get("min_height"), cur[1] - y, cur[3], h)
+            rects.append((x + left, y + top, width, height))
+        return rects
+
+
+class BoxLayout(Layout):
+    """Stacks items along one axis.
+
+    Each item has either a fixed ``size`` along the axis or a ``flex`` weight
+    (default 1) sharing whatever space is left. Across the axis items stretch,
+    unless they give a fixed ``cross`` size.
+    """
+
+    horizontal = True
+
+    def __init__(self, spacing: int = 0, padding: Tuple[int, int, int, int] = (0, 0, 0, 0)):
+        super().__init__(padding)
+        self.spacing = spacing
+
+    def compute(self, inner):
+        x, y, w, h = inner
+        main, cross = (w, h) if self.horizontal else (h, w)
+        free = main - self.spacing * max(0, len(self.items) - 1)
+        flex_total = 0
+        for _, p in self.items:
+            if p.get("size") is not None:
+                free -= p["size"]
+            else:
+                flex_total += p.get("flex", 1)
+        free = max(0, free)
+        rects = []
+        pos = 0
+        remaining_flex, remaining_free = flex_total, free
+        for _, p in self.items:
+            size = p.get("size")
+            if size is None:
+                # Hand out the rounding remainder to the last flexible item
+                flex = p.get("flex", 1)
+                size = remaining_free * flex // remaining_flex if remaining_flex else 0
+                remaining_flex -= flex
+                remaining_free -= size
+            c = min(cross, p["cross"]) if p.get("cross") is not None else cross
+            if self.horizontal:
+                rects.append((x + pos, y, size, c))
+            else:
+                rects.append((x, y + pos, c, size))
+            pos += size + self.spacing
+        return rects
+
+
+class Row(BoxLayout):
+    horizontal = True
+
+
+class Column(BoxLayout):
+    horizontal = False
@@ -16,6 +16,8 @@ class MultiList(Component):
     DEFAULT_HILITE_FG = curses.COLOR_BLACK
     DEFAULT_HILITE_BG = curses.COLOR_CYAN
 
+    focusable = True
+
     def __init__(self, left, top, width, height, items: List[str], parent=None):
         super().__init__(left, top, width, height, parent)
         self.items = items[:]
@@ -61,7 +63,7 @@ class MultiList(Component):
 
     def handleEvent(self, event: UIEvent) -> bool:
         if event.type == "key":
-            key = event.data.get('key')
+            key = event.key
             if key == curses.KEY_UP:
                 self.cursor = max(0, self.cursor - 1)
                 if self.cursor < self.view_top:
@@ -82,8 +84,8 @@ class MultiList(Component):
                 self.view_top = min(max(0, len(self.items) - (self.height - 2)), self.view_top + (self.height - 2))
                 return True
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
-            bstate = event.data.get('bstate', 0)
+            mouse_x, mouse_y = event.x, event.y
+            bstate = event.bstate
             if is_mouse_over(self, mouse_x, mouse_y):
                 self.isFocused = True
                 absolute_x, absolute_y = self.get_absolute_position()
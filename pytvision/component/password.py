@@ -4,6 +4,8 @@ from .terminal_renderer import TerminalRenderer
 from ..utils import _clamp
 
 class Password(Input):
+    __slots__ = ("mask", "show")
+
     def __init__(self, left, top, width, parent=None, mask='*'):
         super().__init__(left, top, width, parent)
         self.mask = mask
@@ -18,10 +20,10 @@ class Password(Input):
         bg = self.bg_color_focused if self.isFocused else self.bg_color
         renderer.draw_text(absolute_x, absolute_y, display[:self.width].ljust(self.width), fg, bg)
         if self.isFocused:
-            curses.curs_set(1)
+            renderer.curs_set(1)
             try:
                 renderer.screen.move(absolute_y, absolute_x + _clamp(self.cursor, 0, self.width - 1))
             except curses.error:
                 pass
         else:
-            curses.curs_set(0)
\ No newline at end of file
+            renderer.curs_set(0)
\ No newline at end of file
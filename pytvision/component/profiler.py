@@ -0,0 +1,223 @@
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from .component import Component
+
+
+class _Stats:
+    __slots__ = ("calls", "total", "samples")
+
+    def __init__(self, keep: int):
+        self.calls = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=keep)
+
+    def add(self, dt: float):
+        self.calls += 1
+        self.total += dt
+        self.samples.append(dt)
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_dict(self):
+        return {"calls": self.calls, "total": self.total, "p99": self.percentile(0.99)}
+
+
+class _CountingScreen:
+    """Forwards to a curses window while counting addstr calls and bytes for the current frame."""
+
+    def __init__(self, screen, profiler: "Profiler"):
+        self._screen = screen
+        self._profiler = profiler
+
+    def addstr(self, *args):
+        text = args[2] if len(args) >= 3 else args[0]
+        self._profiler.frame_addstr += 1
+        self._profiler.frame_bytes += len(str(text).encode("utf-8", "replace"))
+        return self._screen.addstr(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._screen, name)
+
+
+class Profiler:
+    """Opt-in instrumentation for Component.render/handleEvent.
+
+    The hooks are installed by wrapping the methods on the component classes in
+    enable() and removed again in disable(), so a disabled profiler leaves the
+    original methods in place and costs nothing.
+    """
+
+    METHODS = ("render", "handleEvent")
+
+    def __init__(self, sample_size: int = 1024, frame_history: int = 120):
+        self.sample_size = sample_size
+        self.enabled = False
+        self.ignored = set()
+        self._patched: Dict[tuple, object] = {}
+        self._stack: List[int] = []
+        self.frame_history = deque(maxlen=frame_history)
+        self.reset()
+
+    def reset(self):
+        self.class_stats: Dict[tuple, _Stats] = {}
+        self.instance_stats: Dict[tuple, _Stats] = {}
+        self.instance_names: Dict[int, str] = {}
+        self.color_usage: Dict[tuple, int] = {}
+        self.frame_addstr = 0
+        self.frame_bytes = 0
+        self.frame_history.clear()
+
+    def ignore(self, cls):
+        self.ignored.add(cls)
+        if self.enabled:
+            self._unpatch(cls)
+
+    def enable(self):
+        if self.enabled:
+            return
+        from .window import WindowManager
+        self.enabled = True
+        self._patch_components()
+        self._wrap(WindowManager, "render_all", self._frame_wrapper)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for (cls, name), original in list(self._patched.items()):
+            setattr(cls, name, original)
+        self._patched.clear()
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def _patch_components(self):
+        pending = [Component]
+        while pending:
+            cls = pending.pop()
+            pending.extend(cls.__subclasses__())
+            if cls in self.ignored:
+                continue
+            for name in self.METHODS:
+                if name in cls.__dict__:
+                    self._wrap(cls, name, self._method_wrapper)
+
+    def _unpatch(self, cls):
+        for name in self.METHODS:
+            original = self._patched.pop((cls, name), None)
+            if original is not None:
+                setattr(cls, name, original)
+
+    def _wrap(self, cls, name, factory):
+        if (cls, name) in self._patched:
+            return
+        original = cls.__dict__[name]
+        self._patched[(cls, name)] = original
+        setattr(cls, name, factory(original, name))
+
+    def _method_wrapper(self, original, name):
+        profiler = self
+
+        def wrapper(component, *args, **kw):
+            if type(component) in profiler.ignored:
+                return original(component, *args, **kw)
+            key = id(component)
+            # super() calls from an overriding subclass are timed once, by the outermost call
+            if profiler._stack and profiler._stack[-1] == key:
+                return original(component, *args, **kw)
+            profiler._stack.append(key)
+            start = time.perf_counter()
+            try:
+                return original(component, *args, **kw)
+            finally:
+                profiler._stack.pop()
+                profiler._record(component, name, time.perf_counter() - start)
+        wrapper.__wrapped__ = original
+        return wrapper
+
+    def _frame_wrapper(self, original, name):
+        profiler = self
+
+        def wrapper(manager, renderer, *args, **kw):
+            profiler._patch_components()
+            screen = renderer.screen
+            get_color_pair = renderer.get_color_pair
+
+            def counting_color_pair(fg, bg):
+                profiler.color_usage[(fg, bg)] = profiler.color_usage.get((fg, bg), 0) + 1
+                return get_color_pair(fg, bg)
+
+            profiler.frame_addstr = profiler.frame_bytes = 0
+            renderer.screen = _CountingScreen(screen, profiler)
+            renderer.get_color_pair = counting_color_pair
+            start = time.perf_counter()
+            try:
+                return original(manager, renderer, *args, **kw)
+            finally:
+                elapsed = time.perf_counter() - start
+                renderer.screen = screen
+                del renderer.get_color_pair
+                profiler.frame_history.append((elapsed, profiler.frame_addstr, profiler.frame_bytes))
+        wrapper.__wrapped__ = original
+        return wrapper
+
+    def _record(self, component, method: str, dt: float):
+        cls_name = type(component).__name__
+        key = (cls_name, method)
+        stats = self.class_stats.get(key)
+        if stats is None:
+            stats = self.class_stats[key] = _Stats(self.sample_size)
+        stats.add(dt)
+        ikey = (id(component), method)
+        stats = self.instance_stats.get(ikey)
+        if stats is None:
+            stats = self.instance_stats[ikey] = _Stats(self.sample_size)
+            label = getattr(component, "title", None) or getattr(component, "label", None)
+            self.instance_names[id(component)] = f"{cls_name}#{id(component) & 0xffff:04x}" + (f" {label}" if isinstance(label, str) else "")
+        stats.add(dt)
+
+    def get_class_stats(self, method: Optional[str] = None):
+        return {k: s.as_dict() for k, s in self.class_stats.items() if method in (None, k[1])}
+
+    def get_instance_stats(self, method: Optional[str] = None):
+        return {(self.instance_names.get(i, hex(i)), m): s.as_dict() for (i, m), s in self.instance_stats.items() if method in (None, m)}
+
+    def get_frame_stats(self):
+        if not self.frame_history:
+            return {"frames": 0, "last_ms": 0.0, "avg_ms": 0.0, "addstr": 0, "bytes": 0}
+        last, addstr, nbytes = self.frame_history[-1]
+        return {
+            "frames": len(self.frame_history),
+            "last_ms": last * 1000,
+            "avg_ms": sum(f[0] for f in self.frame_history) * 1000 / len(self.frame_history),
+            "addstr": addstr,
+            "bytes": nbytes,
+        }
+
+    def get_color_usage(self):
+        return dict(self.color_usage)
+
+    def report(self, limit: int = 10) -> List[str]:
+        frame = self.get_frame_stats()
+        out = [
+            f"frame {frame['last_ms']:.2f}ms avg {frame['avg_ms']:.2f}ms",
+            f"addstr {frame['addstr']} bytes {frame['bytes']} pairs {len(self.color_usage)}",
+            f"{'component':<18}{'calls':>7}{'total':>9}{'p99':>8}",
+        ]
+        ranked = sorted(self.class_stats.items(), key=lambda kv: kv[1].total, reverse=True)
+        for (cls_name, method), stats in ranked[:limit]:
+            name = f"{cls_name}.{'r' if method == 'render' else 'e'}"
+            out.append(f"{name[:18]:<18}{stats.calls:>7}{stats.total * 1000:>7.1f}ms{stats.percentile(0.99) * 1000:>6.2f}ms")
+        return out
+
+
+profiler = Profiler()
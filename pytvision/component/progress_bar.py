@@ -0,0 +1,50 @@
+import curses
+import time
+from typing import Optional
+
+from .component import Component
+from .terminal_renderer import TerminalRenderer
+
+
+class ProgressBar(Component):
+    DEFAULT_FG = curses.COLOR_BLUE
+    DEFAULT_BG = curses.COLOR_WHITE
+
+    # Seconds per step of the indeterminate animation
+    STEP = 0.08
+
+    __slots__ = ("value", "phase", "tick")
+
+    def __init__(self, left, top, width, parent=None):
+        super().__init__(left, top, width, 1, parent)
+        self.value: Optional[float] = 0.0  # None shows an indeterminate bar
+        self.phase = 0
+        self.tick = None  # pending timer that brings the next animation frame
+        self.fg_color = self.DEFAULT_FG
+        self.bg_color = self.DEFAULT_BG
+
+    def set_value(self, value: Optional[float]):
+        self.value = None if value is None else min(1.0, max(0.0, value))
+
+    def _next_frame(self):
+        pass  # a timer firing is enough to make the main loop draw a frame
+
+    def render(self, renderer: TerminalRenderer):
+        if not self.visibility:
+            return
+        absolute_x, absolute_y = self.get_absolute_position()
+        if self.value is None:
+            # A block bouncing along the track; the position follows the clock, and a
+            # one-shot timer asks for the next frame only while the bar is being drawn
+            span = max(1, self.width - 3)
+            self.phase = int(time.monotonic() / self.STEP) % (2 * span)
+            if self.tick is None or self.tick.cancelled:
+                self.tick = self.call_later(self.STEP, self._next_frame)
+            pos = self.phase if self.phase < span else 2 * span - self.phase
+            text = "░" * pos + "███" + "░" * (self.width - pos - 3)
+        else:
+            percent = f" {int(self.value * 100)}%"
+            bar_w = max(0, self.width - len(percent))
+            filled = int(round(self.value * bar_w))
+            text = "█" * filled + "░" * (bar_w - filled) + percent
+        renderer.draw_text(absolute_x, absolute_y, text[:self.width], self.fg_color, self.bg_color)
@@ -0,0 +1,201 @@
+import gzip
+import json
+import select
+import time
+from typing import Callable, List, Optional, Tuple
+
+from .ui_event import UIEvent, make_event
+
+FORMAT_VERSION = 1
+
+
+def _encode_value(v):
+    if isinstance(v, tuple):
+        return {"t": [_encode_value(x) for x in v]}
+    return v
+
+
+def _decode_value(v):
+    if isinstance(v, dict) and "t" in v:
+        return tuple(_decode_value(x) for x in v["t"])
+    return v
+
+
+class EventRecorder:
+    """Writes the UIEvent stream seen by a WindowManager to a gzip'd line-per-event file.
+
+    Each line is ``[delta_ms, type, data]``; screen size changes are written as
+    ``resize`` records so a replay can reproduce the layout the events were made against.
+    """
+
+    def __init__(self, path: str, renderer=None):
+        self.path = path
+        self.renderer = renderer
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.last_time = time.monotonic()
+        self.size: Optional[Tuple[int, int]] = None
+        header = {"version": FORMAT_VERSION}
+        if renderer is not None:
+            self.size = (renderer.w, renderer.h)
+            header.update(w=renderer.w, h=renderer.h)
+        self.file.write(json.dumps(header, separators=(",", ":")) + "\n")
+
+    def _write(self, type_: str, data: dict):
+        now = time.monotonic()
+        delta_ms = int(round((now - self.last_time) * 1000))
+        self.last_time = now
+        data = {k: _encode_value(v) for k, v in data.items()}
+        self.file.write(json.dumps([delta_ms, type_, data], separators=(",", ":")) + "\n")
+
+    def record(self, event: UIEvent):
+        if self.file is None:
+            return
+        if self.renderer is not None and (self.renderer.w, self.renderer.h) != self.size:
+            self.size = (self.renderer.w, self.renderer.h)
+            self._write("resize", {"w": self.size[0], "h": self.size[1]})
+        self._write(event.type, event.to_dict())
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class Recording:
+    def __init__(self, width: int, height: int, events: List[Tuple[float, UIEvent]]):
+        self.width = width
+        self.height = height
+        self.events = events
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        events = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported recording version: {header.get('version')}")
+            t = 0.0
+            for line in f:
+                if not line.strip():
+                    continue
+                delta_ms, type_, data = json.loads(line)
+                t += delta_ms / 1000.0
+                events.append((t, make_event(type_, **{k: _decode_value(v) for k, v in data.items()})))
+        return cls(header.get("w", 80), header.get("h", 24), events)
+
+
+class ReplayReport:
+    def __init__(self, frame_times: List[float], wall_time: float):
+        self.frame_times = frame_times
+        self.wall_time = wall_time
+
+    def percentile(self, q: float) -> float:
+        if not self.frame_times:
+            return 0.0
+        ordered = sorted(self.frame_times)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self) -> dict:
+        n = len(self.frame_times)
+        return {
+            "frames": n,
+            "wall_s": self.wall_time,
+            "mean_ms": (sum(self.frame_times) / n * 1000) if n else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p90_ms": self.percentile(0.90) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": max(self.frame_times, default=0.0) * 1000,
+        }
+
+    def format(self) -> str:
+        s = self.summary()
+        return (f"{s['frames']} frames in {s['wall_s']:.2f}s  mean {s['mean_ms']:.2f}ms  "
+                f"p50 {s['p50_ms']:.2f}ms  p90 {s['p90_ms']:.2f}ms  p99 {s['p99_ms']:.2f}ms  max {s['max_ms']:.2f}ms")
+
+
+class ReplayDriver:
+    """Feeds a Recording through WindowManager.handle_event and times each frame.
+
+    A frame is one event plus the render that follows it. With ``speed`` set the
+    original pacing is kept (scaled by speed), and between events queued tasks
+    and timers run and draw their own frames as they would live. With
+    ``speed=None`` events run flat out: after each one the driver waits for the
+    background work it started (searches, sorts, loads) to hand back its
+    results, and that waiting is left out of the frame time.
+    """
+
+    def __init__(self, manager, renderer, recording: Recording, speed: Optional[float] = None,
+                 on_resize: Optional[Callable[[int, int], None]] = None):
+        self.manager = manager
+        self.renderer = renderer
+        self.recording = recording
+        self.speed = speed
+        self.on_resize = on_resize
+
+    def _resize(self, width: int, height: int):
+        if hasattr(self.renderer, "resize"):
+            self.renderer.resize(width, height)
+        else:
+            self.renderer.refresh_dimensions()
+        if self.on_resize:
+            self.on_resize(width, height)
+
+    def _render(self):
+        self.renderer.screen.erase()
+        self.manager.render_all(self.renderer)
+        self.renderer.screen.refresh()
+
+    def _run_pending(self) -> bool:
+        ran = self.manager.tasks.run_pending()
+        ran += self.manager.run_timers()
+        return ran > 0
+
+    def _settle(self) -> float:
+        # Runs tasks until no background work is outstanding; returns the time spent waiting
+        tasks = self.manager.tasks
+        waited = 0.0
+        self._run_pending()
+        while not tasks.idle:
+            wait_start = time.perf_counter()
+            select.select([tasks.fileno()], [], [], 0.05)
+            waited += time.perf_counter() - wait_start
+            self._run_pending()
+        return waited
+
+    def _wait_until(self, deadline: float, frame_times: List[float]):
+        # Sleeps until the next event is due, waking for tasks and timers like the live loop
+        tasks = self.manager.tasks
+        while True:
+            delay = deadline - time.perf_counter()
+            if delay <= 0:
+                return
+            timeout = self.manager.next_timeout()
+            select.select([tasks.fileno()], [], [], delay if timeout is None else min(delay, timeout))
+            frame_start = time.perf_counter()
+            if self._run_pending():
+                self._render()
+                frame_times.append(time.perf_counter() - frame_start)
+
+    def run(self) -> ReplayReport:
+        frame_times = []
+        if (self.renderer.w, self.renderer.h) != (self.recording.width, self.recording.height):
+            self._resize(self.recording.width, self.recording.height)
+        self._run_pending()
+        self._render()
+        start = time.perf_counter()
+        for t, event in self.recording.events:
+            if self.speed:
+                self._wait_until(start + t / self.speed, frame_times)
+            frame_start = time.perf_counter()
+            if event.type == "resize":
+                self._resize(event.data["w"], event.data["h"])
+            else:
+                self.manager.handle_event(event)
+            waited = 0.0
+            if self.speed:
+                self._run_pending()
+            else:
+                waited = self._settle()
+            self._render()
+            frame_times.append(time.perf_counter() - frame_start - waited)
+        return ReplayReport(frame_times, time.perf_counter() - start)
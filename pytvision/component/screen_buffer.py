@@ -0,0 +1,81 @@
+import curses
+from typing import List
+
+# Pair numbers are stored above the curses A_* attribute bits so any number of pairs fits.
+PAIR_SHIFT = 32
+ATTR_MASK = (1 << PAIR_SHIFT) - 1
+
+
+def pair_number(attr: int) -> int:
+    return attr >> PAIR_SHIFT
+
+
+class ScreenBuffer:
+    """In-memory stand-in for a curses window: a grid of (char, attr) cells."""
+
+    def __init__(self, height: int = 24, width: int = 80):
+        self.h = height
+        self.w = width
+        self.cursor_y = 0
+        self.cursor_x = 0
+        self.chars: List[List[str]] = []
+        self.attrs: List[List[int]] = []
+        self.erase()
+
+    def getmaxyx(self):
+        return self.h, self.w
+
+    def getyx(self):
+        return self.cursor_y, self.cursor_x
+
+    def resize(self, height: int, width: int):
+        self.h, self.w = height, width
+        self.erase()
+
+    def erase(self):
+        self.chars = [[" "] * self.w for _ in range(self.h)]
+        self.attrs = [[0] * self.w for _ in range(self.h)]
+
+    clear = erase
+
+    def addstr(self, *args):
+        if len(args) >= 3:
+            y, x, text = args[0], args[1], args[2]
+            attr = args[3] if len(args) > 3 else 0
+        else:
+            y, x = self.cursor_y, self.cursor_x
+            text = args[0]
+            attr = args[1] if len(args) > 1 else 0
+        if not 0 <= y < self.h or not 0 <= x < self.w:
+            raise curses.error("addstr() returned ERR")
+        text = text[:self.w - x]
+        n = len(text)
+        self.chars[y][x:x + n] = text
+        self.attrs[y][x:x + n] = [attr] * n
+        self.cursor_y, self.cursor_x = y, min(self.w - 1, x + n)
+
+    def move(self, y: int, x: int):
+        if not 0 <= y < self.h or not 0 <= x < self.w:
+            raise curses.error("wmove() returned ERR")
+        self.cursor_y, self.cursor_x = y, x
+
+    def refresh(self):
+        pass
+
+    def noutrefresh(self):
+        pass
+
+    def keypad(self, flag):
+        pass
+
+    def nodelay(self, flag):
+        pass
+
+    def idlok(self, flag):
+        pass
+
+    def row_text(self, y: int) -> str:
+        return "".join(self.chars[y])
+
+    def text(self) -> str:
+        return "\n".join(self.row_text(y) for y in range(self.h))
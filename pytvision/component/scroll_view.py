@@ -0,0 +1,372 @@
+import curses
+from typing import List, Optional, Tuple
+
+from .component import Component, is_mouse_over
+from .terminal_renderer import TerminalRenderer
+from .theme import LIGHT_GRAY
+from .ui_event import UIEvent
+from ..utils import _safe_add_string, _clamp
+
+WHEEL_UP = curses.BUTTON4_PRESSED
+WHEEL_DOWN = getattr(curses, "BUTTON5_PRESSED", 0)
+
+
+class _ClipScreen:
+    """Forwards to the real screen, dropping whatever falls outside the viewport rectangle."""
+
+    def __init__(self, screen, x0: int, y0: int, x1: int, y1: int):
+        self._screen = screen
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+        self.cursor_clipped = False
+
+    def addstr(self, *args):
+        if len(args) < 3:
+            return self._screen.addstr(*args)
+        y, x, text = args[0], args[1], str(args[2])
+        if not self.y0 <= y < self.y1 or x >= self.x1:
+            return
+        if x < self.x0:
+            text = text[self.x0 - x:]
+            x = self.x0
+        text = text[:self.x1 - x]
+        if text:
+            self._screen.addstr(y, x, text, *args[3:])
+
+    def move(self, y: int, x: int):
+        # Widgets place their caret with move(); one scrolled out of view must not show elsewhere
+        self.cursor_clipped = not (self.y0 <= y < self.y1 and self.x0 <= x < self.x1)
+        if self.cursor_clipped:
+            raise curses.error("wmove() outside the scroll view")
+        self._screen.move(y, x)
+
+    def __getattr__(self, name):
+        return getattr(self._screen, name)
+
+
+class _Canvas(Component):
+    """Origin of a ScrollView's children, placed at minus the scroll offset.
+
+    Children keep canvas coordinates in left/top; since get_absolute_position
+    sums the parents' offsets, everything computed from it (drawing, is_mouse_over,
+    popups) follows the scroll without the children knowing about it.
+    """
+
+    def __init__(self, parent: "ScrollView"):
+        super().__init__(0, 0, 0, 0, parent)
+        self.children: List[Component] = []
+
+    def render(self, renderer: TerminalRenderer):
+        pass
+
+    def focus_children(self):
+        return self.children
+
+
+class ScrollView(Component):
+    """Hosts children on a virtual canvas larger than the component, with scrollbars.
+
+    The canvas is ``canvas_width`` x ``canvas_height``, grown to fit the
+    children when they reach further (0 means "fit the children"). Only
+    children that intersect the viewport are rendered, and their drawing is
+    clipped to it, so a form with hundreds of fields costs about as much as the
+    handful on screen. Moving focus to a child scrolls it into view.
+    """
+
+    DEFAULT_FG = curses.COLOR_WHITE
+    DEFAULT_BG = curses.COLOR_BLACK
+    DEFAULT_BORDER_FG = curses.COLOR_BLACK
+    DEFAULT_BORDER_BG = LIGHT_GRAY
+    DEFAULT_SCROLLBAR_FG = curses.COLOR_WHITE
+    DEFAULT_SCROLLBAR_BG = LIGHT_GRAY
+
+    # Dropdowns inside may open below the viewport; windows then route those clicks here first
+    has_popup = True
+
+    def __init__(self, left, top, width, height, canvas_width: int = 0, canvas_height: int = 0, border: bool = True, parent=None):
+        super().__init__(left, top, width, height, parent)
+        self.canvas = _Canvas(self)
+        self.canvas_width = canvas_width
+        self.canvas_height = canvas_height
+        self.border = border
+        self.scroll_x = 0
+        self.scroll_y = 0
+        self.followed: Optional[Component] = None  # focused child last scrolled into view
+        self.pointer_grab: Optional[Component] = None
+        self._place_canvas(0, 0, 0, 0)
+        self.fg_color = self.DEFAULT_FG
+        self.bg_color = self.DEFAULT_BG
+        self.border_fg = self.DEFAULT_BORDER_FG
+        self.border_bg = self.DEFAULT_BORDER_BG
+        self.scrollbar_fg = self.DEFAULT_SCROLLBAR_FG
+        self.scrollbar_bg = self.DEFAULT_SCROLLBAR_BG
+
+    @property
+    def children(self) -> List[Component]:
+        return self.canvas.children
+
+    def set_border_colors(self, fg=None, bg=None):
+        if fg is not None:
+            self.border_fg = fg
+        if bg is not None:
+            self.border_bg = bg
+
+    def set_scrollbar_colors(self, fg=None, bg=None):
+        if fg is not None:
+            self.scrollbar_fg = fg
+        if bg is not None:
+            self.scrollbar_bg = bg
+
+    def _window(self):
+        p = self.parent
+        while p is not None and not hasattr(p, "focus_ring"):
+            p = p.parent
+        return p
+
+    def add(self, child: Component):
+        """Adds ``child`` at its left/top on the canvas. Fill large forms before adding the view to a window."""
+        child.parent = self.canvas
+        self.canvas.children.append(child)
+        window = self._window()
+        if window is not None:
+            window.refresh_focus()
+
+    def remove(self, child: Component):
+        if child in self.canvas.children:
+            self.canvas.children.remove(child)
+            window = self._window()
+            if window is not None:
+                focused = window.focused
+                if focused is not None and self._owns(child, focused):
+                    window.set_focus(None)
+                window.refresh_focus()
+
+    def focus_children(self):
+        return self.canvas.children
+
+    def _owns(self, ancestor: Component, component: Component) -> bool:
+        while component is not None and component is not self.canvas:
+            if component is ancestor:
+                return True
+            component = component.parent
+        return False
+
+    def _hosts(self, component: Component) -> bool:
+        while component is not None:
+            if component is self.canvas:
+                return True
+            component = component.parent
+        return False
+
+    # -- geometry -------------------------------------------------------------
+
+    def content_size(self) -> Tuple[int, int]:
+        width, height = self.canvas_width, self.canvas_height
+        for child in self.canvas.children:
+            if child.visibility:
+                width = max(width, child.left + child.width)
+                height = max(height, child.top + child.height)
+        return width, height
+
+    def _geometry(self):
+        # Canvas size, viewport size and which scrollbars show; each bar takes a row/column from the viewport
+        content_w, content_h = self.content_size()
+        inset = 2 if self.border else 0
+        inner_w, inner_h = max(0, self.width - inset), max(0, self.height - inset)
+        vbar = content_h > inner_h
+        hbar = content_w > inner_w - vbar
+        vbar = vbar or content_h > inner_h - hbar
+        return content_w, content_h, inner_w - vbar, inner_h - hbar, vbar, hbar
+
+    def _place_canvas(self, content_w, content_h, view_w, view_h):
+        self.scroll_x = _clamp(self.scroll_x, 0, max(0, content_w - view_w))
+        self.scroll_y = _clamp(self.scroll_y, 0, max(0, content_h - view_h))
+        inset = 1 if self.border else 0
+        self.canvas.left = inset - self.scroll_x
+        self.canvas.top = inset - self.scroll_y
+
+    def scroll_to(self, x: int, y: int):
+        self.scroll_x, self.scroll_y = x, y
+        content_w, content_h, view_w, view_h, _, _ = self._geometry()
+        self._place_canvas(content_w, content_h, view_w, view_h)
+
+    def scroll_by(self, dx: int, dy: int):
+        self.scroll_to(self.scroll_x + dx, self.scroll_y + dy)
+
+    def scroll_into_view(self, component: Component):
+        """Scrolls the least distance that shows ``component`` (any descendant), or its top-left if it doesn't fit."""
+        x, y = component.left, component.top
+        p = component.parent
+        while p is not None and p is not self.canvas:
+            x += p.left
+            y += p.top
+            p = p.parent
+        _, _, view_w, view_h, _, _ = self._geometry()
+        sx, sy = self.scroll_x, self.scroll_y
+        if x + component.width > sx + view_w:
+            sx = x + component.width - view_w
+        if y + component.height > sy + view_h:
+            sy = y + component.height - view_h
+        self.scroll_to(min(sx, x), min(sy, y))
+
+    def _open_popups(self):
+        return [child for child in self.canvas.children
+                if child.visibility and child.has_popup and child.hit_height() > child.height]
+
+    def _popup_at(self, x: int, y: int) -> Optional[Component]:
+        for child in reversed(self._open_popups()):
+            child_x, child_y = child.get_absolute_position()
+            if child_x <= x < child_x + child.width and child_y <= y < child_y + child.hit_height():
+                return child
+        return None
+
+    def child_at(self, x: int, y: int) -> Optional[Component]:
+        popup = self._popup_at(x, y)
+        if popup is not None:
+            return popup
+        _, _, view_w, view_h, _, _ = self._geometry()
+        absolute_x, absolute_y = self.get_absolute_position()
+        inset = 1 if self.border else 0
+        if not (0 <= x - absolute_x - inset < view_w and 0 <= y - absolute_y - inset < view_h):
+            return None  # on the border or a scrollbar, or a child scrolled out of view
+        return next((c for c in reversed(self.canvas.children) if c.visibility and is_mouse_over(c, x, y)), None)
+
+    def hit_height(self) -> int:
+        _, absolute_y = self.get_absolute_position()
+        height = self.height
+        for child in self._open_popups():
+            _, child_y = child.get_absolute_position()
+            height = max(height, child_y + child.hit_height() - absolute_y)
+        return height
+
+    # -- rendering ------------------------------------------------------------
+
+    def _follow_focus(self):
+        window = self._window()
+        focused = window.focused if window is not None else None
+        if focused is not None and not self._hosts(focused):
+            focused = None
+        if focused is not self.followed:
+            self.followed = focused
+            if focused is not None:
+                self.scroll_into_view(focused)
+
+    def render(self, renderer: TerminalRenderer):
+        if not self.visibility:
+            return
+        self._follow_focus()
+        content_w, content_h, view_w, view_h, vbar, hbar = self._geometry()
+        self._place_canvas(content_w, content_h, view_w, view_h)
+        absolute_x, absolute_y = self.get_absolute_position()
+        inset = 1 if self.border else 0
+        if self.border:
+            renderer.draw_box(absolute_x, absolute_y, self.width, self.height, title=None, win=renderer.screen, fg=self.border_fg, bg=self.border_bg, border_style="single")
+        view_x, view_y = absolute_x + inset, absolute_y + inset
+        bg_attr = renderer.get_color_pair(self.fg_color, self.bg_color)
+        for i in range(view_h):
+            _safe_add_string(renderer.screen, view_y + i, view_x, " " * view_w, bg_attr)
+        sx, sy = self.scroll_x, self.scroll_y
+        screen = renderer.screen
+        clip = _ClipScreen(screen, view_x, view_y, view_x + view_w, view_y + view_h)
+        popups = []
+        renderer.screen = clip
+        try:
+            for child in self.canvas.children:
+                if not child.visibility:
+                    continue
+                if child.left >= sx + view_w or child.left + child.width <= sx or child.top >= sy + view_h or child.top + child.height <= sy:
+                    continue
+                if child.has_popup and child.hit_height() > child.height:
+                    popups.append(child)
+                else:
+                    child.render(renderer)
+        finally:
+            renderer.screen = screen
+        if clip.cursor_clipped:
+            renderer.curs_set(0)
+        self._render_scrollbars(renderer, view_x, view_y, view_w, view_h, vbar, hbar, content_w, content_h)
+        # Open popups go on top and may hang below the view, as they would out of a window
+        if popups:
+            renderer.screen = _ClipScreen(screen, view_x, view_y, view_x + view_w, renderer.h)
+            try:
+                for child in popups:
+                    child.render(renderer)
+            finally:
+                renderer.screen = screen
+
+    def _render_scrollbars(self, renderer, view_x, view_y, view_w, view_h, vbar, hbar, content_w, content_h):
+        scrollbar_attr = renderer.get_color_pair(self.scrollbar_fg, self.scrollbar_bg)
+        if vbar and view_h > 0:
+            sbar_x = view_x + view_w
+            for i in range(view_h):
+                _safe_add_string(renderer.screen, view_y + i, sbar_x, '│', scrollbar_attr)
+            thumb_size = max(1, view_h * view_h // content_h)
+            thumb_pos = min(view_h - thumb_size, view_h * self.scroll_y // content_h)
+            for i in range(thumb_size):
+                _safe_add_string(renderer.screen, view_y + thumb_pos + i, sbar_x, '█', scrollbar_attr)
+        if hbar and view_w > 0:
+            sbar_y = view_y + view_h
+            _safe_add_string(renderer.screen, sbar_y, view_x, '─' * view_w, scrollbar_attr)
+            thumb_size = max(1, view_w * view_w // content_w)
+            thumb_pos = min(view_w - thumb_size, view_w * self.scroll_x // content_w)
+            _safe_add_string(renderer.screen, sbar_y, view_x + thumb_pos, '█' * thumb_size, scrollbar_attr)
+            if vbar:
+                _safe_add_string(renderer.screen, sbar_y, view_x + view_w, ' ', scrollbar_attr)
+
+    # -- input ----------------------------------------------------------------
+
+    def _page_click(self, pos, view_size, content_size, scroll):
+        # Clicks on the track page towards them, as in Console; the thumb itself stays put
+        thumb_size = max(1, view_size * view_size // content_size)
+        thumb_pos = min(view_size - thumb_size, view_size * scroll // content_size)
+        if pos < thumb_pos:
+            return -view_size
+        if pos >= thumb_pos + thumb_size:
+            return view_size
+        return 0
+
+    def handleEvent(self, event: UIEvent) -> bool:
+        if event.type != "mouse":
+            return False
+        mouse_x, mouse_y = event.x, event.y
+        bstate = event.bstate
+        grab = self.pointer_grab
+        if grab is not None and (event.etype == "motion" or bstate & curses.BUTTON1_RELEASED):
+            if bstate & curses.BUTTON1_RELEASED:
+                self.pointer_grab = None
+            return grab.handleEvent(event)
+        if bstate & curses.BUTTON1_PRESSED and event.etype != "motion":
+            self.pointer_grab = None
+        popup = self._popup_at(mouse_x, mouse_y)
+        if popup is not None and popup.handleEvent(event):
+            self._grab_pointer(popup, event)
+            return True
+        if not is_mouse_over(self, mouse_x, mouse_y):
+            return False
+        content_w, content_h, view_w, view_h, vbar, hbar = self._geometry()
+        if bstate & WHEEL_UP:
+            self.scroll_by(0, -3)
+            return True
+        if bstate & WHEEL_DOWN:
+            self.scroll_by(0, 3)
+            return True
+        absolute_x, absolute_y = self.get_absolute_position()
+        inset = 1 if self.border else 0
+        view_x, view_y = absolute_x + inset, absolute_y + inset
+        row, col = mouse_y - view_y, mouse_x - view_x
+        if vbar and col == view_w and 0 <= row < view_h:
+            self.scroll_by(0, self._page_click(row, view_h, content_h, self.scroll_y))
+            return True
+        if hbar and row == view_h and 0 <= col < view_w:
+            self.scroll_by(self._page_click(col, view_w, content_w, self.scroll_x), 0)
+            return True
+        if not (0 <= row < view_h and 0 <= col < view_w):
+            return True
+        for child in reversed(self.canvas.children):
+            if child.visibility and is_mouse_over(child, mouse_x, mouse_y) and child.handleEvent(event):
+                self._grab_pointer(child, event)
+                return True
+        return False
+
+    def _grab_pointer(self, child: Component, event: UIEvent):
+        if event.bstate & curses.BUTTON1_PRESSED and event.etype != "motion":
+            self.pointer_grab = child
@@ -0,0 +1,177 @@
+import re
+import threading
+from typing import Callable, List, Optional, Tuple
+
+Span = Tuple[int, int]
+
+
+class SearchWorker(threading.Thread):
+    """Scans a snapshot of the lines in chunks and hands each chunk's (row, spans) to ``deliver``.
+
+    The snapshot is a shallow copy of the line list, so the UI thread can keep
+    editing the real buffer. ``deliver(worker, chunk, scanned, done)`` is called
+    on the worker thread and is expected to pass the chunk on to the UI thread.
+    """
+
+    def __init__(self, lines: List[str], pattern, deliver: Callable, chunk_lines: int = 2000,
+                 on_exit: Optional[Callable[[], None]] = None):
+        super().__init__(daemon=True)
+        self.lines = lines
+        self.pattern = pattern
+        self.deliver = deliver
+        self.chunk_lines = chunk_lines
+        self.on_exit = on_exit
+        self.cancelled = threading.Event()
+
+    def run(self):
+        try:
+            self._scan()
+        finally:
+            if self.on_exit is not None:
+                self.on_exit()
+
+    def _scan(self):
+        finditer = self.pattern.finditer
+        n = len(self.lines)
+        for chunk_start in range(0, n, self.chunk_lines):
+            if self.cancelled.is_set():
+                return
+            chunk = []
+            for row in range(chunk_start, min(n, chunk_start + self.chunk_lines)):
+                spans = [m.span() for m in finditer(self.lines[row]) if m.end() > m.start()]
+                if spans:
+                    chunk.append((row, spans))
+            scanned = min(n, chunk_start + self.chunk_lines)
+            self.deliver(self, chunk, scanned, scanned == n)
+        if not n:
+            self.deliver(self, [], 0, True)
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class TextSearch:
+    """Match cache for one pattern over a TextArea buffer.
+
+    ``row_matches`` is aligned with the buffer lines (``None`` where a row has no
+    match). It is filled from a background SearchWorker and patched in place on
+    edits by re-scanning only the changed rows. The worker's chunks come back
+    through ``tasks``, the window manager's TaskQueue, to run on the UI thread;
+    without ``tasks`` the scan runs inline.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0, chunk_lines: int = 2000, tasks=None):
+        self.pattern = re.compile(pattern, flags)
+        self.chunk_lines = chunk_lines
+        self.tasks = tasks
+        self.row_matches: List[Optional[List[Span]]] = []
+        self.count = 0
+        self.worker: Optional[SearchWorker] = None
+        self.scanned = 0
+
+    @property
+    def running(self) -> bool:
+        return self.worker is not None
+
+    def start(self, lines: List[str]):
+        self.cancel()
+        self.row_matches = [None] * len(lines)
+        self.count = 0
+        self.scanned = 0
+        tasks = self.tasks
+        if tasks is None:
+            self.worker = SearchWorker(list(lines), self.pattern, self._apply_chunk, self.chunk_lines)
+            self.worker.run()
+            return
+        tasks.begin_work()
+        self.worker = SearchWorker(list(lines), self.pattern,
+                                   lambda *args: tasks.call_soon_threadsafe(self._apply_chunk, *args),
+                                   self.chunk_lines, on_exit=tasks.end_work)
+        self.worker.start()
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
+    def _apply_chunk(self, worker: SearchWorker, chunk: List[Tuple[int, List[Span]]], scanned: int, done: bool):
+        if worker is not self.worker:
+            return  # from a cancelled or restarted scan
+        for row, spans in chunk:
+            self.row_matches[row] = spans
+            self.count += len(spans)
+        self.scanned = scanned
+        if done:
+            self.worker = None
+
+    def _scan_row(self, line: str) -> Optional[List[Span]]:
+        spans = [m.span() for m in self.pattern.finditer(line) if m.end() > m.start()]
+        return spans or None
+
+    def lines_changed(self, lines: List[str], start: int, removed: int, added: int):
+        if self.worker is not None:
+            # The running scan's snapshot no longer matches the buffer; restart it
+            self.start(lines)
+            return
+        for spans in self.row_matches[start:start + removed]:
+            if spans:
+                self.count -= len(spans)
+        fresh = [self._scan_row(line) for line in lines[start:start + added]]
+        self.count += sum(len(spans) for spans in fresh if spans)
+        self.row_matches[start:start + removed] = fresh
+
+    def next_match(self, row: int, col: int, backwards: bool = False) -> Optional[Tuple[int, int, int]]:
+        rows = self.row_matches
+        n = len(rows)
+        if not n:
+            return None
+        for step in range(n + 1):
+            r = (row - step if backwards else row + step) % n
+            spans = rows[r]
+            if not spans:
+                continue
+            candidates = reversed(spans) if backwards else spans
+            for s, e in candidates:
+                if step == 0 and (s >= col if backwards else s <= col):
+                    continue
+                if step == n and (s < col if backwards else s > col):
+                    continue
+                return r, s, e
+        return None
+
+    def replacements(self, lines: List[str], repl: str) -> List[Tuple[int, str, str]]:
+        """Returns ``(row, old, new)`` for every row that replacing the matches changes.
+
+        Rows the running scan hasn't reached yet are scanned in the same pass
+        (and cached), so the worker is cancelled rather than waited for. Empty
+        matches are left unreplaced; ``row_matches`` skips them too.
+        """
+        scanned = self.scanned if self.worker is not None else len(lines)
+        self.cancel()
+
+        if "\\" in repl:
+            def expand(m):
+                return m.expand(repl) if m.end() > m.start() else ""
+        else:
+            # No group references or escapes: skip re-parsing the template per match
+            def expand(m):
+                return repl if m.end() > m.start() else ""
+
+        sub = self.pattern.sub
+        rows = self.row_matches
+        out = []
+        for row, line in enumerate(lines):
+            if row < scanned:
+                if not rows[row]:
+                    continue
+            else:
+                if rows[row]:
+                    self.count -= len(rows[row])
+                rows[row] = self._scan_row(line)
+                if not rows[row]:
+                    continue
+                self.count += len(rows[row])
+            new = sub(expand, line)
+            if new != line:
+                out.append((row, line, new))
+        return out
@@ -0,0 +1,221 @@
+import asyncio
+import os
+import stat
+from typing import Callable, Optional, Set
+
+from .ansi import AnsiRenderer, AnsiInputParser, TERMINAL_SETUP, TERMINAL_RESTORE, SIZE_QUERY, ESCAPE_DELAY, dispatch_input
+
+
+class Session:
+    """One connected terminal: its own renderer, app and window manager.
+
+    Input is parsed into events and handed to the session's manager; after
+    each batch of input or queued tasks one frame is drawn and only the cells
+    that changed since the last frame are written back to the socket. A slow
+    client only stalls its own session, since each waits on its own ``drain``.
+    """
+
+    def __init__(self, server: "SessionServer", reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.renderer = AnsiRenderer(server.width, server.height, color_depth=server.color_depth)
+        self.app = server.app_factory(self.renderer)
+        self.manager = self.app.manager
+        self.parser = AnsiInputParser()
+        self.parser.screen_w, self.parser.screen_h = server.width, server.height
+        self.frame_pending = False
+        self.escape_timer: Optional[asyncio.TimerHandle] = None
+        self.timer_handle: Optional[asyncio.TimerHandle] = None  # wakes the session for its next app timer
+        self.size_handle: Optional[asyncio.TimerHandle] = None  # re-asks the client for its size
+        self.closed = False
+        self.closing: Optional[asyncio.Future] = None
+        self.bytes_sent = 0
+
+    @property
+    def alive(self) -> bool:
+        return not self.closed and getattr(self.app, "running", True)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        loop.add_reader(self.manager.tasks.fileno(), self._run_tasks)
+        try:
+            self._write(TERMINAL_SETUP)
+            self.query_size()
+            self._frame()
+            while self.alive:
+                data = await self.reader.read(4096)
+                if not data:
+                    break
+                self._dispatch(self.parser.feed(data))
+                if self.parser.pending_escape and self.escape_timer is None:
+                    self.escape_timer = loop.call_later(ESCAPE_DELAY, self._flush_escape)
+                await self.writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            await self.close()
+
+    def _dispatch(self, events):
+        if not dispatch_input(self.manager, events, self.resize):
+            self.closed = True
+            return
+        self._schedule_frame()
+
+    def _flush_escape(self):
+        self.escape_timer = None
+        events = self.parser.flush()
+        if events:
+            self._dispatch(events)
+
+    def _run_tasks(self):
+        if self.manager.tasks.run_pending():
+            self._schedule_frame()
+
+    def _run_timers(self):
+        self.timer_handle = None
+        if self.manager.run_timers():
+            self._schedule_frame()
+        else:
+            self._arm_timers()
+
+    def _arm_timers(self):
+        # Every change ends in a frame, so re-arming after each frame catches timers added anywhere
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
+            self.timer_handle = None
+        timeout = self.manager.next_timeout()
+        if timeout is not None:
+            self.timer_handle = asyncio.get_running_loop().call_later(timeout, self._run_timers)
+
+    def query_size(self):
+        """Asks the client for its size; the reply resizes the session if it changed.
+
+        Raw byte streams carry no resize signal, so this is also repeated every
+        ``server.size_interval`` seconds to notice the client's window changing.
+        """
+        if self.size_handle is not None:
+            self.size_handle.cancel()
+            self.size_handle = None
+        self.parser.expect_size = True
+        self._write(SIZE_QUERY)
+        if self.server.size_interval:
+            self.size_handle = asyncio.get_running_loop().call_later(self.server.size_interval, self.query_size)
+
+    def resize(self, width: int, height: int):
+        if (width, height) == (self.renderer.w, self.renderer.h):
+            return
+        self.renderer.resize(width, height)
+        self.manager.request_resize(width, height)
+        self._schedule_frame()
+
+    def _schedule_frame(self):
+        # Input and tasks arriving in the same loop iteration share one frame
+        if not self.frame_pending:
+            self.frame_pending = True
+            asyncio.get_running_loop().call_soon(self._frame)
+
+    def _frame(self):
+        self.frame_pending = False
+        if not self.alive:
+            # The app quit from a task or timer; ending the stream wakes ``run`` to clean up
+            self.writer.close()
+            return
+        self.renderer.screen.erase()
+        self.manager.render_all(self.renderer)
+        self._write(self.renderer.flush())
+        self._arm_timers()
+
+    def _write(self, text: str):
+        if text and not self.writer.is_closing():
+            data = text.encode("utf-8")
+            self.bytes_sent += len(data)
+            self.writer.write(data)
+
+    def close(self) -> asyncio.Future:
+        """Ends the session; every caller gets the same future, done once the app has shut down."""
+        if self.closing is None:
+            self.closing = asyncio.ensure_future(self._close())
+        return self.closing
+
+    async def _close(self):
+        if self.escape_timer is not None:
+            self.escape_timer.cancel()
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
+        if self.size_handle is not None:
+            self.size_handle.cancel()
+        loop = asyncio.get_running_loop()
+        try:
+            loop.remove_reader(self.manager.tasks.fileno())
+        except (ValueError, OSError):
+            pass
+        self.closed = True
+        self._write(TERMINAL_RESTORE)
+        try:
+            await self.writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        self.writer.close()
+        if getattr(self.app, "running", False) and hasattr(self.app, "exit"):
+            # App shutdown may join worker threads; keep that off the event loop
+            await loop.run_in_executor(None, self.app.exit)
+        self.manager.tasks.close()
+        self.server.sessions.discard(self)
+
+
+class SessionServer:
+    """Serves an app to any number of terminals from one process.
+
+    ``app_factory(renderer)`` builds a fresh app for each connection; it must
+    return an object with a ``manager`` (WindowManager) and may have ``running``
+    and ``exit()`` like DemoApp. Clients connect with a raw-mode terminal, for
+    example ``socat -,rawer,escape=0x1d unix-connect:/tmp/app.sock``; the size
+    is asked for with a cursor-position query when the session starts and
+    again every ``size_interval`` seconds (None asks only once). The
+    client's color support can't be asked for, so every session renders with
+    ``color_depth`` colors (see theme.quantize).
+    """
+
+    def __init__(self, app_factory: Callable[[AnsiRenderer], object], width: int = 80, height: int = 24,
+                 color_depth: int = 256, size_interval: Optional[float] = 2.0):
+        self.app_factory = app_factory
+        self.width = width
+        self.height = height
+        self.color_depth = color_depth
+        self.size_interval = size_interval
+        self.sessions: Set[Session] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.path: Optional[str] = None
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = Session(self, reader, writer)
+        self.sessions.add(session)
+        await session.run()
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        self.server = await asyncio.start_server(self._accept, host, port)
+        return self.server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        try:
+            # Only a socket left over from an earlier run is replaced; binding fails on anything else
+            if stat.S_ISSOCK(os.lstat(path).st_mode):
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        self.server = await asyncio.start_unix_server(self._accept, path)
+        os.chmod(path, 0o600)
+        self.path = path
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+        for session in list(self.sessions):
+            session.closed = True
+        await asyncio.gather(*(session.close() for session in list(self.sessions)))
+        if self.server is not None:
+            await self.server.wait_closed()
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
@@ -0,0 +1,145 @@
+import codecs
+import io
+import os
+import queue
+import stat
+import threading
+from typing import BinaryIO, Callable, List, Optional, Union
+
+
+class StreamLoader(threading.Thread):
+    """Reads and decodes a stream on a worker thread for TextArea.load_stream.
+
+    Text is decoded with an incremental decoder, so multi-byte characters and
+    ``\\r\\n`` pairs split across chunk boundaries come out whole, and newlines
+    are translated to ``\\n``. Each chunk is put on ``batches`` as the list of
+    its lines; the first entry continues the last line of the previous batch.
+    The first chunk is small so the first screenful arrives quickly.
+    """
+
+    FIRST_CHUNK = 16 * 1024
+    CHUNK = 256 * 1024
+
+    def __init__(self, fileobj: Union[BinaryIO, io.TextIOBase], encoding: str = "utf-8", errors: str = "replace",
+                 notify: Optional[Callable[[], None]] = None, close: bool = False,
+                 on_exit: Optional[Callable[[], None]] = None):
+        super().__init__(daemon=True)
+        self.fileobj = fileobj
+        self.encoding = encoding
+        self.errors = errors
+        self.notify = notify
+        self.close = close
+        self.on_exit = on_exit
+        self.batches: "queue.Queue[List[str]]" = queue.Queue()
+        self.cancelled = threading.Event()
+        self.error: Optional[Exception] = None
+        self.done = False
+
+    def run(self):
+        decoder = None
+        size = self.FIRST_CHUNK
+        try:
+            while not self.cancelled.is_set():
+                data = self.fileobj.read(size)
+                size = self.CHUNK
+                if decoder is None:
+                    # Text streams only need newline translation
+                    inner = None if isinstance(data, str) else codecs.getincrementaldecoder(self.encoding)(self.errors)
+                    decoder = io.IncrementalNewlineDecoder(inner, translate=True)
+                text = decoder.decode(data, final=not data)
+                if text:
+                    self.batches.put(text.split("\n"))
+                    if self.notify:
+                        self.notify()
+                if not data:
+                    break
+        except Exception as e:
+            self.error = e
+        finally:
+            if self.close:
+                self.fileobj.close()
+            self.done = True
+            if self.notify:
+                self.notify()
+            if self.on_exit:
+                self.on_exit()
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def atomic_write_lines(lines: List[str], path: str, encoding: str = "utf-8", errors: str = "strict",
+                       report: Optional[Callable[[float], None]] = None,
+                       cancelled: Optional[Callable[[], bool]] = None, chunk_size: int = 1 << 20) -> bool:
+    """Writes ``"\\n".join(lines)`` to ``path`` without ever leaving it half-written.
+
+    Lines are encoded and written about ``chunk_size`` bytes at a time into a
+    temp file in the same directory, which is fsynced and then renamed over
+    ``path`` (the file a symlink points to, when it is one), so memory use
+    doesn't grow with the document and a failure or cancel leaves the old
+    file untouched. Returns False if cancelled.
+    """
+    import tempfile  # only saving needs it, and it pulls in random, shutil and more
+
+    # Through symlinks, so a link keeps pointing at the file that now has the new text
+    path = os.path.realpath(path)
+    directory = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix="." + os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp, mode)
+        with os.fdopen(fd, "wb") as f:
+            fd = -1
+            total = len(lines)
+            buf, size = [], 0
+            for i, line in enumerate(lines):
+                if i:
+                    buf.append("\n")
+                buf.append(line)
+                size += len(line) + 1
+                if size >= chunk_size:
+                    if cancelled is not None and cancelled():
+                        raise _Cancelled()
+                    f.write("".join(buf).encode(encoding, errors))
+                    buf, size = [], 0
+                    if report is not None:
+                        report((i + 1) / total)
+            f.write("".join(buf).encode(encoding, errors))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except _Cancelled:
+        os.unlink(tmp)
+        return False
+    except BaseException:
+        if fd >= 0:
+            os.close(fd)
+        os.unlink(tmp)
+        raise
+    _fsync_directory(directory)
+    if report is not None:
+        report(1.0)
+    return True
+
+
+def _fsync_directory(directory: str):
+    # Makes the rename itself durable; not every platform lets a directory be opened
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
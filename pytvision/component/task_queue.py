@@ -0,0 +1,127 @@
+import collections
+import os
+import threading
+from typing import Callable, Optional
+
+
+class TaskQueue:
+    """Callables posted from any thread and run on the UI thread.
+
+    ``call_soon_threadsafe`` appends to a locked deque and, for the first task
+    since the last drain, writes a byte to a pipe; the UI loop waits on
+    ``fileno()`` next to the terminal so a post wakes it. ``run_pending`` runs at
+    most ``batch`` tasks per frame so a busy producer can't keep input from being
+    read. With ``maxsize`` set, posting into a full queue blocks the producer (or
+    fails, with ``block=False`` or once ``timeout`` runs out) until the UI thread
+    catches up. Posts from the UI thread itself never block: they go over the
+    bound, since only that thread could make room.
+
+    Background work whose results come back through the queue is counted with
+    ``begin_work``/``end_work``, so ``idle`` tells when nothing more is on its
+    way (replays use it to wait for workers). After ``close`` posts are refused
+    (``call_soon_threadsafe`` returns False), since workers can outlive a session.
+    """
+
+    def __init__(self, maxsize: int = 0, batch: int = 256):
+        self.maxsize = maxsize
+        self.batch = batch
+        self.tasks = collections.deque()
+        self.lock = threading.Lock()
+        self.not_full = threading.Condition(self.lock)
+        self.signalled = False
+        self.closed = False
+        self.working = 0
+        self.ui_thread: Optional[int] = None  # set by run_pending
+        self.on_error: Optional[Callable[[Exception], None]] = None
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+
+    def fileno(self) -> int:
+        return self._wake_r
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def call_soon_threadsafe(self, fn: Callable, *args, block: bool = True, timeout: Optional[float] = None) -> bool:
+        with self.not_full:
+            if self.closed:
+                return False
+            if self.maxsize and len(self.tasks) >= self.maxsize and threading.get_ident() != self.ui_thread:
+                if not block or not self.not_full.wait_for(lambda: self.closed or len(self.tasks) < self.maxsize, timeout):
+                    return False
+                if self.closed:
+                    return False
+            self.tasks.append((fn, args))
+            wake = not self.signalled
+            self.signalled = True
+            if wake:
+                self._wake()
+        return True
+
+    @property
+    def idle(self) -> bool:
+        with self.lock:
+            return not self.tasks and not self.working
+
+    def begin_work(self):
+        """Counts a piece of background work; call on the thread that starts it."""
+        with self.lock:
+            self.working += 1
+
+    def end_work(self):
+        """Ends a begin_work, from the worker once it has posted its last result (or given up)."""
+        with self.lock:
+            self.working -= 1
+            self._wake()
+
+    def _wake(self):
+        # Called with the lock held, so close() can't release the pipe's fd number in between
+        if self.closed:
+            return
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # the pipe is full, so the loop is already awake
+
+    def run_pending(self) -> int:
+        """Runs up to ``batch`` queued tasks on the calling (UI) thread; returns how many ran."""
+        if self.closed:
+            return 0
+        self.ui_thread = threading.get_ident()
+        try:
+            while os.read(self._wake_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+        with self.not_full:
+            n = min(len(self.tasks), self.batch)
+            batch = [self.tasks.popleft() for _ in range(n)]
+            self.signalled = bool(self.tasks)
+            if n:
+                self.not_full.notify_all()
+            if self.signalled:
+                # Leftovers run next frame; keep the loop from sleeping until then
+                self._wake()
+        for i, (fn, args) in enumerate(batch):
+            try:
+                fn(*args)
+            except Exception as e:
+                if self.on_error is None:
+                    with self.not_full:
+                        self.tasks.extendleft(reversed(batch[i + 1:]))
+                        self.signalled = True
+                        self._wake()
+                    raise
+                self.on_error(e)
+        return n
+
+    def close(self):
+        """Releases the wake pipe; posts from threads still running afterwards return False."""
+        with self.not_full:
+            if self.closed:
+                return
+            self.closed = True
+            self.not_full.notify_all()
+            os.close(self._wake_r)
+            os.close(self._wake_w)
@@ -1,11 +1,16 @@
 import curses
 from ..utils import _safe_add_string
+from .screen_buffer import ScreenBuffer, PAIR_SHIFT
+from .theme import Theme, CLASSIC, LIGHT_GRAY, TRUE_WHITE, quantize
 from typing import Optional
 
 class TerminalRenderer:
     def __init__(self, screen):
         self.screen = screen
         self.h, self.w = screen.getmaxyx()
+        # Lets curses' refresh find lines that moved (a console gaining lines, an editor scrolling)
+        # and shift them with the terminal's scroll region instead of rewriting every line
+        screen.idlok(True)
         self.init_colors()
 
     def init_colors(self):
@@ -13,21 +18,25 @@ class TerminalRenderer:
         curses.use_default_colors()
         self.color_pairs = {}
         self.next_pair = 1
-        self.light_gray_bg = curses.COLOR_WHITE
-        self.true_white_fg = curses.COLOR_WHITE
-        if curses.can_change_color():
-            try:
-                curses.init_color(21, 1000, 1000, 1000)  # True white
-                self.true_white_fg = 21
-                curses.init_color(20, 700, 700, 700)  # Light gray
-                self.light_gray_bg = 20
-            except Exception:
-                self.true_white_fg = curses.COLOR_WHITE
+        self.theme = CLASSIC
+        # RGB colors are quantized to what the terminal has; the palette itself is never redefined
+        self.color_depth = 256 if curses.COLORS >= 256 else 16 if curses.COLORS >= 16 else 8
+        self.light_gray_bg = LIGHT_GRAY
+        self.true_white_fg = TRUE_WHITE
+
+    def set_theme(self, theme: Theme):
+        # Pairs are recreated on demand with the new theme's colors
+        self.theme = theme
+        self.color_pairs = {}
+        self.next_pair = 1
+
+    def resolve_color(self, color: int) -> int:
+        return quantize(self.theme.resolve(color), self.color_depth)
 
     def get_color_pair(self, fg, bg):
         key = (fg, bg)
         if key not in self.color_pairs:
-            curses.init_pair(self.next_pair, fg, bg)
+            curses.init_pair(self.next_pair, self.resolve_color(fg), self.resolve_color(bg))
             self.color_pairs[key] = self.next_pair
             self.next_pair += 1
         return curses.color_pair(self.color_pairs[key])
@@ -35,6 +44,12 @@ class TerminalRenderer:
     def refresh_dimensions(self):
         self.h, self.w = self.screen.getmaxyx()
 
+    def curs_set(self, visibility: int):
+        try:
+            curses.curs_set(visibility)
+        except curses.error:
+            pass
+
     def draw_box(self, x: int, y: int, w: int, h: int, title: Optional[str] = None, win=None, fg=curses.COLOR_WHITE, bg=curses.COLOR_BLUE, fill=False, border_style="double"):
         if w <= 0 or h <= 0:
             return
@@ -73,3 +88,41 @@ class TerminalRenderer:
             return
         text = text[:max(0, self.w - x)]
         _safe_add_string(self.screen, y, x, text, self.get_color_pair(fg, bg))
+
+
+class HeadlessRenderer(TerminalRenderer):
+    """Renders into a ScreenBuffer without touching the terminal, for replays and tests."""
+
+    def __init__(self, width: int = 80, height: int = 24, screen=None):
+        self.cursor_visibility = 0
+        super().__init__(screen if screen is not None else ScreenBuffer(height, width))
+
+    def init_colors(self):
+        self.color_pairs = {}
+        self.pair_colors = {}
+        self.next_pair = 1
+        self.theme = CLASSIC
+        self.color_depth = 1 << 24
+        self.light_gray_bg = LIGHT_GRAY
+        self.true_white_fg = TRUE_WHITE
+
+    def set_theme(self, theme: Theme):
+        super().set_theme(theme)
+        self.pair_colors = {}
+
+    def get_color_pair(self, fg, bg):
+        key = (fg, bg)
+        pair = self.color_pairs.get(key)
+        if pair is None:
+            pair = self.color_pairs[key] = self.next_pair
+            # Themed but not quantized; backends that output the colors resolve them for their terminal
+            self.pair_colors[pair] = (self.theme.resolve(fg), self.theme.resolve(bg))
+            self.next_pair += 1
+        return pair << PAIR_SHIFT
+
+    def curs_set(self, visibility: int):
+        self.cursor_visibility = visibility
+
+    def resize(self, width: int, height: int):
+        self.screen.resize(height, width)
+        self.refresh_dimensions()
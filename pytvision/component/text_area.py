@@ -1,8 +1,17 @@
 import curses
+import queue
+from bisect import bisect_right
+
 from .component import Component, is_mouse_over
 from .terminal_renderer import TerminalRenderer
+from .theme import LIGHT_GRAY
 from .ui_event import UIEvent
-from ..utils import _clamp, _safe_add_string, KEY_ENTER, KEY_BACKSPACE
+from .highlighter import Highlighter, HighlightCache
+from .undo import UndoLog, EditOp, ReplaceOp
+from .search import TextSearch
+from .wrap import WrapIndex
+from .stream_io import StreamLoader, atomic_write_lines
+from ..utils import _clamp, _safe_add_string, KEY_ENTER, KEY_BACKSPACE, KEY_CTRL_Y, KEY_CTRL_Z
 
 class TextArea(Component):
     DEFAULT_FG = curses.COLOR_BLACK
@@ -12,16 +21,44 @@ class TextArea(Component):
     DEFAULT_BORDER_FG = curses.COLOR_BLACK
     DEFAULT_BORDER_BG = curses.COLOR_WHITE
     DEFAULT_SCROLLBAR_FG = curses.COLOR_WHITE
-    DEFAULT_SCROLLBAR_BG = 20
+    DEFAULT_SCROLLBAR_BG = LIGHT_GRAY
     DEFAULT_HILITE_FG = curses.COLOR_BLACK
     DEFAULT_HILITE_BG = curses.COLOR_RED
+    DEFAULT_MATCH_FG = curses.COLOR_BLACK
+    DEFAULT_MATCH_BG = curses.COLOR_YELLOW
+    DEFAULT_SYNTAX_COLORS = {
+        "keyword": curses.COLOR_MAGENTA,
+        "builtin": curses.COLOR_CYAN,
+        "constant": curses.COLOR_MAGENTA,
+        "string": curses.COLOR_GREEN,
+        "number": curses.COLOR_RED,
+        "comment": curses.COLOR_CYAN,
+        "decorator": curses.COLOR_YELLOW,
+        "key": curses.COLOR_BLUE,
+        "punct": None,
+        "error": curses.COLOR_RED,
+        "warning": curses.COLOR_YELLOW,
+        "info": curses.COLOR_GREEN,
+        "debug": curses.COLOR_CYAN,
+    }
+
+    focusable = True
 
-    def __init__(self, left, top, width, height, parent=None, value=""):
+    def __init__(self, left, top, width, height, parent=None, value="", highlighter: Highlighter = None):
         super().__init__(left, top, width, height, parent)
         self.lines = value.splitlines() or [""]
+        self.highlight_cache = HighlightCache(highlighter, len(self.lines)) if highlighter else None
+        self.syntax_colors = dict(self.DEFAULT_SYNTAX_COLORS)
+        self.undo_log = UndoLog()
+        self.text_search = None
+        self.match_fg = self.DEFAULT_MATCH_FG
+        self.match_bg = self.DEFAULT_MATCH_BG
         self.cx = 0
         self.cy = 0
         self.view_top = 0
+        self.view_sub = 0
+        self.wrap_index = None
+        self.loader = None
         self.fg_color = self.DEFAULT_FG
         self.bg_color = self.DEFAULT_BG
         self.fg_color_focused = self.DEFAULT_FG_FOCUSED
@@ -57,13 +94,309 @@ class TextArea(Component):
         if bg is not None:
             self.hilite_bg = bg
 
+    def set_match_colors(self, fg=None, bg=None):
+        if fg is not None:
+            self.match_fg = fg
+        if bg is not None:
+            self.match_bg = bg
+
+    def set_syntax_colors(self, **colors):
+        self.syntax_colors.update(colors)
+
+    def set_highlighter(self, highlighter: Highlighter = None):
+        self.highlight_cache = HighlightCache(highlighter, len(self.lines)) if highlighter else None
+
+    def set_wrap(self, enabled=True):
+        self.wrap_index = WrapIndex() if enabled else None
+        self.view_sub = 0
+        self._scroll_to_cursor()
+
+    def _prepare_wrap(self):
+        # The scrollbar column is always reserved in wrap mode so the wrap width doesn't depend on it
+        self.wrap_index.set_width(self.width - 3)
+        self.wrap_index.ensure(self.lines)
+        # A narrower width can leave the view inside a line that now has fewer rows
+        self.view_top = _clamp(self.view_top, 0, len(self.lines) - 1)
+        self.view_sub = min(self.view_sub, len(self.wrap_index.line_segments(self.lines, self.view_top)) - 1)
+
+    def _visual_rows(self, count):
+        # Yields (line, start, end) for up to `count` visual rows from the top of the view
+        idx, sub = self.view_top, self.view_sub
+        while count > 0 and idx < len(self.lines):
+            segs = self.wrap_index.line_segments(self.lines, idx)
+            line_len = len(self.lines[idx])
+            for k in range(min(sub, len(segs) - 1), len(segs)):
+                yield idx, segs[k], segs[k + 1] if k + 1 < len(segs) else line_len
+                count -= 1
+                if not count:
+                    return
+            idx, sub = idx + 1, 0
+
+    def _scroll_rows(self, delta):
+        inner_h = self.height - 2
+        if not self.wrap_index:
+            self.view_top = _clamp(self.view_top + delta, 0, max(0, len(self.lines) - inner_h))
+            return
+        self._prepare_wrap()
+        index = self.wrap_index
+        top = index.rows_before(self.view_top) + self.view_sub + delta
+        self.view_top, self.view_sub = index.locate(_clamp(top, 0, max(0, index.total_rows() - inner_h)))
+
+    def _lines_changed(self, start, removed, added):
+        # lines[start:start + removed] were replaced by `added` lines
+        if self.highlight_cache:
+            self.highlight_cache.lines_changed(start, removed, added)
+        if self.text_search:
+            self.text_search.lines_changed(self.lines, start, removed, added)
+        if self.wrap_index:
+            self.wrap_index.lines_changed(self.lines, start, removed, added)
+
     def set_value(self, value):
+        self.cancel_load()
         self.lines = value.splitlines() or [""]
-        self.cx = self.cy = self.view_top = 0
+        self.cx = self.cy = self.view_top = self.view_sub = 0
+        self.undo_log.clear()
+        if self.wrap_index:
+            self.wrap_index.invalidate()
+        if self.highlight_cache:
+            self.highlight_cache.reset(len(self.lines))
+        if self.text_search:
+            self.text_search.start(self.lines)
+
+    def load_stream(self, fileobj, encoding="utf-8", errors="replace", close=False):
+        """Replaces the text with the contents of ``fileobj``, read and decoded on a worker thread.
+
+        Lines are appended in batches as chunks arrive, so the first screenful
+        shows right away and the text can be scrolled and edited while the rest
+        loads. Undecodable bytes are handled per ``errors``. "onprogress" is
+        dispatched after each batch and "onload" (with ``error``) at the end.
+        """
+        self.cancel_load()
+        self.set_value("")
+        manager = self.owning_manager()
+        if manager is not None:
+            manager.tasks.begin_work()
+        self.loader = StreamLoader(fileobj, encoding, errors, close=close,
+                                   notify=lambda: self.call_soon_threadsafe(self.poll_load),
+                                   on_exit=manager.tasks.end_work if manager is not None else None)
+        self.loader.start()
+
+    @property
+    def loading(self):
+        return self.loader is not None
+
+    def cancel_load(self):
+        if self.loader is not None:
+            self.loader.cancel()
+            self.loader = None
+
+    def poll_load(self):
+        loader = self.loader
+        if loader is None:
+            return
+        # Read before draining, so a batch put just before the worker finished isn't left behind
+        done = loader.done
+        appended = False
+        while True:
+            try:
+                parts = loader.batches.get_nowait()
+            except queue.Empty:
+                break
+            last = len(self.lines) - 1
+            self.lines[last] += parts[0]
+            self.lines.extend(parts[1:])
+            self._lines_changed(last, 1, len(parts))
+            appended = True
+        if appended:
+            self.dispatchEvent("onprogress", lines=len(self.lines))
+        if done:
+            self.loader = None
+            self.dispatchEvent("onload", error=loader.error)
+
+    def save_job(self, path, encoding="utf-8", errors="strict"):
+        """Returns ``job(task=None)`` that saves the current text to ``path`` atomically.
+
+        The line list is snapshotted here, on the UI thread; the strings are shared,
+        not copied, so this stays cheap for any size. The job can then run on a
+        worker (it has the TaskExecutor signature) while editing continues, and
+        reports progress to ``task`` if given.
+        """
+        lines = list(self.lines)
+
+        def job(task=None):
+            if task is None:
+                return atomic_write_lines(lines, path, encoding, errors)
+            return atomic_write_lines(lines, path, encoding, errors, report=task.report, cancelled=lambda: task.cancelled)
+        return job
+
+    def _insert_text(self, row, col, text):
+        line = self.lines[row]
+        parts = text.split("\n")
+        if len(parts) == 1:
+            self.lines[row] = line[:col] + text + line[col:]
+        else:
+            self.lines[row:row + 1] = [line[:col] + parts[0]] + parts[1:-1] + [parts[-1] + line[col:]]
+        self._lines_changed(row, 1, len(parts))
+
+    def _delete_text(self, row, col, end_row, end_col):
+        first, last = self.lines[row], self.lines[end_row]
+        if row == end_row:
+            removed = first[col:end_col]
+        else:
+            removed = "\n".join([first[col:]] + self.lines[row + 1:end_row] + [last[:end_col]])
+        self.lines[row:end_row + 1] = [first[:col] + last[end_col:]]
+        self._lines_changed(row, end_row - row + 1, 1)
+        return removed
+
+    def _replace_rows(self, rows, inverse=False):
+        # Rebuilds the span from the first to the last changed row in one pass and splices it in once
+        first = rows[0][0]
+        block = []
+        src = first
+        shift = 0
+        for row, old, new in rows:
+            added = new.count("\n")
+            at = row + shift if inverse else row
+            block.extend(self.lines[src:at])
+            if inverse:
+                block.append(old)
+                src = at + added + 1
+            else:
+                block.extend(new.split("\n"))
+                src = at + 1
+            shift += added
+        self.lines[first:src] = block
+        self._lines_changed(first, src - first, len(block))
+
+    def insert(self, text, coalesce=False):
+        op = EditOp("i", self.cy, self.cx, text, (self.cy, self.cx))
+        self._insert_text(op.row, op.col, text)
+        self.undo_log.record(op, coalesce)
+        self.cy, self.cx = op.end()
+        self._scroll_to_cursor()
+
+    def delete(self, row, col, end_row, end_col, coalesce=False):
+        cursor = (self.cy, self.cx)
+        text = self._delete_text(row, col, end_row, end_col)
+        self.undo_log.record(EditOp("d", row, col, text, cursor), coalesce)
+        self.cy, self.cx = row, col
+        self._scroll_to_cursor()
+
+    def _apply(self, op, inverse):
+        if op.kind == "r":
+            self._replace_rows(op.rows, inverse)
+            self.cy = min(self.cy, len(self.lines) - 1)
+            self.cx = min(self.cx, len(self.lines[self.cy]))
+        elif (op.kind == "i") != inverse:
+            self._insert_text(op.row, op.col, op.text)
+            self.cy, self.cx = op.end()
+        else:
+            self._delete_text(op.row, op.col, *op.end())
+            self.cy, self.cx = op.row, op.col
+
+    def undo(self):
+        group = self.undo_log.pop_undo()
+        if not group:
+            return False
+        for op in reversed(group):
+            self._apply(op, inverse=True)
+        self.cy, self.cx = group[0].cursor
+        self._scroll_to_cursor()
+        return True
+
+    def redo(self):
+        group = self.undo_log.pop_redo()
+        if not group:
+            return False
+        for op in group:
+            self._apply(op, inverse=False)
+        self._scroll_to_cursor()
+        return True
+
+    def search(self, pattern, flags=0):
+        self.clear_search()
+        if pattern:
+            # Until the area is on a window manager there's no UI thread to hand chunks to; scan inline
+            manager = self.owning_manager()
+            self.text_search = TextSearch(pattern, flags, tasks=manager.tasks if manager is not None else None)
+            self.text_search.start(self.lines)
+        return self.text_search
+
+    def clear_search(self):
+        if self.text_search:
+            self.text_search.cancel()
+            self.text_search = None
+
+    def find_next(self, backwards=False):
+        if not self.text_search:
+            return False
+        found = self.text_search.next_match(self.cy, self.cx, backwards)
+        if found is None:
+            return False
+        self.undo_log.break_group()
+        self.cy, self.cx = found[0], found[1]
+        self._scroll_to_cursor()
+        return True
+
+    def find_prev(self):
+        return self.find_next(backwards=True)
+
+    def replace_all(self, repl):
+        search = self.text_search
+        if not search:
+            return 0
+        changes = search.replacements(self.lines, repl)
+        if not changes:
+            return 0
+        op = ReplaceOp(changes, (self.cy, self.cx))
+        self._replace_rows(changes)
+        self.undo_log.record_group([op])
+        self.cy = min(self.cy, len(self.lines) - 1)
+        self.cx = min(self.cx, len(self.lines[self.cy]))
+        self._scroll_to_cursor()
+        return len(changes)
+
+    def _scroll_to_cursor(self):
+        inner_h = self.height - 2
+        if self.wrap_index:
+            self._prepare_wrap()
+            index = self.wrap_index
+            sub = bisect_right(index.line_segments(self.lines, self.cy), self.cx) - 1
+            if (self.cy, sub) < (self.view_top, self.view_sub):
+                self.view_top, self.view_sub = self.cy, sub
+            else:
+                row = index.rows_before(self.cy) + sub
+                if row >= index.rows_before(self.view_top) + self.view_sub + inner_h:
+                    self.view_top, self.view_sub = index.locate(row - inner_h + 1)
+            return
+        if self.cy < self.view_top:
+            self.view_top = self.cy
+        elif self.cy >= self.view_top + inner_h:
+            self.view_top = self.cy - inner_h + 1
 
     def get_value(self):
         return "\n".join(self.lines)
 
+    def _draw_line(self, renderer, x, y, idx, start, end, text_w, fg, bg):
+        # Draws lines[idx][start:end] padded to text_w, styled runs first, cursor last
+        s = self.lines[idx]
+        visible = s[start:min(end, start + text_w)]
+        renderer.draw_text(x, y, visible.ljust(text_w), fg, bg)
+        if self.highlight_cache and visible:
+            for run_start, run_end, token in self.highlight_cache.line_runs(self.lines, idx):
+                color = self.syntax_colors.get(token)
+                run_start, run_end = max(run_start, start), min(run_end, start + len(visible))
+                if color is None or run_start >= run_end:
+                    continue
+                renderer.draw_text(x + run_start - start, y, s[run_start:run_end], color, bg)
+        if self.text_search and visible:
+            for match_start, match_end in self.text_search.row_matches[idx] or ():
+                match_start, match_end = max(match_start, start), min(match_end, start + len(visible))
+                if match_start < match_end:
+                    renderer.draw_text(x + match_start - start, y, s[match_start:match_end], self.match_fg, self.match_bg)
+        if self.isFocused and idx == self.cy and start <= self.cx < start + len(visible):
+            renderer.draw_text(x + self.cx - start, y, s[self.cx], self.hilite_fg, self.hilite_bg)
+
     def render(self, renderer: TerminalRenderer):
         if not self.visibility:
             return
@@ -71,82 +404,84 @@ class TextArea(Component):
         renderer.draw_box(absolute_x, absolute_y, self.width, self.height, title=None, win=renderer.screen, fg=self.border_fg, bg=self.border_bg, border_style="single")
         inner_h = self.height - 2
         inner_w = self.width - 2
+        self.poll_load()
+        fg = self.fg_color_focused if self.isFocused else self.fg_color
+        bg = self.bg_color_focused if self.isFocused else self.bg_color
+        if self.wrap_index:
+            self._prepare_wrap()
+            text_w = inner_w - 1
+            rows = list(self._visual_rows(inner_h))
+            for i in range(inner_h):
+                if i < len(rows):
+                    idx, start, end = rows[i]
+                    self._draw_line(renderer, absolute_x + 1, absolute_y + 1 + i, idx, start, end, text_w, fg, bg)
+                else:
+                    renderer.draw_text(absolute_x + 1, absolute_y + 1 + i, " " * text_w, fg, bg)
+            total = self.wrap_index.total_rows()
+            top = self.wrap_index.rows_before(self.view_top) + self.view_sub
+            self._render_scrollbar(renderer, absolute_x, absolute_y, inner_h, total, top)
+            renderer.curs_set(0)
+            return
         has_scrollbar = len(self.lines) > inner_h
         text_w = inner_w - 1 if has_scrollbar else inner_w
         for i in range(inner_h):
             idx = self.view_top + i
             if idx < len(self.lines):
-                s = self.lines[idx]
-                fg = self.fg_color_focused if self.isFocused else self.fg_color
-                bg = self.bg_color_focused if self.isFocused else self.bg_color
-                if self.isFocused and idx == self.cy and self.cx < len(s):
-                    before_cursor = s[:self.cx]
-                    cursor_char = s[self.cx:self.cx+1] or " "
-                    after_cursor = s[self.cx + 1:][:text_w - self.cx - 1]
-                    renderer.draw_text(absolute_x + 1, absolute_y + 1 + i, before_cursor, fg, bg)
-                    renderer.draw_text(absolute_x + 1 + len(before_cursor), absolute_y + 1 + i, cursor_char, self.hilite_fg, self.hilite_bg)
-                    renderer.draw_text(absolute_x + 1 + len(before_cursor) + len(cursor_char), absolute_y + 1 + i, after_cursor.ljust(text_w - len(before_cursor) - len(cursor_char)), fg, bg)
-                else:
-                    renderer.draw_text(absolute_x + 1, absolute_y + 1 + i, s[:text_w].ljust(text_w), fg, bg)
+                self._draw_line(renderer, absolute_x + 1, absolute_y + 1 + i, idx, 0, text_w, text_w, fg, bg)
             else:
                 renderer.draw_text(absolute_x + 1, absolute_y + 1 + i, " " * text_w, fg, bg)
-        if has_scrollbar:
+        self._render_scrollbar(renderer, absolute_x, absolute_y, inner_h, len(self.lines), self.view_top)
+        renderer.curs_set(0)
+
+    def _render_scrollbar(self, renderer, absolute_x, absolute_y, inner_h, total, top):
+        if total > inner_h:
             sbar_x = absolute_x + self.width - 2
             scrollbar_attr = renderer.get_color_pair(self.scrollbar_fg, self.scrollbar_bg)
             for i in range(inner_h):
                 _safe_add_string(renderer.screen, absolute_y + 1 + i, sbar_x, '│', scrollbar_attr)
-            thumb_size = max(1, inner_h * inner_h // len(self.lines))
-            thumb_pos = inner_h * self.view_top // len(self.lines)
+            thumb_size = max(1, inner_h * inner_h // total)
+            thumb_pos = inner_h * top // total
             for i in range(thumb_size):
                 _safe_add_string(renderer.screen, absolute_y + 1 + thumb_pos + i, sbar_x, '█',
                                renderer.get_color_pair(self.hilite_fg, self.hilite_bg))
-        curses.curs_set(0)
 
     def handleEvent(self, event: UIEvent) -> bool:
         if event.type == "key":
-            key = event.data.get('key')
+            key = event.key
+            if key in (KEY_CTRL_Z, KEY_CTRL_Y):
+                if key == KEY_CTRL_Z:
+                    self.undo()
+                else:
+                    self.redo()
+                return True
             if isinstance(key, str) and key not in ('\n', '\t', '\b'):
-                line = self.lines[self.cy]
-                self.lines[self.cy] = line[:self.cx] + key + line[self.cx:]
-                self.cx += 1
+                self.insert(key, coalesce=True)
                 return True
             if isinstance(key, int):
                 if key in (KEY_BACKSPACE, curses.KEY_BACKSPACE):
                     if self.cx > 0:
-                        line = self.lines[self.cy]
-                        self.lines[self.cy] = line[:self.cx - 1] + line[self.cx:]
-                        self.cx -= 1
+                        self.delete(self.cy, self.cx - 1, self.cy, self.cx, coalesce=True)
                     elif self.cy > 0:
-                        prev = self.lines[self.cy - 1]
-                        cur = self.lines.pop(self.cy)
-                        self.cy -= 1
-                        self.cx = len(prev)
-                        self.lines[self.cy] = prev + cur
+                        self.delete(self.cy - 1, len(self.lines[self.cy - 1]), self.cy, 0)
                     return True
                 if key in (KEY_ENTER, curses.KEY_ENTER):
-                    line = self.lines[self.cy]
-                    left = line[:self.cx]
-                    right = line[self.cx:]
-                    self.lines[self.cy] = left
-                    self.cy += 1
-                    self.cx = 0
-                    self.lines.insert(self.cy, right)
-                    if self.cy >= self.view_top + (self.height - 2):
-                        self.view_top = self.cy - (self.height - 3)
+                    self.insert("\n")
+                    return True
+                self.undo_log.break_group()
+                if key in (curses.KEY_F3, curses.KEY_F15):
+                    self.find_next(backwards=key == curses.KEY_F15)
                     return True
                 if key == curses.KEY_UP:
                     if self.cy > 0:
                         self.cy -= 1
                         self.cx = min(self.cx, len(self.lines[self.cy]))
-                        if self.cy < self.view_top:
-                            self.view_top = self.cy
+                        self._scroll_to_cursor()
                     return True
                 if key == curses.KEY_DOWN:
                     if self.cy < len(self.lines) - 1:
                         self.cy += 1
                         self.cx = min(self.cx, len(self.lines[self.cy]))
-                        if self.cy >= self.view_top + (self.height - 2):
-                            self.view_top += 1
+                        self._scroll_to_cursor()
                     return True
                 if key == curses.KEY_LEFT:
                     if self.cx > 0:
@@ -163,19 +498,38 @@ class TextArea(Component):
                         self.cx = 0
                     return True
                 if key in (curses.KEY_PPAGE,):
-                    self.view_top = max(0, self.view_top - (self.height - 2))
+                    self._scroll_rows(-(self.height - 2))
                     return True
                 if key in (curses.KEY_NPAGE,):
-                    self.view_top = min(max(0, len(self.lines) - (self.height - 2)), self.view_top + (self.height - 2))
+                    self._scroll_rows(self.height - 2)
                     return True
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
+            mouse_x, mouse_y = event.x, event.y
             if is_mouse_over(self, mouse_x, mouse_y):
                 absolute_x, absolute_y = self.get_absolute_position()
+                inner_h = self.height - 2
                 row = mouse_y - (absolute_y + 1)
-                self.cy = _clamp(self.view_top + row, 0, len(self.lines) - 1)
                 col = mouse_x - (absolute_x + 1)
-                self.cx = _clamp(col, 0, len(self.lines[self.cy]))
+                if self.wrap_index:
+                    self._prepare_wrap()
+                    total = self.wrap_index.total_rows()
+                else:
+                    total = len(self.lines)
+                if mouse_x == absolute_x + self.width - 2 and total > inner_h and 0 <= row < inner_h:
+                    top = self.wrap_index.rows_before(self.view_top) + self.view_sub if self.wrap_index else self.view_top
+                    self._scroll_rows(row * total // inner_h - top)
+                    self.isFocused = True
+                    return True
+                if self.wrap_index:
+                    rows = list(self._visual_rows(max(1, row + 1)))
+                    if rows:
+                        idx, start, end = rows[-1]
+                        self.cy = idx
+                        self.cx = _clamp(start + col, start, end)
+                else:
+                    self.cy = _clamp(self.view_top + row, 0, len(self.lines) - 1)
+                    self.cx = _clamp(col, 0, len(self.lines[self.cy]))
+                self.undo_log.break_group()
                 self.isFocused = True
                 return True
         return False
\ No newline at end of file
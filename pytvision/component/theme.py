@@ -0,0 +1,144 @@
+import curses
+import functools
+from typing import Dict, Optional, Tuple, Union
+
+# Colors are ints everywhere: curses color numbers below RGB_FLAG, 24-bit RGB values with it set
+RGB_FLAG = 1 << 24
+
+
+def rgb(r: Union[int, str], g: Optional[int] = None, b: Optional[int] = None) -> int:
+    """Encodes a 24-bit color, given as ``rgb(r, g, b)`` or ``rgb("#rrggbb")``, as a color int."""
+    if isinstance(r, str):
+        value = r.lstrip("#")
+        if len(value) != 6:
+            raise ValueError(f"expected #rrggbb, got {r!r}")
+        return RGB_FLAG | int(value, 16)
+    return RGB_FLAG | (r & 0xFF) << 16 | (g & 0xFF) << 8 | (b & 0xFF)
+
+
+def is_rgb(color: int) -> bool:
+    return color >= RGB_FLAG
+
+
+def rgb_components(color: int) -> Tuple[int, int, int]:
+    return (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+
+
+LIGHT_GRAY = rgb(179, 179, 179)
+TRUE_WHITE = rgb(255, 255, 255)
+
+# xterm's default values for the 16 ANSI colors
+ANSI_COLORS = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0), (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0), (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+
+def _xterm_color(index: int) -> Tuple[int, int, int]:
+    if index < 16:
+        return ANSI_COLORS[index]
+    if index < 232:
+        index -= 16
+        return _CUBE_LEVELS[index // 36], _CUBE_LEVELS[index // 6 % 6], _CUBE_LEVELS[index % 6]
+    level = 8 + 10 * (index - 232)
+    return level, level, level
+
+
+def _distance(a: Tuple[int, int, int], b: Tuple[int, int, int]) -> int:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+_tables: Optional[Tuple[bytes, bytes, bytes]] = None
+
+
+def _quantize_tables() -> Tuple[bytes, bytes, bytes]:
+    """Tables that make quantizing a few lookups instead of a palette search.
+
+    Nearest cube step and gray step for each channel value, and nearest ANSI
+    color for each of the 256 palette entries. Built on first use so importing
+    the module stays cheap.
+    """
+    global _tables
+    if _tables is None:
+        cube_step = bytes(min(range(6), key=lambda i: abs(_CUBE_LEVELS[i] - v)) for v in range(256))
+        gray_step = bytes(max(0, min(23, (v - 3) // 10)) for v in range(256))
+        nearest_16 = bytes(min(range(16), key=lambda i: _distance(_xterm_color(n), ANSI_COLORS[i])) for n in range(256))
+        _tables = (cube_step, gray_step, nearest_16)
+    return _tables
+
+
+@functools.lru_cache(maxsize=4096)
+def to_256(color: int) -> int:
+    """Nearest xterm 256-color index for an RGB color int."""
+    cube_step, gray_step, _ = _quantize_tables()
+    r, g, b = rgb_components(color)
+    cube = 16 + 36 * cube_step[r] + 6 * cube_step[g] + cube_step[b]
+    gray = 232 + gray_step[(r + g + b) // 3]
+    if _distance((r, g, b), _xterm_color(gray)) < _distance((r, g, b), _xterm_color(cube)):
+        return gray
+    return cube
+
+
+def to_16(color: int) -> int:
+    """Nearest of the 16 ANSI colors for an RGB color int."""
+    return _quantize_tables()[2][to_256(color)]
+
+
+def quantize(color: int, depth: int) -> int:
+    """Resolves ``color`` for a terminal with ``depth`` colors (8, 16, 256, or 1 << 24 to keep RGB)."""
+    if not is_rgb(color):
+        if depth <= 8 and 8 <= color < 16:
+            return color - 8
+        return color
+    if depth >= 1 << 24:
+        return color
+    if depth >= 256:
+        return to_256(color)
+    index = to_16(color)
+    return index if depth >= 16 else index & 7
+
+
+class Theme:
+    """A named set of color substitutions applied by the renderer.
+
+    ``palette`` maps colors as widgets ask for them (curses color numbers such
+    as ``curses.COLOR_BLUE``, or RGB values like LIGHT_GRAY) to the colors to
+    draw instead, usually RGB. Widgets keep their own color settings; switching
+    themes only changes how the renderer resolves them.
+    """
+
+    def __init__(self, name: str, palette: Optional[Dict[int, int]] = None):
+        self.name = name
+        self.palette = dict(palette or {})
+
+    def resolve(self, color: int) -> int:
+        return self.palette.get(color, color)
+
+
+CLASSIC = Theme("Classic")
+MIDNIGHT = Theme("Midnight", {
+    curses.COLOR_BLACK: rgb("#0b0e14"),
+    curses.COLOR_BLUE: rgb("#1f2a44"),
+    curses.COLOR_CYAN: rgb("#5ccfe6"),
+    curses.COLOR_GREEN: rgb("#87d96c"),
+    curses.COLOR_MAGENTA: rgb("#d4bfff"),
+    curses.COLOR_RED: rgb("#f28779"),
+    curses.COLOR_YELLOW: rgb("#ffd173"),
+    curses.COLOR_WHITE: rgb("#cbccc6"),
+    LIGHT_GRAY: rgb("#707a8c"),
+    TRUE_WHITE: rgb("#f3f4f5"),
+})
+SOLARIZED = Theme("Solarized", {
+    curses.COLOR_BLACK: rgb("#002b36"),
+    curses.COLOR_BLUE: rgb("#268bd2"),
+    curses.COLOR_CYAN: rgb("#2aa198"),
+    curses.COLOR_GREEN: rgb("#859900"),
+    curses.COLOR_MAGENTA: rgb("#d33682"),
+    curses.COLOR_RED: rgb("#dc322f"),
+    curses.COLOR_YELLOW: rgb("#b58900"),
+    curses.COLOR_WHITE: rgb("#eee8d5"),
+    LIGHT_GRAY: rgb("#93a1a1"),
+    TRUE_WHITE: rgb("#fdf6e3"),
+})
+THEMES = (CLASSIC, MIDNIGHT, SOLARIZED)
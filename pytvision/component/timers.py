@@ -0,0 +1,97 @@
+import heapq
+import itertools
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class Timer:
+    """Handle returned by TimerHeap.call_later/call_every; ``cancel()`` stops it."""
+
+    __slots__ = ("deadline", "interval", "fn", "args", "cancelled", "heap")
+
+    def __init__(self, heap: "TimerHeap", deadline: float, interval: Optional[float], fn: Callable, args: tuple):
+        self.heap = heap
+        self.deadline = deadline
+        self.interval = interval
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        if not self.cancelled:
+            self.cancelled = True
+            self.heap._cancelled(self)
+
+
+class TimerHeap:
+    """One-shot and repeating timers for the UI thread, kept in a heap by deadline.
+
+    The main loop calls ``run_due`` each iteration and passes ``next_timeout()``
+    as its input wait timeout, so it sleeps exactly until the next timer (or
+    input) and any number of timers cost nothing between ticks. Repeating
+    timers keep to their schedule without drifting; if the loop falls behind
+    they skip missed ticks rather than firing in a burst. Not thread-safe:
+    schedule from other threads through ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.heap: List[Tuple[float, int, Timer]] = []
+        self.counter = itertools.count()  # ties run in scheduling order
+        self.cancelled_count = 0
+
+    def __len__(self) -> int:
+        return len(self.heap) - self.cancelled_count
+
+    def call_later(self, delay: float, fn: Callable, *args) -> Timer:
+        return self._push(Timer(self, self.clock() + max(0.0, delay), None, fn, args))
+
+    def call_every(self, interval: float, fn: Callable, *args) -> Timer:
+        """Calls ``fn(*args)`` every ``interval`` seconds, the first time one interval from now."""
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        return self._push(Timer(self, self.clock() + interval, interval, fn, args))
+
+    def _push(self, timer: Timer) -> Timer:
+        heapq.heappush(self.heap, (timer.deadline, next(self.counter), timer))
+        return timer
+
+    def _cancelled(self, timer: Timer):
+        self.cancelled_count += 1
+        # Cancelled entries are dropped lazily; rebuild once they are the majority. In place,
+        # since a callback inside run_due may cancel and run_due holds on to the list
+        if self.cancelled_count > 32 and self.cancelled_count * 2 > len(self.heap):
+            self.heap[:] = [entry for entry in self.heap if not entry[2].cancelled]
+            heapq.heapify(self.heap)
+            self.cancelled_count = 0
+
+    def next_timeout(self) -> Optional[float]:
+        """Seconds until the next timer is due (0 if one already is), or None if there are none."""
+        heap = self.heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self.cancelled_count -= 1
+        if not heap:
+            return None
+        return max(0.0, heap[0][0] - self.clock())
+
+    def run_due(self) -> int:
+        """Runs every timer whose deadline has passed; returns how many ran."""
+        now = self.clock()
+        heap = self.heap
+        ran = 0
+        while heap and heap[0][0] <= now:
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                self.cancelled_count -= 1
+                continue
+            if timer.interval is not None:
+                timer.deadline += timer.interval
+                if timer.deadline <= now:
+                    timer.deadline = now + timer.interval
+                self._push(timer)
+            else:
+                timer.cancelled = True  # fired; a later cancel() is a no-op
+            ran += 1
+            timer.fn(*timer.args)
+        return ran
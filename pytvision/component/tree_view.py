@@ -0,0 +1,328 @@
+import curses
+import os
+import threading
+from typing import Callable, List, Optional
+
+from .component import Component, is_mouse_over
+from .terminal_renderer import TerminalRenderer
+from .ui_event import UIEvent
+from ..utils import _safe_add_string, _clamp, KEY_ENTER
+
+
+class TreeNode:
+    """One node of a TreeView.
+
+    ``children`` stays ``None`` until the node is first expanded and its loader
+    runs; ``has_children`` tells the view whether to draw an expander before then.
+    """
+
+    __slots__ = ("label", "data", "children", "has_children", "expanded", "loading", "parent", "depth")
+
+    def __init__(self, label: str, data=None, children: Optional[List["TreeNode"]] = None, has_children: bool = False):
+        self.label = label
+        self.data = data
+        self.children = None
+        self.has_children = has_children
+        self.expanded = False
+        self.loading = False
+        self.parent: Optional[TreeNode] = None
+        self.depth = 0
+        if children is not None:
+            self.set_children(children)
+
+    def set_children(self, children: List["TreeNode"]):
+        for child in children:
+            child.parent = self
+            child.depth = self.depth + 1
+        self.children = children
+        self.has_children = bool(children)
+
+    @property
+    def expandable(self) -> bool:
+        return bool(self.children) if self.children is not None else self.has_children
+
+
+def load_json_children(node: TreeNode) -> List[TreeNode]:
+    value = node.data
+    items = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+    out = []
+    for key, child in items:
+        if isinstance(child, (dict, list)):
+            label = f"{key}: {'{…}' if isinstance(child, dict) else '[…]'} ({len(child)})"
+            out.append(TreeNode(label, child, has_children=bool(child)))
+        else:
+            out.append(TreeNode(f"{key}: {child!r}", child))
+    return out
+
+
+def load_directory_children(node: TreeNode) -> List[TreeNode]:
+    try:
+        entries = sorted(os.scandir(node.data), key=lambda e: (not e.is_dir(), e.name.lower()))
+    except OSError as e:
+        return [TreeNode(f"<{e.strerror}>")]
+    return [TreeNode(e.name + (os.sep if e.is_dir() else ""), e.path, has_children=e.is_dir()) for e in entries]
+
+
+class TreeView(Component):
+    """Hierarchical list with lazily loaded children.
+
+    ``rows`` is the flattened list of currently visible nodes. Expanding or
+    collapsing a node splices only that node's visible subtree in or out, so
+    scrolling and drawing cost depends on the viewport rather than the tree.
+    With ``background=True`` the loader runs on a worker thread and its result
+    is handed back to the UI thread through ``call_soon_threadsafe``.
+    """
+
+    DEFAULT_FG = curses.COLOR_BLACK
+    DEFAULT_BG = curses.COLOR_WHITE
+    DEFAULT_BORDER_FG = curses.COLOR_BLACK
+    DEFAULT_BORDER_BG = curses.COLOR_WHITE
+    DEFAULT_HILITE_FG = curses.COLOR_BLACK
+    DEFAULT_HILITE_BG = curses.COLOR_CYAN
+
+    focusable = True
+
+    def __init__(self, left, top, width, height, roots: Optional[List[TreeNode]] = None,
+                 loader: Optional[Callable[[TreeNode], List[TreeNode]]] = None, background: bool = False, parent=None):
+        super().__init__(left, top, width, height, parent)
+        self.loader = loader
+        self.background = background
+        self.fg_color = self.DEFAULT_FG
+        self.bg_color = self.DEFAULT_BG
+        self.border_fg = self.DEFAULT_BORDER_FG
+        self.border_bg = self.DEFAULT_BORDER_BG
+        self.hilite_fg = self.DEFAULT_HILITE_FG
+        self.hilite_bg = self.DEFAULT_HILITE_BG
+        self.set_roots(roots or [])
+
+    def set_border_colors(self, fg=None, bg=None):
+        if fg is not None:
+            self.border_fg = fg
+        if bg is not None:
+            self.border_bg = bg
+
+    def set_hilite_colors(self, fg=None, bg=None):
+        if fg is not None:
+            self.hilite_fg = fg
+        if bg is not None:
+            self.hilite_bg = bg
+
+    def set_roots(self, roots: List[TreeNode]):
+        for root in roots:
+            root.parent = None
+            root.depth = 0
+        self.roots = roots
+        self.rows: List[TreeNode] = []
+        for root in roots:
+            self.rows.append(root)
+            if root.expanded:
+                self.rows.extend(self._visible_descendants(root))
+        self.cursor = 0
+        self.view_top = 0
+
+    def selected(self) -> Optional[TreeNode]:
+        return self.rows[self.cursor] if self.cursor < len(self.rows) else None
+
+    # -- expand / collapse ----------------------------------------------------
+
+    def _visible_descendants(self, node: TreeNode) -> List[TreeNode]:
+        out = []
+        stack = list(reversed(node.children or ()))
+        while stack:
+            n = stack.pop()
+            out.append(n)
+            if n.expanded and n.children:
+                stack.extend(reversed(n.children))
+        return out
+
+    def _row_of(self, node: TreeNode) -> Optional[int]:
+        # Nodes under a collapsed ancestor aren't in rows
+        p = node.parent
+        while p is not None:
+            if not p.expanded:
+                return None
+            p = p.parent
+        if self.cursor < len(self.rows) and self.rows[self.cursor] is node:
+            return self.cursor
+        return self.rows.index(node)
+
+    def _subtree_end(self, row: int) -> int:
+        depth = self.rows[row].depth
+        end = row + 1
+        while end < len(self.rows) and self.rows[end].depth > depth:
+            end += 1
+        return end
+
+    def expand(self, node: TreeNode):
+        if node.expanded:
+            return
+        node.expanded = True
+        if node.children is None:
+            if self.loader is None or node.loading:
+                return
+            # Off a window manager there's no UI thread to hand the result to, so load inline
+            manager = self.owning_manager() if self.background else None
+            if manager is not None:
+                node.loading = True
+                manager.tasks.begin_work()
+                threading.Thread(target=self._load, args=(node, manager.tasks), daemon=True).start()
+                return
+            node.set_children(self.loader(node))
+        row = self._row_of(node)
+        if row is not None:
+            added = self._visible_descendants(node)
+            self.rows[row + 1:row + 1] = added
+            if self.cursor > row:
+                self.cursor += len(added)
+
+    def collapse(self, node: TreeNode):
+        if not node.expanded:
+            return
+        row = self._row_of(node)
+        node.expanded = False
+        if row is not None:
+            end = self._subtree_end(row)
+            del self.rows[row + 1:end]
+            if row < self.cursor < end:
+                self.cursor = row
+            elif self.cursor >= end:
+                self.cursor -= end - row - 1
+            self._scroll_to_cursor()
+
+    def toggle(self, node: TreeNode):
+        if node.expanded:
+            self.collapse(node)
+        else:
+            self.expand(node)
+
+    def _load(self, node: TreeNode, tasks):
+        try:
+            try:
+                children = self.loader(node)
+            except Exception as e:
+                children = [TreeNode(f"<{e}>")]
+            tasks.call_soon_threadsafe(self._loaded, node, children)
+        finally:
+            tasks.end_work()
+
+    def _loaded(self, node: TreeNode, children: List[TreeNode]):
+        node.loading = False
+        node.set_children(children)
+        if node.expanded:
+            row = self._row_of(node)
+            if row is not None:
+                added = self._visible_descendants(node)
+                self.rows[row + 1:row + 1] = added
+                if self.cursor > row:
+                    self.cursor += len(added)
+        self.dispatchEvent("onload", node=node)
+
+    # -- rendering ------------------------------------------------------------
+
+    def _scroll_to_cursor(self):
+        inner_h = self.height - 2
+        if self.cursor < self.view_top:
+            self.view_top = self.cursor
+        elif self.cursor >= self.view_top + inner_h:
+            self.view_top = self.cursor - inner_h + 1
+        self.view_top = _clamp(self.view_top, 0, max(0, len(self.rows) - inner_h))
+
+    def _row_text(self, node: TreeNode) -> str:
+        if node.loading:
+            marker = "… "
+        elif node.expandable:
+            marker = "▾ " if node.expanded else "▸ "
+        else:
+            marker = "  "
+        return "  " * node.depth + marker + node.label
+
+    def render(self, renderer: TerminalRenderer):
+        if not self.visibility:
+            return
+        absolute_x, absolute_y = self.get_absolute_position()
+        renderer.draw_box(absolute_x, absolute_y, self.width, self.height, title=None, win=renderer.screen, fg=self.border_fg, bg=self.border_bg, border_style="single")
+        inner_h = self.height - 2
+        has_scrollbar = len(self.rows) > inner_h
+        text_w = self.width - 3 if has_scrollbar else self.width - 2
+        for i in range(inner_h):
+            idx = self.view_top + i
+            if idx < len(self.rows):
+                text = self._row_text(self.rows[idx])[:text_w].ljust(text_w)
+                current = idx == self.cursor and self.isFocused
+                renderer.draw_text(absolute_x + 1, absolute_y + 1 + i, text,
+                                   self.hilite_fg if current else self.fg_color, self.hilite_bg if current else self.bg_color)
+            else:
+                renderer.draw_text(absolute_x + 1, absolute_y + 1 + i, " " * text_w, self.fg_color, self.bg_color)
+        if has_scrollbar:
+            sbar_x = absolute_x + self.width - 2
+            thumb_size = max(1, inner_h * inner_h // len(self.rows))
+            thumb_pos = min(inner_h - thumb_size, inner_h * self.view_top // len(self.rows))
+            for i in range(inner_h):
+                _safe_add_string(renderer.screen, absolute_y + 1 + i, sbar_x, '│', renderer.get_color_pair(self.border_fg, self.border_bg))
+            for i in range(thumb_size):
+                _safe_add_string(renderer.screen, absolute_y + 1 + thumb_pos + i, sbar_x, '█',
+                                 renderer.get_color_pair(self.hilite_fg, self.hilite_bg))
+
+    # -- input ----------------------------------------------------------------
+
+    def _move_cursor(self, row: int):
+        self.cursor = _clamp(row, 0, max(0, len(self.rows) - 1))
+        self._scroll_to_cursor()
+
+    def handleEvent(self, event: UIEvent) -> bool:
+        node = self.selected()
+        page = max(1, self.height - 2)
+        if event.type == "key":
+            key = event.key
+            if key == curses.KEY_UP:
+                self._move_cursor(self.cursor - 1)
+            elif key == curses.KEY_DOWN:
+                self._move_cursor(self.cursor + 1)
+            elif key == curses.KEY_PPAGE:
+                self._move_cursor(self.cursor - page)
+            elif key == curses.KEY_NPAGE:
+                self._move_cursor(self.cursor + page)
+            elif key == curses.KEY_HOME:
+                self._move_cursor(0)
+            elif key == curses.KEY_END:
+                self._move_cursor(len(self.rows) - 1)
+            elif key == curses.KEY_RIGHT and node is not None:
+                if node.expandable and not node.expanded:
+                    self.expand(node)
+                elif node.expanded and node.children:
+                    self._move_cursor(self.cursor + 1)
+            elif key == curses.KEY_LEFT and node is not None:
+                if node.expanded:
+                    self.collapse(node)
+                elif node.parent is not None:
+                    self._move_cursor(self._row_of(node.parent))
+            elif key in (KEY_ENTER, ' ') and node is not None:
+                if node.expandable:
+                    self.toggle(node)
+                self.dispatchEvent("onselect", node=node)
+            else:
+                return False
+            return True
+        if event.type == "mouse":
+            mouse_x, mouse_y = event.x, event.y
+            bstate = event.bstate
+            if not is_mouse_over(self, mouse_x, mouse_y):
+                return False
+            self.isFocused = True
+            if bstate & curses.BUTTON4_PRESSED:
+                self._move_cursor(self.cursor - 3)
+                return True
+            if bstate & getattr(curses, "BUTTON5_PRESSED", 0):
+                self._move_cursor(self.cursor + 3)
+                return True
+            absolute_x, absolute_y = self.get_absolute_position()
+            idx = self.view_top + mouse_y - (absolute_y + 1)
+            if 0 <= idx < len(self.rows) and bstate & (curses.BUTTON1_PRESSED | curses.BUTTON1_CLICKED):
+                self.cursor = idx
+                clicked = self.rows[idx]
+                # Clicking the expander toggles the node
+                marker_x = absolute_x + 1 + 2 * clicked.depth
+                if clicked.expandable and bstate & curses.BUTTON1_PRESSED and marker_x <= mouse_x <= marker_x + 1:
+                    self.toggle(clicked)
+            return True
+        return False
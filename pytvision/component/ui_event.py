@@ -1,4 +1,104 @@
+from typing import List, Tuple
+
+
 class UIEvent:
+    """An event with free-form fields kept in the ``data`` dict.
+
+    Widget events ("onselect", "onsubmit", ...) use this class directly. Key and
+    mouse input use the slotted KeyEvent/MouseEvent below, whose fields are plain
+    attributes; their ``data`` is the event itself, so older code reading
+    ``event.data['x']`` or ``event.data.get('key')`` still works without a dict.
+    """
+
+    __slots__ = ("type", "data")
+
     def __init__(self, type_, **kw):
         self.type = type_
-        self.data = kw
\ No newline at end of file
+        self.data = kw
+
+    def to_dict(self) -> dict:
+        return dict(self.data)
+
+
+class _InputEvent(UIEvent):
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+
+    @property
+    def data(self):
+        return self
+
+    def __getitem__(self, name):
+        if name not in self.FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name, default=None):
+        return getattr(self, name) if name in self.FIELDS else default
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class KeyEvent(_InputEvent):
+    __slots__ = ("key",)
+    FIELDS = ("key",)
+    type = "key"
+
+    def __init__(self, key):
+        self.key = key
+
+
+class MouseEvent(_InputEvent):
+    """A mouse report; ``etype`` is "motion" for position reports and "click" otherwise.
+
+    Mouse tracking produces events in floods, so the main loop takes them from a
+    small free list with ``obtain`` and hands them back with ``release`` once
+    dispatched. Nothing may keep a reference to an event it was given.
+    """
+
+    __slots__ = ("x", "y", "bstate", "etype", "screen_w", "screen_h")
+    FIELDS = ("x", "y", "bstate", "etype", "screen_w", "screen_h")
+    type = "mouse"
+    POOL_SIZE = 8
+    _pool: List["MouseEvent"] = []
+
+    def __init__(self, x: int, y: int, bstate: int = 0, etype: str = "click", screen_w: int = 0, screen_h: int = 0):
+        self.x = x
+        self.y = y
+        self.bstate = bstate
+        self.etype = etype
+        self.screen_w = screen_w
+        self.screen_h = screen_h
+
+    @classmethod
+    def obtain(cls, x: int, y: int, bstate: int = 0, etype: str = "click", screen_w: int = 0, screen_h: int = 0) -> "MouseEvent":
+        if cls._pool:
+            event = cls._pool.pop()
+            event.__init__(x, y, bstate, etype, screen_w, screen_h)
+            return event
+        return cls(x, y, bstate, etype, screen_w, screen_h)
+
+    def release(self):
+        if len(self._pool) < self.POOL_SIZE:
+            self._pool.append(self)
+
+
+_TYPED = {"key": KeyEvent, "mouse": MouseEvent}
+
+
+def make_event(type_: str, **kw) -> UIEvent:
+    """Builds the typed event for ``type_`` when there is one, else a plain UIEvent."""
+    cls = _TYPED.get(type_)
+    return cls(**kw) if cls is not None else UIEvent(type_, **kw)
+
+
+class WidgetEvent(UIEvent):
+    """Event sent by Component.dispatchEvent; ``source`` is the component that sent it."""
+
+    __slots__ = ("source",)
+
+    def __init__(self, type_, source, data: dict):
+        self.type = type_
+        self.source = source
+        self.data = data
@@ -0,0 +1,134 @@
+from collections import deque
+from typing import List, Optional, Tuple
+
+Pos = Tuple[int, int]
+
+
+class EditOp:
+    """One insert ('i') or delete ('d') of ``text`` at (row, col); text may span lines."""
+
+    __slots__ = ("kind", "row", "col", "text", "cursor")
+
+    def __init__(self, kind: str, row: int, col: int, text: str, cursor: Pos):
+        self.kind = kind
+        self.row = row
+        self.col = col
+        self.text = text
+        self.cursor = cursor
+
+    def end(self) -> Pos:
+        nl = self.text.count("\n")
+        if not nl:
+            return self.row, self.col + len(self.text)
+        return self.row + nl, len(self.text) - self.text.rindex("\n") - 1
+
+    def cost(self) -> int:
+        return UndoLog.OP_OVERHEAD + len(self.text)
+
+
+class ReplaceOp:
+    """Whole-line replacements of many rows as one op ('r').
+
+    ``rows`` holds ``(row, old, new)`` sorted by row, with rows numbered as
+    before the replacement; ``new`` may span lines, ``old`` never does.
+    """
+
+    __slots__ = ("kind", "row", "col", "rows", "cursor")
+
+    def __init__(self, rows: List[Tuple[int, str, str]], cursor: Pos):
+        self.kind = "r"
+        self.row = rows[0][0]
+        self.col = 0
+        self.rows = rows
+        self.cursor = cursor
+
+    def cost(self) -> int:
+        return UndoLog.OP_OVERHEAD + sum(len(old) + len(new) for _, old, new in self.rows)
+
+
+class UndoLog:
+    """Delta-based undo history.
+
+    Each step is a list of EditOps, so memory grows with the size of the edits
+    rather than the buffer. Consecutive typing or backspacing on one line is
+    merged into a single op; the oldest steps are dropped once ``max_bytes`` or
+    ``max_steps`` is exceeded.
+    """
+
+    OP_OVERHEAD = 64
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024, max_steps: int = 1000):
+        self.max_bytes = max_bytes
+        self.max_steps = max_steps
+        self.undo_stack: deque = deque()
+        self.redo_stack: List[List[EditOp]] = []
+        self.size = 0
+        self.coalescing = False
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.size = 0
+        self.coalescing = False
+
+    def break_group(self):
+        self.coalescing = False
+
+    def _merge(self, op: EditOp) -> bool:
+        if not self.coalescing or not self.undo_stack or len(self.undo_stack[-1]) != 1:
+            return False
+        last = self.undo_stack[-1][0]
+        if op.kind != last.kind or "\n" in op.text or "\n" in last.text or op.row != last.row:
+            return False
+        if op.kind == "i" and op.col == last.col + len(last.text):
+            last.text += op.text
+        elif op.kind == "d" and op.col + len(op.text) == last.col:
+            last.text = op.text + last.text
+            last.col = op.col
+        elif op.kind == "d" and op.col == last.col:
+            last.text += op.text
+        else:
+            return False
+        return True
+
+    def record(self, op: EditOp, coalesce: bool = False):
+        self.redo_stack.clear()
+        if coalesce and self._merge(op):
+            self.size += len(op.text)
+        else:
+            self.undo_stack.append([op])
+            self.size += op.cost()
+        self.coalescing = coalesce
+        self._trim()
+
+    def record_group(self, ops: List[EditOp]):
+        if not ops:
+            return
+        self.redo_stack.clear()
+        self.undo_stack.append(ops)
+        self.size += sum(op.cost() for op in ops)
+        self.coalescing = False
+        self._trim()
+
+    def _trim(self):
+        while len(self.undo_stack) > 1 and (self.size > self.max_bytes or len(self.undo_stack) > self.max_steps):
+            self.size -= sum(op.cost() for op in self.undo_stack.popleft())
+
+    def pop_undo(self) -> Optional[List[EditOp]]:
+        self.coalescing = False
+        if not self.undo_stack:
+            return None
+        group = self.undo_stack.pop()
+        self.size -= sum(op.cost() for op in group)
+        self.redo_stack.append(group)
+        return group
+
+    def pop_redo(self) -> Optional[List[EditOp]]:
+        self.coalescing = False
+        if not self.redo_stack:
+            return None
+        group = self.redo_stack.pop()
+        self.undo_stack.append(group)
+        self.size += sum(op.cost() for op in group)
+        self._trim()
+        return group
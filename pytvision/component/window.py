@@ -1,20 +1,20 @@
 
 import curses
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
 
 from .component import Component, is_mouse_over
+from .focus import FocusRing, focus_leaves
+from .layout import AnchorLayout
+from .task_queue import TaskQueue
+from .keymap import Keymap, APP_SCOPE
 from .terminal_renderer import TerminalRenderer
+from .theme import LIGHT_GRAY, TRUE_WHITE
 from .ui_event import UIEvent
 from ..utils import _safe_add_string, _clamp, _split_mnemonic, KEY_TAB, KEY_ENTER, KEY_ESC
 
-from .label import Label
-from .input import Input
-from .text_area import TextArea
-from .multi_list import MultiList
-from .password import Password
-from .button import Button
-from .dropdown import Dropdown
-from .context_menu import ContextMenu
+if TYPE_CHECKING:
+    from .context_menu import ContextMenu
+    from .timers import Timer, TimerHeap
 
 
 
@@ -23,7 +23,17 @@ class WindowManager:
         self.windows: List['Window'] = []
         self.modal_stack: List['Window'] = []
         self.main_menu: Optional['MainMenuBar'] = None
+        self.overlays: List[Component] = []
         self.desktop_is_active = False
+        self.recorder = None
+        self.layout = AnchorLayout()
+        self.keymap = Keymap()
+        self.pending_size: Optional[Tuple[int, int]] = None
+        self.tasks = TaskQueue()
+        self.timers: Optional['TimerHeap'] = None  # created with the first timer, so importing stays cheap
+        # handler(component, event_name, exception) for listeners raising in this manager's
+        # windows; falls back to the process-wide set_listener_error_handler one
+        self.listener_error_handler: Optional[Callable[[Component, str, Exception], None]] = None
 
     def add(self, window: 'Window'):
         if window in self.windows:
@@ -37,8 +47,88 @@ class WindowManager:
             self.windows.remove(window)
         if window in self.modal_stack:
             self.modal_stack.remove(window)
+        if any(item is window for item, _ in self.layout.items):
+            self.layout.remove(window)
         self.desktop_is_active = not self.windows
 
+    def call_soon_threadsafe(self, fn: Callable, *args, block: bool = True, timeout: Optional[float] = None) -> bool:
+        """Runs ``fn(*args)`` on the UI thread before the next frame; safe to call from any thread.
+
+        Returns False if the task queue is bounded (``tasks.maxsize``) and stayed
+        full past ``timeout``, or was full with ``block=False``.
+        """
+        return self.tasks.call_soon_threadsafe(fn, *args, block=block, timeout=timeout)
+
+    def _timer_heap(self) -> 'TimerHeap':
+        if self.timers is None:
+            from .timers import TimerHeap
+            self.timers = TimerHeap()
+        return self.timers
+
+    def call_later(self, delay: float, fn: Callable, *args) -> 'Timer':
+        """Runs ``fn(*args)`` on the UI thread once ``delay`` seconds have passed. UI thread only."""
+        return self._timer_heap().call_later(delay, fn, *args)
+
+    def call_every(self, interval: float, fn: Callable, *args) -> 'Timer':
+        """Runs ``fn(*args)`` on the UI thread every ``interval`` seconds until cancelled. UI thread only."""
+        return self._timer_heap().call_every(interval, fn, *args)
+
+    def run_timers(self) -> int:
+        """Runs the timers that are due; returns how many ran. Main loops call this every iteration."""
+        return self.timers.run_due() if self.timers is not None else 0
+
+    def next_timeout(self) -> Optional[float]:
+        """Seconds until the next timer is due, for the main loop's input wait; None if no timer is pending."""
+        return self.timers.next_timeout() if self.timers is not None else None
+
+    def request_resize(self, width: int, height: int):
+        # Resize storms only keep the latest size; the relayout happens once, on the next frame
+        self.pending_size = (width, height)
+
+    def relayout(self, width: int, height: int):
+        self.pending_size = None
+        self.layout.place(0, 0, width, height)
+
+    def focus_chain(self) -> tuple:
+        # Keymap scopes that currently have focus, innermost first; None is the global scope
+        menu = self.main_menu
+        if menu is not None and menu.active_index is not None and not self.modal_stack:
+            return (menu.items[menu.active_index][1], None, APP_SCOPE)
+        window = self.modal_stack[-1] if self.modal_stack else (None if self.desktop_is_active else self.top())
+        chain = []
+        if window is not None:
+            node = window.focused
+            while node is not None and node is not window:
+                chain.append(node)
+                node = node.parent
+            chain.append(window)
+        if not self.modal_stack:
+            chain.append(None)
+        chain.append(APP_SCOPE)
+        return tuple(chain)
+
+    def wants_all_motion(self, x: int, y: int) -> bool:
+        """Whether the component getting pointer motion at (x, y) asked for every sample rather than the latest.
+
+        That is the one holding the drag (a dragged window, or the chain of
+        pointer grabs down from it), else the deepest component under the pointer.
+        """
+        if self.modal_stack:
+            window = self.modal_stack[-1]
+        else:
+            window = self.top()
+            if window is None or not (window.dragging or window.pointer_grab is not None):
+                window = next((w for w in reversed(self.windows) if w.visibility and w.contains(x, y)), None)
+        if window is None:
+            return False
+        target = window
+        if not window.dragging:
+            child = window.pointer_grab or window.child_at(x, y)
+            while child is not None:
+                target = child
+                child = target.pointer_grab or target.child_at(x, y)
+        return not target.coalesce_motion
+
     def top(self) -> Optional['Window']:
         return self.windows[-1] if self.windows else None
 
@@ -58,27 +148,34 @@ class WindowManager:
     def pop_modal(self):
         if self.modal_stack:
             self.modal_stack.pop()
+
     def handle_event(self, event: UIEvent) -> bool:
+        if self.recorder is not None:
+            self.recorder.record(event)
+        if event.type == "key" and self.keymap.feed(event.key, self.focus_chain()):
+            return True
         if self.modal_stack:
             return self.modal_stack[-1].handleEvent(event)
         if event.type == "key":
-            # First try the focused component in the topmost window
+            # An open menu takes the keyboard before the focused component
+            if self.main_menu and self.main_menu.active_index is not None:
+                return self.main_menu.handleEvent(event)
+            # Then the topmost window: its focused component, then Tab cycling
             active_window = self.top()
-            if active_window and not self.desktop_is_active:
-                for child in active_window.children:
-                    if getattr(child, "isFocused", False) and child.handleEvent(event):
-                        return True
-            # Handle Tab key for cycling focus
-            if event.data.get('key') == KEY_TAB:
-                if active_window and not self.desktop_is_active:
-                    active_window.cycle_focus()
-                    return True
+            if active_window and not self.desktop_is_active and active_window.handleEvent(event):
+                return True
             # Then try the main menu
             if self.main_menu:
                 return self.main_menu.handleEvent(event)
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
-            bstate = event.data.get('bstate', 0)
+            mouse_x, mouse_y = event.x, event.y
+            bstate = event.bstate
+            # A window being dragged, or one of whose children holds the pointer, keeps it
+            # even when the pointer (or a coalesced jump) leaves its frame
+            active_window = self.top()
+            if active_window is not None and (active_window.dragging or active_window.pointer_grab is not None
+                                              and (event.etype == "motion" or bstate & curses.BUTTON1_RELEASED)):
+                return active_window.handleEvent(event)
             if self.main_menu and self.main_menu.handleEvent(event):
                 return True
             for window in reversed(self.windows):
@@ -96,6 +193,8 @@ class WindowManager:
         return False
 
     def render_all(self, renderer: TerminalRenderer):
+        if self.pending_size is not None:
+            self.relayout(*self.pending_size)
         bg_char = '░'
         try:
             for row in range(renderer.h):
@@ -108,20 +207,22 @@ class WindowManager:
                 window.render(renderer)
         if self.main_menu:
             self.main_menu.render(renderer)
+        for overlay in self.overlays:
+            overlay.render(renderer)
 
 class Window(Component):
     DEFAULT_FG = curses.COLOR_WHITE
     DEFAULT_BG = curses.COLOR_BLACK
-    DEFAULT_BORDER_FG_FOCUSED = 21
-    DEFAULT_BORDER_BG_FOCUSED = 20
+    DEFAULT_BORDER_FG_FOCUSED = TRUE_WHITE
+    DEFAULT_BORDER_BG_FOCUSED = LIGHT_GRAY
     DEFAULT_BORDER_FG_UNFOCUSED = curses.COLOR_BLACK
-    DEFAULT_BORDER_BG_UNFOCUSED = 20
-    DEFAULT_TITLE_FG_FOCUSED = 21
-    DEFAULT_TITLE_BG_FOCUSED = 20
+    DEFAULT_BORDER_BG_UNFOCUSED = LIGHT_GRAY
+    DEFAULT_TITLE_FG_FOCUSED = TRUE_WHITE
+    DEFAULT_TITLE_BG_FOCUSED = LIGHT_GRAY
     DEFAULT_TITLE_FG_UNFOCUSED = curses.COLOR_BLACK
-    DEFAULT_TITLE_BG_UNFOCUSED = 20
+    DEFAULT_TITLE_BG_UNFOCUSED = LIGHT_GRAY
     DEFAULT_CLOSE_FG = curses.COLOR_GREEN
-    DEFAULT_CLOSE_BG = 20
+    DEFAULT_CLOSE_BG = LIGHT_GRAY
 
     def __init__(self, left, top, width, height, title: str = "Window", parent=None, modal=False):
         super().__init__(left, top, width, height, parent)
@@ -131,7 +232,9 @@ class Window(Component):
         self.modal = modal
         self.dragging = False
         self._dragoff = (0, 0)
+        self.pointer_grab: Optional[Component] = None
         self.manager = None
+        self.focus_ring = FocusRing()
         self.border_fg_focused = self.DEFAULT_BORDER_FG_FOCUSED
         self.border_bg_focused = self.DEFAULT_BORDER_BG_FOCUSED
         self.border_fg_unfocused = self.DEFAULT_BORDER_FG_UNFOCUSED
@@ -172,6 +275,18 @@ class Window(Component):
     def add(self, child: Component):
         child.parent = self
         self.children.append(child)
+        self.focus_ring.add(child)
+
+    def remove(self, child: Component):
+        if child in self.children:
+            self.children.remove(child)
+            if self.focused is not None and self._owns(child, self.focused):
+                self.focused.isFocused = False
+            self.focus_ring.remove(child)
+
+    def refresh_focus(self):
+        # For containers that changed their focus_children() after being added
+        self.focus_ring.rebuild(self.children)
 
     def render(self, renderer: TerminalRenderer):
         if not self.visibility:
@@ -191,7 +306,7 @@ class Window(Component):
         title_text = f" {self.title} "
         title_x = absolute_x + (self.width - len(title_text)) // 2
         _safe_add_string(renderer.screen, absolute_y, title_x, title_text, renderer.get_color_pair(title_fg, title_bg) | curses.A_BOLD)
-        status_label = next((child for child in self.children if isinstance(child, Label) and child.top == self.height - 2), None)
+        status_label = next((child for child in self.children if child.status_line and child.top == self.height - 2), None)
         if status_label:
             status_text = status_label.text.center(self.width - 2)
             _safe_add_string(renderer.screen, absolute_y + self.height - 1, absolute_x + 1, status_text, renderer.get_color_pair(title_fg, title_bg))
@@ -205,45 +320,90 @@ class Window(Component):
         absolute_x, absolute_y = self.get_absolute_position()
         return (mouse_x >= absolute_x and mouse_x < absolute_x + self.width and mouse_y >= absolute_y and mouse_y < absolute_y + self.height)
 
+    @property
+    def focused(self) -> Optional[Component]:
+        return self.focus_ring.current
+
+    def _owns(self, ancestor: Component, component: Component) -> bool:
+        while component is not None and component is not self:
+            if component is ancestor:
+                return True
+            component = component.parent
+        return False
+
+    def _focus_visible(self, component: Component) -> bool:
+        while component is not None and component is not self:
+            if not component.visibility:
+                return False
+            component = component.parent
+        return True
+
+    def set_focus(self, component: Optional[Component]):
+        current = self.focus_ring.current
+        if current is not None and current is not component:
+            current.isFocused = False
+        self.focus_ring.current = component
+        if component is not None:
+            component.isFocused = True
+
     def unfocus_children(self):
-        for child in self.children:
-            if hasattr(child, 'isFocused'):
-                child.isFocused = False
+        self.set_focus(None)
 
     def collect_focusables(self):
-        out = []
-        for child in self.children:
-            if isinstance(child, (Input, TextArea, MultiList, Password, Button)):
-                out.append(child)
-        return out
+        return list(self.focus_ring.items)
 
-    def cycle_focus(self):
-        focusable_components = self.collect_focusables()
-        if not focusable_components:
-            return
-        current_index = next((i for i, child in enumerate(focusable_components) if getattr(child, 'isFocused', False)), None)
-        if current_index is not None:
-            focusable_components[current_index].isFocused = False
-            next_index = (current_index + 1) % len(focusable_components)
-            focusable_components[next_index].isFocused = True
-        elif focusable_components:
-            focusable_components[0].isFocused = True
+    def cycle_focus(self, backwards: bool = False):
+        nxt = self.focus_ring.step(-1 if backwards else 1, self._focus_visible)
+        if nxt is not None:
+            self.set_focus(nxt)
+
+    def focus_hidden(self, component: Component):
+        focused = self.focus_ring.current
+        if focused is not None and self._owns(component, focused):
+            self.set_focus(self.focus_ring.step(1, self._focus_visible))
+
+    def _sync_focus(self, child: Component):
+        # Widgets take focus themselves when clicked; adopt that as the window's focus
+        for leaf in focus_leaves(child):
+            if leaf.isFocused and leaf is not self.focus_ring.current:
+                self.set_focus(leaf)
+                return
+
+    def child_at(self, x: int, y: int) -> Optional[Component]:
+        for child in reversed(self.children):
+            if child.visibility and child.has_popup:
+                child_x, child_y = child.get_absolute_position()
+                if child_x <= x < child_x + child.width and child_y <= y < child_y + child.hit_height():
+                    return child
+        return next((c for c in reversed(self.children) if c.visibility and is_mouse_over(c, x, y)), None)
+
+    def _grab_pointer(self, child: Component, event: UIEvent):
+        self._sync_focus(child)
+        if event.etype != "motion":
+            self.pointer_grab = child
 
     def handleEvent(self, event: UIEvent) -> bool:
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
-            bstate = event.data.get('bstate', 0)
+            mouse_x, mouse_y = event.x, event.y
+            bstate = event.bstate
             absolute_x, absolute_y = self.get_absolute_position()
-            if self.dragging and event.data.get('etype') == 'motion' and bstate & curses.REPORT_MOUSE_POSITION:
+            if self.dragging and event.etype == 'motion' and bstate & curses.REPORT_MOUSE_POSITION:
                 dx = mouse_x - self._dragoff[0]
                 dy = mouse_y - self._dragoff[1]
-                self.left = _clamp(dx, 0, max(0, event.data.get('screen_w', 100) - self.width))
-                self.top = _clamp(dy, 0, max(0, event.data.get('screen_h', 40) - self.height))
+                self.left = _clamp(dx, 0, max(0, (event.screen_w or 100) - self.width))
+                self.top = _clamp(dy, 0, max(0, (event.screen_h or 40) - self.height))
+                return True
+            grab = self.pointer_grab
+            if grab is not None and (event.etype == "motion" or bstate & curses.BUTTON1_RELEASED):
+                if bstate & curses.BUTTON1_RELEASED:
+                    self.pointer_grab = None
+                grab.handleEvent(event)
                 return True
             if bstate & curses.BUTTON1_RELEASED:
                 self.dragging = False
                 return True
             if bstate & curses.BUTTON1_PRESSED:
+                self.pointer_grab = None  # a release lost outside the terminal leaves a stale grab
                 if mouse_y == absolute_y and absolute_x <= mouse_x < absolute_x + self.width:
                     if mouse_x >= absolute_x + 1 and mouse_x <= absolute_x + 3:
                         if self.manager:
@@ -255,37 +415,48 @@ class Window(Component):
                         self.manager.bring_to_top(self)
                         return True
                 for child in reversed(self.children):
-                    if child.visibility and isinstance(child, Dropdown):
+                    if child.visibility and child.has_popup:
                         ax_c, ay_c = child.get_absolute_position()
-                        effective_h = child.dropdown_height if child.dropdown_open else child.height
+                        effective_h = child.hit_height()
                         if mouse_x >= ax_c and mouse_x < ax_c + child.width and mouse_y >= ay_c and mouse_y < ay_c + effective_h:
                             if child.handleEvent(event):
+                                self._grab_pointer(child, event)
                                 return True
                 for child in reversed(self.children):
-                    if child.visibility and is_mouse_over(child, mouse_x, mouse_y) and not isinstance(child, Dropdown):
+                    if child.visibility and is_mouse_over(child, mouse_x, mouse_y) and not child.has_popup:
                         if child.handleEvent(event):
+                            self._grab_pointer(child, event)
                             return True
                 self.unfocus_children()
                 return True
-        elif event.type == "key":
-            for child in self.children:
-                if getattr(child, "isFocused", False):
-                    if child.handleEvent(event):
+            if bstate & (curses.BUTTON4_PRESSED | getattr(curses, "BUTTON5_PRESSED", 0)):
+                # The wheel goes to whatever is under the pointer
+                for child in reversed(self.children):
+                    if child.visibility and is_mouse_over(child, mouse_x, mouse_y) and child.handleEvent(event):
                         return True
+                return False
+        elif event.type == "key":
+            focused = self.focus_ring.current
+            if focused is not None and focused.handleEvent(event):
+                return True
+            key = event.key
+            if key in (KEY_TAB, curses.KEY_BTAB):
+                self.cycle_focus(backwards=key == curses.KEY_BTAB)
+                return True
             return False
         return False
     
 class MainMenuBar:
     DEFAULT_FG = curses.COLOR_BLACK
-    DEFAULT_BG = 20
+    DEFAULT_BG = LIGHT_GRAY
     DEFAULT_SELECTED_FG = curses.COLOR_BLACK
     DEFAULT_SELECTED_BG = curses.COLOR_GREEN
     DEFAULT_HOTKEY_FG = curses.COLOR_RED
-    DEFAULT_HOTKEY_BG = 20
+    DEFAULT_HOTKEY_BG = LIGHT_GRAY
     DEFAULT_HOTKEY_SELECTED_FG = curses.COLOR_RED
     DEFAULT_HOTKEY_SELECTED_BG = curses.COLOR_GREEN
 
-    def __init__(self, manager: WindowManager, items: List[Tuple[str, ContextMenu]]):
+    def __init__(self, manager: WindowManager, items: List[Tuple[str, 'ContextMenu']]):
         self.manager = manager
         self.items = items
         self.active_index: Optional[int] = None
@@ -300,6 +471,35 @@ class MainMenuBar:
         self.hotkey_bg = self.DEFAULT_HOTKEY_BG
         self.hotkey_selected_fg = self.DEFAULT_HOTKEY_SELECTED_FG
         self.hotkey_selected_bg = self.DEFAULT_HOTKEY_SELECTED_BG
+        self.compile_keys()
+
+    def compile_keys(self):
+        # Alt+mnemonic opens a menu, item shortcuts run from anywhere, item mnemonics work inside the open menu
+        keymap = self.manager.keymap
+        keymap.unbind_owner(self)
+        for idx, (label, menu) in enumerate(self.items):
+            _, mn, _ = _split_mnemonic(label)
+            if mn:
+                keymap.bind(("Alt+" + mn,), lambda idx=idx: self.open_menu(idx), owner=self, description=label)
+            for i, item in enumerate(menu.items):
+                if not item.callback:
+                    continue
+                _, item_mn, _ = _split_mnemonic(item.label)
+                if item_mn:
+                    for token in {item_mn, item_mn.upper()}:
+                        keymap.bind((token,), lambda menu=menu, i=i: self.activate(menu, i), scope=menu, owner=self)
+                if item.shortcut:
+                    keymap.bind(item.shortcut, lambda item=item: item.enabled and item.callback(), owner=self, description=item.label)
+
+    def open_menu(self, index: int):
+        if self.active_index is not None:
+            self.items[self.active_index][1].close()
+        self.active_index = index
+        self.items[index][1].open()
+
+    def activate(self, menu: 'ContextMenu', index: int):
+        self.active_index = None
+        menu.activate(index)
 
     def set_colors(self, fg=None, bg=None):
         if fg is not None:
@@ -353,7 +553,7 @@ class MainMenuBar:
 
     def handleEvent(self, event: UIEvent) -> bool:
         if event.type == "key":
-            key = event.data.get('key')
+            key = event.key
             if key == KEY_ESC:
                 if self.active_index is not None:
                     self.items[self.active_index][1].close()
@@ -376,23 +576,14 @@ class MainMenuBar:
                 menu = self.items[self.active_index][1]
                 if not menu.opened:
                     menu.open()
-                return menu.handleEvent(event)
-            if isinstance(key, tuple) and key[0] == "ALT":
-                alt_key = key[1]
-                if alt_key in (ord('f'), ord('F')):
-                    self.active_index = 0
-                    self.items[self.active_index][1].open()
-                    return True
-                elif alt_key in (ord('w'), ord('W')):
-                    self.active_index = 1
-                    self.items[self.active_index][1].open()
-                    return True
-                elif alt_key in (ord('h'), ord('H')):
-                    self.active_index = 2
-                    self.items[self.active_index][1].open()
-                    return True
+                handled = menu.handleEvent(event)
+                if not menu.opened:
+                    self.active_index = None
+                return handled
+            if self.active_index is not None:
+                return self.items[self.active_index][1].handleEvent(event)
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
+            mouse_x, mouse_y = event.x, event.y
             if mouse_y == self.top:
                 rx = mouse_x
                 for idx, (lx, lw, _) in enumerate(self.layouts):
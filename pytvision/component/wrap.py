@@ -0,0 +1,125 @@
+from typing import List, Optional, Tuple
+
+
+def wrap_line(line: str, width: int) -> List[int]:
+    """Start offsets of the visual rows of ``line``, breaking after the last space that fits."""
+    starts = [0]
+    n = len(line)
+    pos = 0
+    while n - pos > width:
+        brk = line.rfind(" ", pos, pos + width)
+        pos = brk + 1 if brk > pos else pos + width
+        starts.append(pos)
+    return starts
+
+
+class WrapIndex:
+    """Maps logical lines to visual rows for soft-wrapped text.
+
+    Row counts live in blocks of ``BLOCK`` lines with a per-block sum, so the
+    cumulative row of a line, and the line at a visual row, cost O(n / BLOCK + BLOCK)
+    and line insertions only touch one block. Counts start as a cheap length-based
+    estimate and become exact once a line's segments are computed for display.
+    A width change only marks the index stale; it is rebuilt on next use.
+    """
+
+    BLOCK = 512
+
+    def __init__(self):
+        self.width = 0
+        self.stale = True
+        self.segments: List[Optional[List[int]]] = []
+        self.blocks: List[List[int]] = []
+        self.block_sums: List[int] = []
+
+    def _estimate(self, line: str) -> int:
+        return max(1, -(-len(line) // self.width))
+
+    def set_width(self, width: int):
+        width = max(1, width)
+        if width != self.width:
+            self.width = width
+            self.stale = True
+
+    def invalidate(self):
+        self.stale = True
+
+    def ensure(self, lines: List[str]):
+        if not self.stale:
+            return
+        self.stale = False
+        self.segments = [None] * len(lines)
+        counts = [self._estimate(line) for line in lines]
+        self.blocks = [counts[i:i + self.BLOCK] for i in range(0, len(counts), self.BLOCK)] or [[]]
+        self.block_sums = [sum(block) for block in self.blocks]
+
+    def _find(self, line: int) -> Tuple[int, int]:
+        for b, block in enumerate(self.blocks):
+            if line < len(block):
+                return b, line
+            line -= len(block)
+        return len(self.blocks) - 1, len(self.blocks[-1])
+
+    def total_rows(self) -> int:
+        return sum(self.block_sums)
+
+    def rows_before(self, line: int) -> int:
+        total = 0
+        for b, block in enumerate(self.blocks):
+            if line < len(block):
+                return total + sum(block[:line])
+            total += self.block_sums[b]
+            line -= len(block)
+        return total
+
+    def locate(self, row: int) -> Tuple[int, int]:
+        # Returns (line, row within that line) for a visual row, clamped to the buffer
+        line = 0
+        for b, block in enumerate(self.blocks):
+            if row < self.block_sums[b]:
+                for count in block:
+                    if row < count:
+                        return line, row
+                    row -= count
+                    line += 1
+            row -= self.block_sums[b]
+            line += len(block)
+        return max(0, line - 1), max(0, (self.blocks[-1][-1] - 1) if self.blocks[-1] else 0)
+
+    def line_segments(self, lines: List[str], line: int) -> List[int]:
+        segs = self.segments[line]
+        if segs is None:
+            segs = self.segments[line] = wrap_line(lines[line], self.width)
+            b, i = self._find(line)
+            old = self.blocks[b][i]
+            if old != len(segs):
+                self.blocks[b][i] = len(segs)
+                self.block_sums[b] += len(segs) - old
+        return segs
+
+    def lines_changed(self, lines: List[str], start: int, removed: int, added: int):
+        if self.stale:
+            return
+        self.segments[start:start + removed] = [None] * added
+        b, i = self._find(start)
+        # Remove the old counts, which may spill over into following blocks
+        left = removed
+        bb, ii = b, i
+        while left and bb < len(self.blocks):
+            block = self.blocks[bb]
+            take = min(left, len(block) - ii)
+            self.block_sums[bb] -= sum(block[ii:ii + take])
+            del block[ii:ii + take]
+            left -= take
+            bb, ii = bb + 1, 0
+        for k in range(bb - 1, b, -1):
+            if not self.blocks[k]:
+                del self.blocks[k]
+                del self.block_sums[k]
+        new = [self._estimate(line) for line in lines[start:start + added]]
+        block = self.blocks[b]
+        block[i:i] = new
+        self.block_sums[b] += sum(new)
+        if len(block) > 2 * self.BLOCK:
+            self.blocks[b:b + 1] = [block[:self.BLOCK], block[self.BLOCK:]]
+            self.block_sums[b:b + 1] = [sum(block[:self.BLOCK]), sum(block[self.BLOCK:])]
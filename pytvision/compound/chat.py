@@ -4,9 +4,11 @@ import textwrap
 
 from ..component.component import Component, is_mouse_over
 from ..component.terminal_renderer import TerminalRenderer
+from ..component.theme import LIGHT_GRAY
 from ..component.ui_event import UIEvent
 from ..component.text_area import TextArea
 from ..component.button import Button
+from ..component.layout import AnchorLayout
 
 from ..utils import _safe_add_string
 
@@ -15,7 +17,7 @@ class Chat(Component):
     DEFAULT_FG = curses.COLOR_BLACK
     DEFAULT_BG = curses.COLOR_WHITE
     DEFAULT_BORDER_FG = curses.COLOR_BLACK
-    DEFAULT_BORDER_BG = 20
+    DEFAULT_BORDER_BG = LIGHT_GRAY
     DEFAULT_MESSAGE_FG = curses.COLOR_BLACK
     DEFAULT_MESSAGE_BG_LEFT = curses.COLOR_CYAN  # Bubble background for "Friend"
     DEFAULT_MESSAGE_BG_RIGHT = curses.COLOR_GREEN  # Bubble background for "Me"
@@ -29,6 +31,10 @@ class Chat(Component):
         self.messages = []  # List of (sender, message) tuples
         self.input = TextArea(1, height - 4, width - 12, 3, parent=self)  # 3-line TextArea
         self.send_button = Button(width - 10, height - 3, 8, "Send", parent=self, onclick=self.on_send)
+        self.layout = AnchorLayout()
+        self.layout.add(self.input, left=1, right=11, bottom=1, height=3)
+        self.layout.add(self.send_button, right=2, bottom=2, width=8, height=1)
+        self.relayout()
         self.fg_color = self.DEFAULT_FG
         self.bg_color = self.DEFAULT_BG
         self.border_fg = self.DEFAULT_BORDER_FG
@@ -46,6 +52,12 @@ class Chat(Component):
             self.input.set_value("")
             self.dispatchEvent("onsend", message=msg)
 
+    def focus_children(self):
+        return (self.input, self.send_button)
+
+    def child_at(self, x: int, y: int):
+        return next((c for c in (self.input, self.send_button) if is_mouse_over(c, x, y)), None)
+
     def add_message(self, sender: str, message: str):
         self.messages.append((sender, message))
 
@@ -114,7 +126,7 @@ class Chat(Component):
         if self.send_button.handleEvent(event):
             return True
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
+            mouse_x, mouse_y = event.x, event.y
             if is_mouse_over(self, mouse_x, mouse_y):
                 self.isFocused = True
                 return True
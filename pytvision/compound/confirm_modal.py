@@ -3,12 +3,13 @@ from ..component.component import Component
 from ..component.modal import Modal
 from ..component.label import Label
 from ..component.button import Button
+from ..component.theme import LIGHT_GRAY
 
 from typing import Optional, Callable
 
 class ConfirmModal(Modal):
     DEFAULT_MESSAGE_FG = curses.COLOR_BLACK
-    DEFAULT_MESSAGE_BG = 20
+    DEFAULT_MESSAGE_BG = LIGHT_GRAY
     DEFAULT_BUTTON_FG = curses.COLOR_BLACK
     DEFAULT_BUTTON_BG = curses.COLOR_GREEN
 
@@ -1,11 +1,9 @@
 
 import curses
-import time
-import threading
-import queue
 
 from ..component.component import Component, is_mouse_over
 from ..component.terminal_renderer import TerminalRenderer
+from ..component.theme import LIGHT_GRAY
 from ..component.ui_event import UIEvent
 from ..utils import _safe_add_string
 
@@ -13,18 +11,19 @@ class Console(Component):
     DEFAULT_FG = curses.COLOR_WHITE
     DEFAULT_BG = curses.COLOR_BLACK
     DEFAULT_BORDER_FG = curses.COLOR_BLACK
-    DEFAULT_BORDER_BG = 20  # Light gray
+    DEFAULT_BORDER_BG = LIGHT_GRAY
     DEFAULT_SCROLLBAR_FG = curses.COLOR_WHITE
-    DEFAULT_SCROLLBAR_BG = 20
+    DEFAULT_SCROLLBAR_BG = LIGHT_GRAY
+
+    focusable = True
 
     def __init__(self, left, top, width, height, parent=None):
         super().__init__(left, top, width, height, parent)
         self.lines = []
         self.view_top = 0
-        self.queue = queue.Queue()
         self.running = True
-        self.thread = threading.Thread(target=self.read_process, daemon=True)
-        self.thread.start()
+        self.counter = 0
+        self.producer = None  # started on first render, once attached to a window manager
         self.fg_color = self.DEFAULT_FG
         self.bg_color = self.DEFAULT_BG
         self.border_fg = self.DEFAULT_BORDER_FG
@@ -32,13 +31,14 @@ class Console(Component):
         self.scrollbar_fg = self.DEFAULT_SCROLLBAR_FG
         self.scrollbar_bg = self.DEFAULT_SCROLLBAR_BG
 
-    def read_process(self):
-        # Simulate an external process outputting lines
-        counter = 0
-        while self.running:
-            self.queue.put(f"Log message {counter}")
-            counter += 1
-            time.sleep(1)
+    def produce_line(self):
+        # Simulates an external process printing a line every second
+        self.append_line(f"Log message {self.counter}")
+        self.counter += 1
+
+    def post_line(self, line: str):
+        """Adds a line from any thread; returns False (dropping the line) while not attached to a window manager."""
+        return self.call_soon_threadsafe(self.append_line, line)
 
     def append_line(self, line: str):
         self.lines.append(line)
@@ -48,7 +48,8 @@ class Console(Component):
 
     def stop(self):
         self.running = False
-        self.thread.join()
+        if self.producer is not None:
+            self.producer.cancel()
 
     def render(self, renderer: TerminalRenderer):
         if not self.visibility:
@@ -59,8 +60,10 @@ class Console(Component):
         inner_w = self.width - 2
         has_scrollbar = len(self.lines) > inner_h
         text_w = inner_w - 1 if has_scrollbar else inner_w
-        while not self.queue.empty():
-            self.append_line(self.queue.get())
+        if self.running and self.producer is None:
+            self.producer = self.call_every(1.0, self.produce_line)
+            if self.producer is not None:
+                self.produce_line()
         for i in range(inner_h):
             idx = self.view_top + i
             if idx < len(self.lines):
@@ -79,7 +82,7 @@ class Console(Component):
 
     def handleEvent(self, event: UIEvent) -> bool:
         if event.type == "key":
-            key = event.data.get('key')
+            key = event.key
             inner_h = self.height - 2
             if key == curses.KEY_UP:
                 self.view_top = max(0, self.view_top - 1)
@@ -94,7 +97,7 @@ class Console(Component):
                 self.view_top = min(max(0, len(self.lines) - inner_h), self.view_top + inner_h)
                 return True
         if event.type == "mouse":
-            mouse_x, mouse_y = event.data['x'], event.data['y']
+            mouse_x, mouse_y = event.x, event.y
             if is_mouse_over(self, mouse_x, mouse_y):
                 self.isFocused = True
                 inner_h = self.height - 2
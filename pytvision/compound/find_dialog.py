@@ -0,0 +1,74 @@
+import re
+
+from ..component.modal import Modal
+from ..component.window import Window
+from ..component.label import Label
+from ..component.input import Input
+from ..component.button import Button
+from ..component.text_area import TextArea
+from ..component.ui_event import UIEvent
+
+
+class FindDialog(Modal):
+    def __init__(self, parent: Window, target: TextArea):
+        super().__init__(50, 12, "Find / Replace", parent)
+        self.target = target
+        self.last_pattern = None
+        self.message = None
+        self.add(Label(2, 2, 9, 1, text="Find:", parent=self))
+        self.pattern_input = Input(11, 2, self.width - 13, parent=self)
+        self.add(self.pattern_input)
+        self.add(Label(2, 4, 9, 1, text="Replace:", parent=self))
+        self.replace_input = Input(11, 4, self.width - 13, parent=self)
+        self.add(self.replace_input)
+        self.status = Label(2, 6, self.width - 4, 1, text="", parent=self)
+        self.add(self.status)
+        self.add(Button(2, self.height - 3, 8, "Next", parent=self, window=self, onclick=self.on_next))
+        self.add(Button(12, self.height - 3, 8, "Prev", parent=self, window=self, onclick=self.on_prev))
+        self.add(Button(22, self.height - 3, 12, "Replace All", parent=self, window=self, onclick=self.on_replace_all))
+        self.add(Button(36, self.height - 3, 10, "Close", parent=self, window=self, onclick=self.on_close))
+        self.set_focus(self.pattern_input)
+
+    def update_search(self):
+        pattern = self.pattern_input.value
+        if pattern == self.last_pattern:
+            return
+        self.last_pattern = pattern
+        self.message = None
+        try:
+            self.target.search(pattern)
+        except re.error as e:
+            self.target.clear_search()
+            self.message = f"Bad pattern: {e}"
+
+    def render(self, renderer):
+        search = self.target.text_search
+        if self.message:
+            self.status.text = self.message
+        elif search:
+            self.status.text = f"{search.count} matches" + (" (searching...)" if search.running else "")
+        else:
+            self.status.text = ""
+        super().render(renderer)
+
+    def handleEvent(self, event: UIEvent) -> bool:
+        handled = super().handleEvent(event)
+        self.update_search()
+        return handled
+
+    def on_next(self):
+        self.update_search()
+        self.target.find_next()
+
+    def on_prev(self):
+        self.update_search()
+        self.target.find_prev()
+
+    def on_replace_all(self):
+        self.update_search()
+        count = self.target.replace_all(self.replace_input.value)
+        self.message = f"Replaced {count} lines"
+
+    def on_close(self):
+        self.target.clear_search()
+        self.manager.remove(self)
@@ -6,11 +6,14 @@ from ..component.window import Window
 from ..component.multi_list import MultiList
 from ..component.button import Button
 from ..component.input import Input
+from ..component.layout import AnchorLayout
 
 class OpenDialog(Modal):
-    def __init__(self, parent: Window, callback: Callable[[str], None]):
+    def __init__(self, parent: Window, callback: Callable[[str], None], executor=None):
         super().__init__(50, 18, "Open File", parent)
         self.callback = callback
+        self.executor = executor  # a TaskExecutor, to list directories off the UI thread
+        self.scan_task = None  # the listing in flight; results from older ones are dropped
         self.path_input = Input(2, 2, self.width - 4, parent=self)
         self.path_input.value = os.getcwd()
         self.add(self.path_input)
@@ -20,6 +23,12 @@ class OpenDialog(Modal):
         self.cancel = Button(16, self.height - 3, 10, "Cancel", parent=self, window=self, onclick=lambda: self.manager.remove(self))
         self.add(self.ok)
         self.add(self.cancel)
+        self.layout = AnchorLayout()
+        self.layout.add(self.path_input, left=2, top=2, right=2, height=1)
+        self.layout.add(self.list, left=2, top=4, right=2, bottom=4)
+        self.layout.add(self.ok, left=6, bottom=2, width=8, height=1)
+        self.layout.add(self.cancel, left=16, bottom=2, width=10, height=1)
+        self.relayout()
 
     def scan(self, p):
         try:
@@ -30,6 +39,33 @@ class OpenDialog(Modal):
         files = [f for f in items if os.path.isfile(os.path.join(p, f))]
         return sorted(dirs) + sorted(files)
 
+    def show_directory(self, path: str):
+        if self.scan_task is not None:
+            self.scan_task.cancel()
+            self.scan_task = None
+        if self.executor is None:
+            self.set_items(self.scan(path))
+            return
+        # Empty until the listing arrives, so OK has nothing stale to open
+        self.set_items([])
+        self.title = "Open File (reading...)"
+        task = self.executor.submit(lambda task, p: self.scan(p), path, show_progress=False,
+                                    on_result=lambda items: self._listed(task, items),
+                                    on_error=lambda exc: self._listed(task, []))
+        self.scan_task = task
+
+    def _listed(self, task, items):
+        if task is not self.scan_task:
+            return  # from a listing that was superseded
+        self.scan_task = None
+        self.title = "Open File"
+        self.set_items(items)
+
+    def set_items(self, items):
+        self.list.items = items
+        self.list.selectedItems = {}
+        self.list.cursor = self.list.view_top = 0
+
     def on_ok(self):
         selection = [i for i, v in self.list.selectedItems.items() if v]
         if selection:
@@ -37,7 +73,7 @@ class OpenDialog(Modal):
             path = os.path.join(self.path_input.value, name)
             if os.path.isdir(path):
                 self.path_input.value = path
-                self.list.items = self.scan(path)
+                self.show_directory(path)
                 return
             else:
                 self.callback(path)
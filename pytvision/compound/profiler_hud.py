@@ -0,0 +1,35 @@
+import curses
+
+from ..component.window import Window
+from ..component.terminal_renderer import TerminalRenderer
+from ..component.profiler import Profiler, profiler as default_profiler
+
+
+class ProfilerHud(Window):
+    DEFAULT_FG = curses.COLOR_GREEN
+    DEFAULT_BG = curses.COLOR_BLACK
+
+    def __init__(self, left=1, top=1, width=46, height=16, profiler: Profiler = None):
+        super().__init__(left, top, width, height, title="Diagnostics")
+        self.profiler = profiler or default_profiler
+        self.profiler.ignore(ProfilerHud)
+        self.has_shadow = False
+        self.fg_color = self.DEFAULT_FG
+        self.bg_color = self.DEFAULT_BG
+
+    def toggle(self, manager):
+        if self in manager.overlays:
+            manager.overlays.remove(self)
+            self.profiler.disable()
+        else:
+            self.profiler.enable()
+            manager.overlays.append(self)
+
+    def render(self, renderer: TerminalRenderer):
+        if not self.visibility:
+            return
+        super().render(renderer)
+        absolute_x, absolute_y = self.get_absolute_position()
+        lines = self.profiler.report(limit=max(0, self.height - 5))
+        for i, line in enumerate(lines[:self.height - 2]):
+            renderer.draw_text(absolute_x + 1, absolute_y + 1 + i, line[:self.width - 2].ljust(self.width - 2), self.fg_color, self.bg_color)
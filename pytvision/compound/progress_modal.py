@@ -0,0 +1,35 @@
+from typing import Callable, Optional
+
+from .notification_modal import NotificationModal
+from ..component.progress_bar import ProgressBar
+
+
+class ProgressModal(NotificationModal):
+    """A NotificationModal with a progress bar, whose button cancels instead of dismissing."""
+
+    def __init__(self, title: str, message: str = "", parent=None, on_cancel: Optional[Callable] = None):
+        super().__init__(message, parent)
+        self.title = title
+        self.on_cancel = on_cancel
+        self.label.height = 2
+        self.bar = ProgressBar(2, 4, 36, parent=self)
+        self.add(self.bar)
+        self.cancel_button = self.ok_button
+        self.cancel_button.label = "Cancel"
+        self.cancel_button.left, self.cancel_button.width = 15, 10
+        self.cancel_button.onclick = self.cancel
+        self.set_focus(self.cancel_button)
+
+    def update(self, fraction: Optional[float], message: Optional[str] = None):
+        self.bar.set_value(fraction)
+        if message is not None:
+            self.label.text = message
+
+    def cancel(self):
+        if self.on_cancel:
+            self.on_cancel()
+        self.close()
+
+    def close(self):
+        if self.manager:
+            self.manager.remove(self)
@@ -6,6 +6,7 @@ from ..component.window import Window
 from ..component.multi_list import MultiList
 from ..component.button import Button
 from ..component.input import Input
+from ..component.layout import AnchorLayout
 
 class SaveDialog(Modal):
     def __init__(self, parent: Window, suggested="out.txt", callback: Callable[[str], None] = None):
@@ -18,13 +19,24 @@ class SaveDialog(Modal):
         self.cancel = Button(16, self.height - 3, 10, "Cancel", parent=self, window=self, onclick=lambda: self.manager.remove(self))
         self.add(self.ok)
         self.add(self.cancel)
+        self.layout = AnchorLayout()
+        self.layout.add(self.input, left=2, top=2, right=2, height=1)
+        self.layout.add(self.ok, left=6, bottom=2, width=8, height=1)
+        self.layout.add(self.cancel, left=16, bottom=2, width=10, height=1)
+        self.relayout()
 
     def on_save(self):
+        # Only checked here: the callback writes to a temp file and renames it into place,
+        # so the target itself must never be opened for writing up front
         p = self.input.value
-        try:
-            open(p, "w").write("")
+        directory = os.path.dirname(os.path.abspath(p))
+        if os.path.isdir(p):
+            self.dispatchEvent("onerror", message=f"Is a directory: {p}")
+        elif not os.path.isdir(directory):
+            self.dispatchEvent("onerror", message=f"No such directory: {directory}")
+        elif not os.access(directory, os.W_OK):
+            self.dispatchEvent("onerror", message=f"Permission denied: {directory}")
+        else:
             if self.callback:
                 self.callback(p)
-            self.manager.remove(self)
-        except Exception as e:
-            self.dispatchEvent("onerror", message=str(e))
\ No newline at end of file
+            self.manager.remove(self)
\ No newline at end of file
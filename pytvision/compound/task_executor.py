@@ -0,0 +1,139 @@
+import threading
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .progress_modal import ProgressModal
+
+if TYPE_CHECKING:
+    import concurrent.futures
+
+
+class BackgroundTask:
+    """Handle for one piece of work submitted to a TaskExecutor.
+
+    Thread-pool work functions get the task as their first argument. They call
+    ``report`` to move the progress bar and should return early once
+    ``cancelled`` is set. Progress, results and errors are all applied on the UI
+    thread through the window manager's task queue. Without ``on_error``, errors
+    go to the queue's ``on_error``, else to the listener error handler (with the
+    ``parent`` given to submit), else they are dropped; they are never raised
+    into the main loop.
+    """
+
+    def __init__(self, executor: "TaskExecutor", title: str, on_result: Optional[Callable] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None, on_cancel: Optional[Callable] = None,
+                 parent=None):
+        self.executor = executor
+        self.title = title
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.parent = parent
+        self.future: Optional["concurrent.futures.Future"] = None
+        self.modal: Optional[ProgressModal] = None
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+        self.progress = (None, None)
+        self.update_posted = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def report(self, fraction: Optional[float] = None, message: Optional[str] = None):
+        # Only the latest report matters; at most one update is queued at a time
+        with self.lock:
+            self.progress = (fraction, message)
+            if self.update_posted:
+                return
+            self.update_posted = True
+        self.executor.manager.call_soon_threadsafe(self._apply_progress)
+
+    def _apply_progress(self):
+        with self.lock:
+            fraction, message = self.progress
+            self.update_posted = False
+        if self.modal is not None:
+            self.modal.update(fraction, message)
+
+    def cancel(self):
+        if self.cancelled:
+            return
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+        self._close_modal()
+        if self.on_cancel:
+            self.on_cancel()
+
+    def _close_modal(self):
+        if self.modal is not None:
+            modal, self.modal = self.modal, None
+            modal.close()
+
+    def _finish(self, future: "concurrent.futures.Future"):
+        self._close_modal()
+        if self.cancelled or future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            if self.on_error is not None:
+                self.on_error(exc)
+            else:
+                self._report_error(exc)
+        elif self.on_result:
+            self.on_result(future.result())
+
+    def _report_error(self, exc: BaseException):
+        manager = self.executor.manager
+        if manager.tasks.on_error is not None:
+            manager.tasks.on_error(exc)
+            return
+        from ..component.component import _listener_error_handler
+        handler = manager.listener_error_handler or _listener_error_handler
+        if handler is not None:
+            handler(self.parent, "onerror", exc)
+
+
+class TaskExecutor:
+    """Runs blocking work off the UI thread, optionally behind a ProgressModal.
+
+    With ``processes=True`` work runs in a process pool: the function must be
+    picklable, gets only its own arguments (no task handle, so no progress), and
+    cancelling just drops the result. The pool is created on first use.
+    """
+
+    def __init__(self, manager, max_workers: int = 4, processes: bool = False):
+        self.manager = manager
+        self.max_workers = max_workers
+        self.processes = processes
+        self.pool: Optional["concurrent.futures.Executor"] = None
+
+    def submit(self, fn: Callable, *args, title: str = "Working", message: str = "", parent=None,
+               show_progress: bool = True, on_result: Optional[Callable] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               on_cancel: Optional[Callable] = None) -> BackgroundTask:
+        task = BackgroundTask(self, title, on_result, on_error, on_cancel, parent)
+        if show_progress:
+            task.modal = ProgressModal(title, message, parent, on_cancel=task.cancel)
+            task.modal.update(None)  # indeterminate until the first report
+            self.manager.push_modal(task.modal)
+        if self.pool is None:
+            # concurrent.futures (and the logging it pulls in) is only imported once there is work
+            import concurrent.futures
+            pool_cls = concurrent.futures.ProcessPoolExecutor if self.processes else concurrent.futures.ThreadPoolExecutor
+            self.pool = pool_cls(max_workers=self.max_workers)
+        task.future = self.pool.submit(fn, *args) if self.processes else self.pool.submit(fn, task, *args)
+        self.manager.tasks.begin_work()
+        task.future.add_done_callback(lambda future: self._done(task, future))
+        return task
+
+    def _done(self, task: BackgroundTask, future: "concurrent.futures.Future"):
+        try:
+            self.manager.call_soon_threadsafe(task._finish, future)
+        finally:
+            self.manager.tasks.end_work()
+
+    def shutdown(self, wait: bool = False):
+        if self.pool is not None:
+            self.pool.shutdown(wait=wait, cancel_futures=True)
+            self.pool = None
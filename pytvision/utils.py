@@ -5,6 +5,8 @@ KEY_ENTER = 10
 KEY_ESC = 27
 KEY_TAB = 9
 KEY_BACKSPACE = 127
+KEY_CTRL_Y = 25
+KEY_CTRL_Z = 26
 
 def _clamp(v, a, b): return max(a, min(b, v))
 
@@ -0,0 +1,23 @@
+import os
+
+from pytvision.component.stream_io import atomic_write_lines
+
+
+def test_save_through_symlink_writes_the_target(tmp_path):
+    real = tmp_path / "real.txt"
+    real.write_text("old")
+    link = tmp_path / "link.txt"
+    os.symlink("real.txt", link)
+    assert atomic_write_lines(["new", "text"], str(link))
+    assert real.read_text() == "new\ntext"
+    assert os.path.islink(link)
+    assert sorted(os.listdir(tmp_path)) == ["link.txt", "real.txt"]
+
+
+def test_save_keeps_the_file_mode(tmp_path):
+    path = tmp_path / "script.sh"
+    path.write_text("echo")
+    os.chmod(path, 0o751)
+    assert atomic_write_lines(["echo hi"], str(path))
+    assert path.read_text() == "echo hi"
+    assert os.stat(path).st_mode & 0o777 == 0o751
@@ -0,0 +1,50 @@
+import os
+import threading
+
+from pytvision.component.task_queue import TaskQueue
+
+
+def test_post_after_close_is_refused_and_writes_nothing():
+    tasks = TaskQueue()
+    tasks.close()
+    # Reuse the fd numbers, as a new client socket would
+    r, w = os.pipe()
+    try:
+        os.set_blocking(r, False)
+        assert tasks.call_soon_threadsafe(print) is False
+        tasks.end_work()
+        try:
+            assert os.read(r, 16) == b""
+        except BlockingIOError:
+            pass
+    finally:
+        os.close(r)
+        os.close(w)
+
+
+def test_close_releases_a_blocked_producer():
+    tasks = TaskQueue(maxsize=1)
+    assert tasks.call_soon_threadsafe(print)
+    results = []
+    producer = threading.Thread(target=lambda: results.append(tasks.call_soon_threadsafe(print)))
+    producer.start()
+    tasks.close()
+    producer.join(2)
+    assert results == [False]
+
+
+def test_post_from_the_ui_thread_never_blocks_on_a_full_queue():
+    tasks = TaskQueue(maxsize=1)
+    ran = []
+
+    def first():
+        ran.append("first")
+        # The queue is full again; waiting here could never end
+        assert tasks.call_soon_threadsafe(ran.append, "second")
+        assert tasks.call_soon_threadsafe(ran.append, "third")
+
+    tasks.call_soon_threadsafe(first)
+    tasks.run_pending()
+    assert tasks.run_pending() == 2
+    assert ran == ["first", "second", "third"]
+    tasks.close()
@@ -0,0 +1,43 @@
+from pytvision.component.timers import TimerHeap
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cancel_during_callback_compacts_without_losing_timers():
+    clock = FakeClock()
+    heap = TimerHeap(clock)
+    pending = [heap.call_later(10, lambda: None) for _ in range(40)]
+    ticks = []
+    # Due in the same run_due as the first tick, and ahead of it
+    heap.call_later(1, lambda: [timer.cancel() for timer in pending])
+    heap.call_every(1, lambda: ticks.append(clock.now))
+    for step in range(1, 6):
+        clock.now = step
+        heap.run_due()
+    assert ticks == [1, 2, 3, 4, 5]
+    assert len(heap) == 1
+
+
+def test_repeating_timer_cancelling_itself():
+    clock = FakeClock()
+    heap = TimerHeap(clock)
+    ticks = []
+
+    def tick():
+        ticks.append(clock.now)
+        if len(ticks) == 2:
+            timer.cancel()
+
+    timer = heap.call_every(1, tick)
+    for step in range(1, 5):
+        clock.now = step
+        heap.run_due()
+    assert ticks == [1, 2]
+    assert len(heap) == 0
+    assert heap.next_timeout() is None
@@ -0,0 +1,15 @@
+from pytvision.component.window import Window, WindowManager
+
+
+def test_removed_window_leaves_the_desktop_layout():
+    manager = WindowManager()
+    kept = Window(0, 0, 10, 5, "kept")
+    closed = Window(0, 0, 10, 5, "closed")
+    for window in (kept, closed):
+        manager.add(window)
+        manager.layout.add(window, left=1, top=1, right=1, bottom=1)
+    manager.remove(closed)
+    manager.relayout(40, 20)
+    assert [item for item, _ in manager.layout.items] == [kept]
+    assert (kept.width, kept.height) == (38, 18)
+    assert (closed.width, closed.height) == (10, 5)